@@ -23,6 +23,8 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
+import os
+import shutil
 import requests
 from PyQt5.QtCore import QRunnable
 import logging
@@ -65,6 +67,10 @@ class Content(QRunnable):
         self.setAutoDelete(False)
         self.downloaded = False
         self.check_path = None
+        self.link_source = None  # An existing file with the same content that the file is linked to if set
+        self.dedupe_index = None
+        self.journal = None  # The DownloadJournal that the download is recorded in and the id of its job
+        self.journal_id = None
 
         self.queue = None
 
@@ -102,7 +108,24 @@ class Content(QRunnable):
                 self.check_path = self.save_path
 
     def run(self):
+        """
+        Downloads the content.  If the content is recorded in a download journal, its job is marked as started before
+        the download and is removed from the journal once the download succeeds.
+        """
+        if self.journal is not None:
+            self.journal.mark_started(self.journal_id)
+        self.download()
+        if self.downloaded and self.journal is not None:
+            self.journal.mark_finished(self.journal_id)
+
+    def download(self):
+        """
+        Downloads the content to its file name, or links it to an existing file with the same content.  If the download
+        fails, the contents claim on its url in the dedupe index is released.
+        """
         self.check_save_path_subreddit()
+        if self.link_source is not None and self.link_existing_file():
+            return None
         try:
             response = requests.get(self.url, stream=True)
             if response.status_code == 200:
@@ -112,6 +135,8 @@ class Content(QRunnable):
                 self.set_file_modified_date()
                 self.queue.put('Saved: %s' % self.filename)
                 self.downloaded = True
+                if self.dedupe_index is not None:
+                    self.dedupe_index.add(self.url, self.filename)
                 return None
             else:
                 self.handle_unsuccessful_response(response.status_code)
@@ -119,6 +144,30 @@ class Content(QRunnable):
             self.handle_connection_error()
         except:
             self.handle_exception()
+        if self.dedupe_index is not None:
+            self.dedupe_index.release(self.url, self.filename)
+
+    def link_existing_file(self):
+        """
+        Creates a hard link, or a copy if the file system does not support hard links, from the existing file that
+        holds the same content to this contents file name instead of downloading the file again.
+        :return: True if the file was linked or copied, False if the content must be downloaded.
+        :rtype: bool
+        """
+        if not os.path.isfile(self.link_source):
+            return False
+        try:
+            try:
+                os.link(self.link_source, self.filename)
+            except OSError:
+                shutil.copy2(self.link_source, self.filename)
+        except Exception:
+            self.logger.warning('Failed to link existing file', extra={'url': self.url, 'source': self.link_source,
+                                                                       'save_path': self.filename}, exc_info=True)
+            return False
+        self.queue.put('Linked: %s' % self.filename)
+        self.downloaded = True
+        return True
 
     def handle_unsuccessful_response(self, status_code):
         """Handles logging and output in case of a failed response from the server."""
@@ -0,0 +1,199 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from hashlib import blake2b
+import zlib
+
+
+CHUNK_SIZE = 512  # The number of urls compressed together
+MERGE_SIZE = 1024  # The number of recently added hashes held before they are merged into the sorted index
+
+
+def url_hash(url):
+    """Returns a 64 bit hash of the supplied url."""
+    return int.from_bytes(blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class DownloadHistory:
+
+    def __init__(self, urls=None):
+        """
+        A compact list of the urls that a reddit object has downloaded.  Membership is tested against a sorted array of
+        64 bit url hashes, with recently added hashes held in a small set until they are merged into the array, so a
+        url can be checked without scanning the list.  The urls themselves are only needed to display the list, so they
+        are stored zlib compressed in chunks of CHUNK_SIZE urls with the most recent urls kept uncompressed.  The class
+        behaves like the list it replaces for appending, indexing, deleting, iterating, and testing membership.
+
+        :param urls: An optional iterable of urls to start the history with.
+        """
+        self.hashes = array('Q')
+        self.recent_hashes = set()
+        self.chunks = []
+        self.chunk_sizes = []
+        self.tail = []
+        self.cached_chunk = None
+        self.saved_length = 0  # The number of urls that have been written to the object store
+        self.rewrite_required = False  # Set when a url is removed so that the stored history is written again
+        if urls is not None:
+            self.extend(urls)
+
+    def __len__(self):
+        return sum(self.chunk_sizes) + len(self.tail)
+
+    def __contains__(self, url):
+        if not isinstance(url, str):
+            return False
+        key = url_hash(url)
+        if key in self.recent_hashes:
+            return True
+        index = bisect_left(self.hashes, key)
+        return index < len(self.hashes) and self.hashes[index] == key
+
+    def __iter__(self):
+        for index in range(len(self.chunks)):
+            yield from self.get_chunk(index)
+        yield from list(self.tail)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[x] for x in range(*index.indices(len(self)))]
+        chunk_index, position = self.locate(index)
+        if chunk_index is None:
+            return self.tail[position]
+        return self.get_chunk(chunk_index)[position]
+
+    def __delitem__(self, index):
+        chunk_index, position = self.locate(index)
+        if chunk_index is None:
+            del self.tail[position]
+        else:
+            urls = self.get_chunk(chunk_index)
+            del urls[position]
+            if urls:
+                self.chunks[chunk_index] = self.compress(urls)
+                self.chunk_sizes[chunk_index] = len(urls)
+            else:
+                del self.chunks[chunk_index]
+                del self.chunk_sizes[chunk_index]
+            self.cached_chunk = None
+        self.rebuild_index()
+        self.rewrite_required = True
+
+    def __getstate__(self):
+        """Merges the recent hashes and compresses the uncompressed urls so that the history is pickled compactly."""
+        chunks = list(self.chunks)
+        chunk_sizes = list(self.chunk_sizes)
+        if self.tail:
+            chunks.append(self.compress(self.tail))
+            chunk_sizes.append(len(self.tail))
+        hashes = array('Q', sorted(set(self.hashes).union(self.recent_hashes)))
+        return {'hashes': hashes.tobytes(), 'chunks': chunks, 'chunk_sizes': chunk_sizes}
+
+    def __setstate__(self, state):
+        self.hashes = array('Q')
+        self.hashes.frombytes(state['hashes'])
+        self.recent_hashes = set()
+        self.chunks = state['chunks']
+        self.chunk_sizes = state['chunk_sizes']
+        self.tail = []
+        self.cached_chunk = None
+        self.saved_length = 0
+        self.rewrite_required = False
+
+    def append(self, url):
+        self.tail.append(url)
+        key = url_hash(url)
+        if key not in self.recent_hashes:
+            self.recent_hashes.add(key)
+            if len(self.recent_hashes) >= MERGE_SIZE:
+                self.merge_recent_hashes()
+        if len(self.tail) >= CHUNK_SIZE:
+            self.chunks.append(self.compress(self.tail))
+            self.chunk_sizes.append(len(self.tail))
+            self.tail = []
+
+    def extend(self, urls):
+        for url in urls:
+            self.append(url)
+
+    def get_urls_from(self, start):
+        """
+        Yields the urls from the supplied index to the end of the history without decompressing the chunks before the
+        index.
+        :param start: The index of the first url to yield.
+        :type start: int
+        """
+        position = start
+        for index, size in enumerate(self.chunk_sizes):
+            if position >= size:
+                position -= size
+                continue
+            yield from self.get_chunk(index)[position:]
+            position = 0
+        yield from self.tail[position:]
+
+    def merge_recent_hashes(self):
+        """Merges the recently added hashes into the sorted hash array."""
+        if len(self.recent_hashes) < 32:
+            for key in self.recent_hashes:
+                index = bisect_left(self.hashes, key)
+                if index >= len(self.hashes) or self.hashes[index] != key:
+                    insort(self.hashes, key)
+        else:
+            self.hashes = array('Q', sorted(set(self.hashes).union(self.recent_hashes)))
+        self.recent_hashes = set()
+
+    def rebuild_index(self):
+        """Rebuilds the hash index from the stored urls.  This is only needed after a url is removed."""
+        self.hashes = array('Q', sorted({url_hash(url) for url in self}))
+        self.recent_hashes = set()
+
+    def locate(self, index):
+        """
+        Returns the chunk index and the position within the chunk of the url at the supplied list index.  The chunk
+        index is None if the url is in the uncompressed tail.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('download history index out of range')
+        for chunk_index, size in enumerate(self.chunk_sizes):
+            if index < size:
+                return chunk_index, index
+            index -= size
+        return None, index
+
+    def get_chunk(self, index):
+        """Returns the decompressed list of urls in the chunk at the supplied index.  The last chunk read is cached."""
+        if self.cached_chunk is None or self.cached_chunk[0] != index:
+            urls = zlib.decompress(self.chunks[index]).decode('utf-8').split('\n')
+            self.cached_chunk = (index, urls)
+        return self.cached_chunk[1]
+
+    @staticmethod
+    def compress(urls):
+        return zlib.compress('\n'.join(urls).encode('utf-8'))
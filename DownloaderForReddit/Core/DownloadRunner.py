@@ -27,13 +27,22 @@ import prawcore
 from PyQt5.QtCore import QObject, pyqtSignal, QThreadPool, QThread
 from queue import Queue
 from time import time
+from itertools import chain, islice
+from math import ceil
+import threading
 import logging
 
 from ..Utils import Injector, RedditUtils, VideoMerger
 from ..Core.PostFilter import PostFilter
+from ..Core.PollScheduler import PollScheduler
+from ..Core.SubmissionStream import SubmissionStream
 from ..Extractors.Extractor import Extractor
 
 
+# Number of constrained runs a user may be searched for before their listing is read again to re-measure its cost
+LISTING_REMEASURE_INTERVAL = 5
+
+
 class DownloadRunner(QObject):
 
     remove_invalid_object = pyqtSignal(object)
@@ -46,7 +55,7 @@ class DownloadRunner(QObject):
     update_progress_bar_signal = pyqtSignal()
     stop = pyqtSignal()
 
-    def __init__(self, user_list, subreddit_list, queue, unfinished_downloads_list):
+    def __init__(self, user_list, subreddit_list, queue, unfinished_downloads_list, single_subreddit_run_method=None):
         """
         Class that does the main part of the work for the program.  This class contains the praw instance that is used
         for actually extracting the content from reddit.  When an instance is created all settings parameters must be
@@ -57,6 +66,8 @@ class DownloadRunner(QObject):
         :param subreddit_list: The actual list of Subreddit objects contained in the subreddit ListModel class displayed
                                in the GUI. If this class is initialized to only run a user list, this parameter is None
         :param queue: The queue that text is added to in order to update the GUI
+        :param single_subreddit_run_method: The sort method tuple selected for a single subreddit download, which is
+                                            used in place of the subreddit sort method settings.
         The rest of teh parameters are all configuration options that are set in the settings dialog
         """
         super().__init__()
@@ -64,7 +75,13 @@ class DownloadRunner(QObject):
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.settings_manager = Injector.get_settings_manager()
         self._r = RedditUtils.get_reddit_instance()
+        self.client_pool = RedditUtils.RedditClientPool(
+            [RedditUtils.DEFAULT_CLIENT_ID] + self.settings_manager.reddit_client_ids, self._r)
+        self.fetcher_state = threading.local()  # Holds the praw instance used by each listing fetcher thread
         self.post_filter = PostFilter()
+        self.poll_scheduler = PollScheduler()
+        self.use_scheduler = self.settings_manager.adaptive_polling
+        self.listing_counts = {}  # Reddit object names mapped to the new post count and truncation of their listing
         self.user_list = [user for user in user_list if user.enable_download] if user_list is not None else None
         self.subreddit_list = [sub for sub in subreddit_list if sub.enable_download] if \
             subreddit_list is not None else None
@@ -75,7 +92,9 @@ class DownloadRunner(QObject):
         self.downloaded_objects = {}
         self.unfinished_downloads = []
         self.user_run = True if self.user_list is not None else False
-        self.single_subreddit_run_method = None
+        self.single_subreddit_run_method = single_subreddit_run_method
+        self.validation_cache_hits = 0
+        self.validation_cache_misses = 0
 
         self.unfinished_downloads_list = unfinished_downloads_list
         self.load_undownloaded_content = self.settings_manager.save_undownloaded_content
@@ -89,73 +108,274 @@ class DownloadRunner(QObject):
 
     def validate_users(self):
         """Validates users and builds a list of all posts to reddit that meet the user provided criteria"""
-        self.setup_progress_bar.emit(len(self.user_list) * 2)
-        for user in self.user_list:
-            if self.run:
-                redditor = self._r.redditor(user.name)
-                try:
-                    test = redditor.fullname
-                    self.queue.put("%s is valid" % user.name)
-                    user.new_submissions = self.get_submissions(redditor, user)
-                    self.validated_objects.put(user)
-                    user.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(user)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
-
+        users = self.get_due_objects(self.user_list)
+        self.setup_progress_bar.emit(len(users) * 2)
+        self.fetch_listings(self.validate_reddit_objects(users, self.validate_separately()),
+                            lambda reddit, user: self.download_reddit_object(
+                                user, lambda: self.get_submissions(reddit.redditor(user.name), user)))
         self.validated_objects.put(None)  # Shuts down the extractor
 
     def validate_subreddits(self):
         """See validate_users"""
-        self.setup_progress_bar.emit(len(self.subreddit_list) * 2)
-        for sub in self.subreddit_list:
-            if self.run:
-                subreddit = self._r.subreddit(sub.name)
-                try:
-                    test = subreddit.fullname
-                    self.queue.put("%s is valid" % sub.name)
-                    sub.new_submissions = self.get_submissions(subreddit, sub)
-                    self.validated_objects.put(sub)
-                    sub.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(sub)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+        subreddit_list = self.get_due_objects(self.subreddit_list)
+        self.setup_progress_bar.emit(len(subreddit_list) * 2)
+        subreddits = self.validate_reddit_objects(subreddit_list, self.validate_separately())
+        if self.settings_manager.combine_subreddit_listings and self.is_chronological_listing():
+            # A combined hot or top listing is ranked across the subreddits, not by each subreddits own ranking
+            self.fetch_listings(self.group_subreddits(subreddits), self.download_combined_listing)
+        else:
+            self.fetch_listings(subreddits, lambda reddit, sub: self.download_reddit_object(
+                sub, lambda: self.get_submissions(reddit.subreddit(sub.name), sub)))
         self.validated_objects.put(None)
 
     def validate_users_and_subreddits(self):
         """See validate_users"""
-        for sub in self.subreddit_list:
-            if self.run:
-                try:
-                    subreddit = self._r.subreddit(sub.name)
-                    self.validated_subreddits.append(subreddit.display_name)
-                    self.queue.put('%s is valid' % subreddit.display_name)
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(sub)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+        self.use_scheduler = False  # Post rates are learned from unconstrained listings only
+        for sub in self.validate_reddit_objects(self.subreddit_list):
+            self.validated_subreddits.append(sub.name)
+            self.queue.put('%s is valid' % sub.name)
 
         if self.run:
-            for user in self.user_list:
-                redditor = self._r.redditor(user.name)
-                try:
-                    test = redditor.fullname
-                    self.queue.put('%s is valid' % user.name)
-                    user.new_submissions = self.get_user_submissions_from_subreddits(redditor, user)
-                    self.validated_objects.put(user)
-                    user.check_save_directory()
-                    self.update_progress_bar()
-                except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
-                    self.handle_invalid_reddit_object(user)
-                except prawcore.RequestException:
-                    self.handle_failed_connection()
+            self.fetch_listings(self.validate_reddit_objects(self.user_list, self.validate_separately()),
+                                lambda reddit, user: self.download_reddit_object(
+                                    user, lambda: self.get_user_submissions_from_subreddits(
+                                        reddit.redditor(user.name), user)))
 
         self.validated_objects.put(None)
 
+    def get_due_objects(self, reddit_objects):
+        """
+        Returns the reddit objects from the supplied list that are due to be polled if the adaptive polling setting is
+        enabled, otherwise the supplied list is returned.
+        """
+        if not self.use_scheduler:
+            return reddit_objects
+        now = time()
+        due = [x for x in reddit_objects if self.poll_scheduler.is_due(x, now)]
+        skipped = len(reddit_objects) - len(due)
+        if skipped > 0:
+            self.queue.put('%s of %s not due to be checked' % (skipped, len(reddit_objects)))
+            self.logger.info('Skipped reddit objects not due to be polled', extra={'skipped_count': skipped,
+                                                                                   'due_count': len(due)})
+        return due
+
+    def get_post_limit(self, reddit_object):
+        """
+        Returns the post limit to use for the supplied reddit object.  If adaptive polling is enabled and the listing
+        is chronological, the post limit is bounded by the number of posts the reddit object is expected to have made
+        since it was last polled.
+        """
+        if self.use_scheduler and self.is_chronological_listing():
+            return self.poll_scheduler.get_post_limit(reddit_object)
+        return reddit_object.post_limit
+
+    def record_poll(self, reddit_object):
+        """
+        Records the number of posts newer than the date limit that were listed for the supplied reddit object with the
+        poll scheduler.  The count is taken from the listing before the other post filters are applied so that the
+        learned post rate does not depend on the filter settings.
+        """
+        if self.use_scheduler and self.run:
+            count, truncated = self.listing_counts.pop(reddit_object.name, (0, False))
+            self.poll_scheduler.record_poll(reddit_object, count, truncated=truncated)
+
+    def record_listing_count(self, reddit_object, count, post_limit):
+        """
+        Stores the number of posts newer than the date limit that were listed for the supplied reddit object so that it
+        can be recorded with the poll scheduler.
+        :param reddit_object: The reddit object whose listing was read.
+        :param count: The number of listed posts that were newer than the reddit objects date limit.
+        :param post_limit: The post limit that the listing was requested with, or None if it is not known.
+        """
+        self.listing_counts[reddit_object.name] = (count, post_limit is not None and count >= post_limit)
+
+    def fetch_listings(self, items, fetch):
+        """
+        Retrieves the listings for the supplied items using a bounded pool of listing fetcher threads so that several
+        listings are requested at the same time.  Each fetcher uses its own praw instances because praw is not thread
+        safe, but the instances made for a client id share that client ids rate limit budget, so more fetchers do not
+        exceed reddit's rate limit.  The instance used for each item is taken from the client pool, which routes the
+        item to the configured client id with the most rate limit headroom, so the fetcher count is multiplied by the
+        number of client ids.  Items are handed to the fetchers as they are validated and this method returns once
+        every fetcher has finished.  If there is only one fetcher, the listings are retrieved on the calling thread.
+        :param items: An iterable of validated reddit objects, or groups of reddit objects, whose listings are to be
+                      retrieved.
+        :param fetch: A callable that takes a praw instance and an item and retrieves the listing for the item.
+        """
+        thread_count = self.settings_manager.max_listing_fetch_thread_count * len(self.client_pool)
+        if thread_count <= 1:
+            for item in items:
+                self.fetch_with_client_pool(fetch, item)
+            return
+        work_queue = Queue(maxsize=thread_count)
+        fetchers = [threading.Thread(target=self.run_listing_fetcher, args=(work_queue, fetch), daemon=True)
+                    for _ in range(thread_count)]
+        for fetcher in fetchers:
+            fetcher.start()
+        try:
+            for item in items:
+                work_queue.put(item)
+        finally:
+            for _ in fetchers:
+                work_queue.put(None)
+            for fetcher in fetchers:
+                fetcher.join()
+
+    def run_listing_fetcher(self, work_queue, fetch):
+        """
+        Runs on a listing fetcher thread.  Retrieves the listing of each item taken from the work queue with the
+        fetchers own praw instances until None is taken from the queue.
+        :param work_queue: The queue that validated items are taken from.
+        :param fetch: See fetch_listings.
+        """
+        while True:
+            item = work_queue.get()
+            if item is None:
+                break
+            try:
+                self.fetch_with_client_pool(fetch, item)
+            except:
+                # An unexpected error must not end the fetcher while items are still being queued for it
+                self.logger.error('Failed to fetch listing', extra={'item': str(item)}, exc_info=True)
+
+    def fetch_with_client_pool(self, fetch, item):
+        """Calls the supplied fetch callable with a praw instance checked out from the client pool for the item."""
+        reddit = self.client_pool.checkout()
+        self.fetcher_state.reddit = reddit
+        try:
+            fetch(reddit, item)
+        finally:
+            self.client_pool.checkin(reddit)
+
+    def get_thread_reddit_instance(self):
+        """Returns the praw instance that belongs to the calling thread."""
+        return getattr(self.fetcher_state, 'reddit', self._r)
+
+    def validate_separately(self):
+        """
+        Returns True if reddit objects are to be validated with a separate request before their listing is requested.
+        If the skip validation request setting is enabled, the first listing page request is used to validate the
+        reddit object instead, which saves a request for each reddit object downloaded.
+        """
+        return not self.settings_manager.skip_validation_request
+
+    def validate_reddit_objects(self, reddit_objects, validate=True):
+        """
+        Validates the supplied reddit objects and yields each valid reddit object.  Reddit objects with a validation
+        status recorded within the validation cache ttl use the recorded status.  The rest are validated in batches of
+        up to 100 names per request and are yielded as the results of each batch are received.  Invalid reddit objects
+        are handled here and are not yielded.  Validation stops if the run is stopped or a connection to reddit cannot
+        be established.
+        :param reddit_objects: A list of reddit objects of the same type that are to be validated.
+        :param validate: If False, no validation requests are made and every reddit object is yielded so that it can
+                         be validated by the request for its listing.
+        :return: A generator that yields each valid reddit object.
+        """
+        if len(reddit_objects) < 1:
+            return
+        object_type = reddit_objects[0].object_type
+        if not validate:
+            for reddit_object in reddit_objects:
+                if not self.run:
+                    return
+                yield reddit_object
+            return
+        ttl = self.settings_manager.validation_cache_ttl
+        object_dict = {}
+        for reddit_object in reddit_objects:
+            if not self.run:
+                return
+            status = reddit_object.get_cached_validation_status(ttl) if ttl > 0 else None
+            if status is None:
+                object_dict.setdefault(reddit_object.name, []).append(reddit_object)
+                self.validation_cache_misses += 1
+            else:
+                self.validation_cache_hits += 1
+                if status == 'VALID':
+                    yield reddit_object
+                else:
+                    self.handle_invalid_reddit_object(reddit_object)
+        fullnames = {name: objects[0].fullname for name, objects in object_dict.items()}
+        names = list(object_dict.keys())
+        for index in range(0, len(names), RedditUtils.INFO_BATCH_SIZE):
+            if not self.run:
+                return
+            try:
+                results = self.validate_batch(object_type, names[index:index + RedditUtils.INFO_BATCH_SIZE], fullnames)
+            except prawcore.RequestException:
+                self.handle_failed_connection()
+                return
+            for name, fullname in results:
+                for reddit_object in object_dict[name]:
+                    if fullname is None:
+                        reddit_object.set_validation_status('NOT_FOUND')
+                        self.handle_invalid_reddit_object(reddit_object)
+                    else:
+                        reddit_object.fullname = fullname
+                        reddit_object.set_validation_status('VALID')
+                        yield reddit_object
+
+    def validate_batch(self, object_type, names, fullnames):
+        """
+        Validates one batch of names with a praw instance from the client pool.  The instance is checked back in as soon
+        as the batch is complete so that it is not held while the valid reddit objects are being downloaded.
+        :return: A list of tuples of each name and its fullname, or None in place of the fullname if it is not valid.
+        :rtype: list
+        """
+        reddit = self.client_pool.checkout()
+        try:
+            return list(RedditUtils.batch_validate(object_type, names, fullnames, reddit))
+        finally:
+            self.client_pool.checkin(reddit)
+
+    def download_reddit_object(self, reddit_object, get_pages):
+        """
+        Retrieves the listing for a reddit object and sends its submissions to the extractor.  The reddit object is
+        only reported as valid once the first page of its listing has been received, so a reddit object that was not
+        validated separately, or whose validation status was taken from the cache, is handled as invalid if the listing
+        request fails because it does not exist or cannot be accessed.  The outcome of the listing request is recorded
+        as the reddit objects validation status.
+        :param reddit_object: The reddit object whose listing is to be downloaded.
+        :param get_pages: A callable that returns the page generator for the reddit objects listing.
+        """
+        if self.run:
+            try:
+                pages = get_pages()
+                first_page = next(pages, [])
+                reddit_object.set_validation_status('VALID')
+                self.queue.put("%s is valid" % reddit_object.name)
+                reddit_object.check_save_directory()
+                self.stream_submissions(reddit_object, first_page, pages)
+                self.record_poll(reddit_object)
+                self.update_progress_bar()
+            except prawcore.exceptions.Forbidden:
+                reddit_object.set_validation_status('FORBIDDEN')
+                self.handle_invalid_reddit_object(reddit_object)
+            except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, AttributeError):
+                reddit_object.set_validation_status('NOT_FOUND')
+                self.handle_invalid_reddit_object(reddit_object)
+            except prawcore.RequestException:
+                self.handle_failed_connection()
+
+    def stream_submissions(self, reddit_object, first_page, pages):
+        """
+        Sends the reddit object to the extractor with a submission stream that holds the first page of submissions as
+        its new submissions.  The rest of the pages are added to the stream as they are retrieved so that extraction
+        and downloading of the reddit object can begin after the first page.
+        :param reddit_object: The reddit object that the submissions belong to.
+        :param first_page: The first page of filtered submissions, which has already been read from the generator.
+        :param pages: A generator that yields the remaining filtered lists of submissions one listing page at a time.
+        """
+        reddit_object.new_submissions = SubmissionStream(first_page)
+        self.validated_objects.put(reddit_object)
+        try:
+            for page in pages:
+                if not self.run:
+                    break
+                reddit_object.new_submissions.put_page(page)
+        finally:
+            reddit_object.new_submissions.close()
+
     def handle_invalid_reddit_object(self, reddit_object):
         """
         Handles logging, output, and cleanup actions that need to happen when a reddit object fails validation.
@@ -177,7 +397,7 @@ class DownloadRunner(QObject):
         :return: The number of previous downloads that the supplied reddit object has.
         """
         try:
-            download_count = len(reddit_object.previous_downloads)
+            download_count = reddit_object.number_of_downloads
         except:
             download_count = 0
         return download_count
@@ -192,24 +412,36 @@ class DownloadRunner(QObject):
                        'This may mean that reddit is currently unavailable\n'
                        'Please try again later')
 
-    def downloads_finished(self):
-        """Cleans up objects that need to be changed after the download is complete."""
+    def downloads_finished(self, release_journal_jobs=True):
+        """
+        Cleans up objects that need to be changed after the download is complete.
+        :param release_journal_jobs: False if the run was interrupted, in which case the content that was not downloaded
+                                     is left in the download journal so that it can be resumed.
+        :type release_journal_jobs: bool
+        """
         time_string = self.calculate_run_time()
         try:
             for sub in self.subreddit_list:
-                sub.clear_download_session_data()
+                sub.clear_download_session_data(release_journal_jobs)
         except TypeError:
             pass
         try:
             for user in self.user_list:
-                user.clear_download_session_data()
+                user.clear_download_session_data(release_journal_jobs)
         except TypeError:
             pass
         VideoMerger.merge_videos()
+        RedditUtils.crosspost_parent_cache.clear()
+        Injector.get_dedupe_index().close()
         self.logger.info('Download finished', extra={'download_type': 'User' if self.user_run else 'Subreddit',
                                                      'download_count': self.final_download_count,
-                                                     'download_time': time_string})
+                                                     'download_time': time_string,
+                                                     'validation_cache_hits': self.validation_cache_hits,
+                                                     'validation_cache_misses': self.validation_cache_misses})
         self.queue.put('\nFinished\nTime: %s' % time_string)
+        if self.validation_cache_hits + self.validation_cache_misses > 0:
+            self.queue.put('Validation cache: %s hits, %s misses' % (self.validation_cache_hits,
+                                                                     self.validation_cache_misses))
         if len(self.downloaded_objects) > 0:
             self.send_downloaded_objects()
         self.finished.emit()
@@ -243,7 +475,8 @@ class DownloadRunner(QObject):
         Initializes an Extractor object, starts a separate thread, and then runs the extractor from the new thread so
         that content can be simultaneously extracted, validated, and downloaded.
         """
-        self.extraction_runner = ExtractionRunner(self.queue, self.validated_objects, self.queued_posts, self.user_run)
+        self.extraction_runner = ExtractionRunner(self.queue, self.validated_objects, self.queued_posts, self.user_run,
+                                                  not self.is_chronological_listing())
         self.stop.connect(self.extraction_runner.stop)
         self.extraction_thread = QThread()
         self.extraction_runner.moveToThread(self.extraction_thread)
@@ -279,19 +512,244 @@ class DownloadRunner(QObject):
         Extracts posts from a redditor object if the post makes it through the PostFilter
         :param praw_object: A praw redditor object that contains the submission list.
         :param reddit_object: The User object that holds certain filter settings needed for gathering the posts.
-        :return: A list of submissions that have been filtered based on the overall settings and the supplied users
-                 individual settings.
+        :return: A generator that yields lists of submissions, one for each listing page, that have been filtered based
+                 on the overall settings and the supplied users individual settings.
+        """
+        post_limit = self.get_post_limit(reddit_object)
+        return self.filter_submissions(self.get_raw_submissions(praw_object, post_limit), reddit_object,
+                                       self.is_chronological_listing(), post_limit=post_limit)
+
+    def filter_submissions(self, posts, reddit_object, chronological, subreddits=None, post_limit=None):
         """
-        return [post for post in self.get_raw_submissions(praw_object, reddit_object.post_limit) if
-                self.post_filter.filter_post(post, reddit_object)]
+        Reads posts from the supplied listing generator one listing page at a time and yields the posts from each page
+        that make it through the reddit objects compiled filter.  The filter is compiled once and evaluated against the
+        whole page.  Each page is yielded before praw requests the next page from reddit.  If the listing is
+        chronological and the incremental fetch setting is enabled, the listing is no longer read once a post older
+        than the reddit objects date limit is found, which stops praw from requesting any further pages.  If the
+        listing is not chronological, posts that the reddit object has already processed are dropped.  The number of
+        listed posts that are newer than the date limit is recorded for the poll scheduler once the listing ends.
+        :param posts: The listing generator that the posts are read from.
+        :param reddit_object: The reddit object that holds the filter settings for the posts.
+        :param chronological: True if the listing is sorted from newest to oldest.
+        :param subreddits: An optional list of subreddit names that the posts must have been made in.
+        :param post_limit: The post limit that the listing was requested with, if known.
+        :return: A generator that yields a list of the posts from each listing page that passed the filter.
+        """
+        incremental = chronological and self.settings_manager.incremental_listing_fetch
+        post_filter = self.post_filter.compile(reddit_object)
+        new_post_count = 0
+        posts = iter(posts)
+        while True:
+            listing_page = list(islice(posts, RedditUtils.LISTING_PAGE_SIZE))
+            last_page = len(listing_page) < RedditUtils.LISTING_PAGE_SIZE
+            new_post_count += sum(1 for post in listing_page if post_filter.date_filter(post))
+            if not chronological:  # Drop posts that were already processed during an earlier run
+                listing_page = [post for post in listing_page if not reddit_object.check_post_seen(post)]
+            page = []
+            reached_date_limit = False
+            for post, passed in zip(listing_page, post_filter.evaluate(listing_page)):
+                if passed:
+                    if subreddits is None or RedditUtils.get_subreddit_name(post) in subreddits:
+                        page.append(post)
+                elif incremental and post_filter.reached_date_limit(post):
+                    reached_date_limit = True
+                    break
+            yield self.finish_page(page)
+            if reached_date_limit or last_page:
+                self.record_listing_count(reddit_object, new_post_count, post_limit)
+                return
+
+    @staticmethod
+    def group_subreddits(subreddits):
+        """
+        Groups the supplied subreddits so that the listings of each group can be requested as one combined listing.
+        :param subreddits: An iterable of validated subreddits or subreddit names.
+        :return: A generator that yields lists of up to MULTIREDDIT_SIZE subreddits.
+        """
+        group = []
+        for sub in subreddits:
+            group.append(sub)
+            if len(group) >= RedditUtils.MULTIREDDIT_SIZE:
+                yield group
+                group = []
+        if group:
+            yield group
+
+    def download_combined_listing(self, reddit, subreddits):
+        """
+        Retrieves one combined listing (r/a+b+c) for the supplied subreddits and sends each subreddit to the extractor
+        with its own share of the listing.  The combined listing is read until every subreddit has reached its post
+        limit or date limit, or the sum of the subreddits post limits has been read.  Reddit ends every listing after
+        about 1000 posts, so busy subreddits can use up the combined listing before a quiet subreddit reaches its
+        limits.  The listings of the subreddits that had not reached their limits when the combined listing ran out are
+        then retrieved individually so that none of their posts are missed.  Combined listings are only used for
+        chronological listings.  If the combined listing cannot be retrieved because one of the subreddits does not
+        exist or cannot be accessed, the subreddits listings are retrieved individually so that the invalid subreddit
+        can be identified.
+        :param reddit: The praw instance to use for the listing requests.
+        :param subreddits: A list of the subreddits whose listings are to be retrieved.
+        """
+        if not self.run:
+            return
+        combined = reddit.subreddit('+'.join(sub.name for sub in subreddits))
+        posts = iter(self.get_raw_submissions(combined, sum(self.get_post_limit(sub) for sub in subreddits)))
+        try:
+            first_post = next(posts, None)
+        except (prawcore.exceptions.Redirect, prawcore.exceptions.NotFound, prawcore.exceptions.Forbidden):
+            for sub in subreddits:
+                self.download_reddit_object(sub, lambda: self.get_submissions(reddit.subreddit(sub.name), sub))
+            return
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+            return
+        for sub in subreddits:
+            sub.set_validation_status('VALID')
+            self.queue.put("%s is valid" % sub.name)
+            sub.check_save_directory()
+            sub.new_submissions = SubmissionStream()
+            self.validated_objects.put(sub)
+        try:
+            unfinished = {}
+            if first_post is not None:
+                unfinished = self.demultiplex_submissions(chain([first_post], posts), subreddits,
+                                                          self.is_chronological_listing())
+            for sub, listed_ids in unfinished.items():
+                self.finish_individual_listing(reddit, sub, listed_ids)
+            for sub in subreddits:
+                self.record_poll(sub)
+        except prawcore.RequestException:
+            self.handle_failed_connection()
+        finally:
+            for sub in subreddits:
+                sub.new_submissions.close()
+                self.update_progress_bar()
+
+    def demultiplex_submissions(self, posts, subreddits, chronological):
+        """
+        Reads posts from a combined listing and adds the posts that make it through the PostFilter for the subreddit
+        they were posted in to that subreddits submission stream one listing page at a time.  A subreddits stream is
+        closed once the subreddit has reached its post limit, or, if the listing is chronological and the incremental
+        fetch setting is enabled, once a post older than the subreddits date limit is found.  Posts already processed by
+        a subreddit are dropped if the listing is not chronological.  The listing is no longer read once every stream
+        has been closed, and the number of posts newer than each subreddits date limit that were listed is recorded for
+        the poll scheduler.
+        :param posts: The combined listing generator that the posts are read from.
+        :param subreddits: The subreddits that the combined listing is made of.  Each must have a submission stream.
+        :param chronological: True if the listing is sorted from newest to oldest.
+        :return: A dict of the subreddits whose streams were still open when the combined listing ran out, mapped to
+                 the set of the ids of the posts that were listed for each of them.  The streams are left open.
+        :rtype: dict
+        """
+        incremental = chronological and self.settings_manager.incremental_listing_fetch
+        open_subs = {sub.name.lower(): sub for sub in subreddits}
+        filters = {name: self.post_filter.compile(sub) for name, sub in open_subs.items()}
+        limits = {name: self.get_post_limit(sub) for name, sub in open_subs.items()}
+        counts = dict.fromkeys(open_subs, 0)
+        new_post_counts = dict.fromkeys(open_subs, 0)
+        pages = {name: [] for name in open_subs}
+        listed_ids = {name: set() for name in open_subs}
+        posts = iter(posts)
+        while open_subs and self.run:
+            listing_page = [(RedditUtils.get_subreddit_name(post).lower(), post) for post in
+                            islice(posts, RedditUtils.LISTING_PAGE_SIZE)]
+            results = self.evaluate_combined_page(listing_page, filters)
+            for index, (name, post) in enumerate(listing_page):
+                sub = open_subs.get(name)
+                if sub is None:
+                    continue
+                counts[name] += 1
+                if filters[name].date_filter(post):
+                    new_post_counts[name] += 1
+                listed_ids[name].add(post.id)
+                finished = counts[name] >= limits[name]
+                if not chronological and sub.check_post_seen(post):
+                    pass  # Already processed during an earlier run
+                elif results[index]:
+                    pages[name].append(post)
+                elif incremental and filters[name].reached_date_limit(post):
+                    finished = True
+                if finished:
+                    del open_subs[name]
+                    sub.new_submissions.put_page(self.finish_page(pages.pop(name)))
+                    sub.new_submissions.close()
+            self.put_combined_pages(pages, subreddits)
+            if len(listing_page) < RedditUtils.LISTING_PAGE_SIZE:
+                break
+        if not self.run:
+            return {}
+        for sub in subreddits:
+            name = sub.name.lower()
+            self.record_listing_count(sub, new_post_counts[name], limits[name])
+        return {sub: listed_ids[name] for name, sub in open_subs.items()}
+
+    def finish_individual_listing(self, reddit, sub, listed_ids):
+        """
+        Retrieves the individual listing of a subreddit that had not reached its limits when its combined listing ran
+        out, and adds the posts that were not already listed in the combined listing to the subreddits open stream.
+        :param reddit: The praw instance to use for the listing requests.
+        :param sub: The subreddit whose listing is to be finished.
+        :param listed_ids: The ids of the posts that were listed for the subreddit in the combined listing.
+        """
+        self.logger.info('Combined listing exhausted before subreddit limits were reached',
+                         extra={'subreddit': sub.name, 'listed_count': len(listed_ids)})
+        for page in self.get_submissions(reddit.subreddit(sub.name), sub):
+            if not self.run:
+                break
+            page = [post for post in page if post.id not in listed_ids]
+            if page:
+                sub.new_submissions.put_page(page)
+
+    @staticmethod
+    def evaluate_combined_page(listing_page, filters):
+        """
+        Evaluates each subreddits compiled filter against that subreddits posts from a page of a combined listing.
+        :param listing_page: A list of tuples of the lower case subreddit name and the post for each post in the page.
+        :param filters: A dict of lower case subreddit names to the subreddits compiled filter.
+        :return: A list of the filter result of each post in the page, in page order.  Posts from subreddits that are
+                 not in the filter dict are given False.
+        """
+        groups = {}
+        for index, (name, post) in enumerate(listing_page):
+            if name in filters:
+                groups.setdefault(name, []).append(index)
+        results = [False] * len(listing_page)
+        for name, indexes in groups.items():
+            for index, passed in zip(indexes, filters[name].evaluate([listing_page[x][1] for x in indexes])):
+                results[index] = passed
+        return results
+
+    def put_combined_pages(self, pages, subreddits):
+        """
+        Adds the posts collected for each subreddit from a page of a combined listing to the subreddits submission
+        stream.  The crosspost parents of all of the posts are resolved together.
+        """
+        self.finish_page([post for page in pages.values() for post in page])
+        for sub in subreddits:
+            page = pages.get(sub.name.lower())
+            if page:
+                sub.new_submissions.put_page(list(page))
+                page.clear()
+
+    def finish_page(self, page):
+        """Performs the batched requests needed for a page of filtered submissions before it is sent for extraction."""
+        RedditUtils.resolve_crosspost_parents(page, self.get_thread_reddit_instance())
+        return page
+
+    def is_chronological_listing(self):
+        """Returns True if the listings being retrieved for this run are sorted from newest to oldest."""
+        return self.user_run or self.get_subreddit_sort_method()[0] == 'NEW'
 
     def get_raw_submissions(self, praw_object, post_limit):
         """
-        Gets the raw submission generator from the praw object based on the appropriate settings.
+        Gets the raw submission generator from the praw object based on the appropriate settings.  If the raw listing
+        setting is enabled, the listing is requested as json and yields submission records instead of praw submissions.
         :param praw_object: Either a praw Redditor or Subreddit object.
         :param post_limit: The post limit from the reddit object that the submissions are for.
         :return: A list generator of submissions from the supplied praw_object.
         """
+        if self.settings_manager.raw_listing_ingestion:
+            path, params = self.get_listing_path(praw_object)
+            return RedditUtils.get_listing_records(self.get_thread_reddit_instance(), path, post_limit, params)
         if self.user_run:
             posts = praw_object.submissions.new(limit=post_limit)
         else:
@@ -308,6 +766,23 @@ class DownloadRunner(QObject):
                 posts = praw_object.top(sort[1].lower(), limit=post_limit)
         return posts
 
+    def get_listing_path(self, praw_object):
+        """
+        Returns the api path and query parameters of the listing that get_raw_submissions would request from the
+        supplied praw object.
+        :rtype: tuple
+        """
+        if self.user_run:
+            return '/user/%s/submitted' % praw_object.name, {'sort': 'new'}
+        sort = self.get_subreddit_sort_method()
+        path = '/r/%s/%%s' % praw_object.display_name
+        if sort[0] in ('NEW', 'HOT', 'RISING'):
+            return path % sort[0].lower(), {}
+        elif sort[0] == 'CONTROVERSIAL':
+            return path % 'controversial', {'t': 'all'}
+        else:
+            return path % 'top', {'t': sort[1].lower()}
+
     def get_subreddit_sort_method(self):
         """
         Method used to determine the subreddit sort method.  This is necessary because if a subreddit is downloaded as
@@ -322,15 +797,74 @@ class DownloadRunner(QObject):
 
     def get_user_submissions_from_subreddits(self, redditor, user):
         """
-        Returns a list of redditor submissions that are only from subreddits that are in the validated subreddit list.
-        All other user filters still apply.
+        Returns the redditor submissions that are only from subreddits that are in the validated subreddit list.
+        All other user filters still apply.  The submissions are taken either from the users own listing or from a
+        search of the validated subreddits for posts by the user, whichever is estimated to need fewer requests.
         :param redditor: The praw redditor object from which the posts will be extracted.
         :param user: The RedditObject that holds some filtering information needed.
-        :return: A list of submissions that are from the validated subreddits and that pass the users filtering
-                 requirements
+        :return: A generator that yields lists of submissions, one for each listing page, that are from the validated
+                 subreddits and that pass the users filtering requirements
+        """
+        if self.use_subreddit_search(user):
+            return self.search_user_submissions(user)
+        return self.measure_user_listing(self.get_raw_submissions(redditor, user.post_limit), user)
+
+    def use_subreddit_search(self, user):
+        """
+        Estimates the number of requests needed to find the users posts in the validated subreddits by reading the
+        users listing and by searching the validated subreddits, based on the number of posts read and matched for the
+        user in previous constrained runs.  Users without a recorded history have their listing read, and users whose
+        listing has not been read in the last LISTING_REMEASURE_INTERVAL constrained runs have it read again so that
+        the listing estimate follows changes in how often the user posts.
+        :param user: The user whose submissions are to be retrieved.
+        :return: True if searching the validated subreddits is expected to need fewer requests.
+        :rtype: bool
         """
-        return [post for post in redditor.submissions.new(limit=user.post_limit) if post.subreddit.display_name in
-                self.validated_subreddits and self.post_filter.filter_post(post, user)]
+        if not self.settings_manager.allow_constrained_search or user.listing_scan_average is None or \
+                user.listing_match_average is None:
+            return False
+        if user.searches_since_listing_scan >= LISTING_REMEASURE_INTERVAL:
+            return False
+        listing_cost = max(1, ceil(user.listing_scan_average / RedditUtils.LISTING_PAGE_SIZE))
+        groups = ceil(len(self.validated_subreddits) / RedditUtils.MULTIREDDIT_SIZE)
+        search_cost = groups * max(1, ceil(user.listing_match_average / RedditUtils.LISTING_PAGE_SIZE))
+        return search_cost < listing_cost
+
+    def measure_user_listing(self, posts, user):
+        """
+        Filters the users listing to the validated subreddits and records the number of posts read and matched so that
+        the cost of the users listing can be estimated in later runs.
+        :return: A generator that yields lists of submissions, one for each listing page.
+        """
+        scanned = 0
+        matched = 0
+
+        def count(listing):
+            nonlocal scanned
+            for post in listing:
+                scanned += 1
+                yield post
+
+        for page in self.filter_submissions(count(posts), user, True, self.validated_subreddits):
+            matched += len(page)
+            yield page
+        user.record_listing_cost(scanned, matched)
+
+    def search_user_submissions(self, user):
+        """
+        Searches the validated subreddits for posts by the supplied user, newest first.  The subreddits are searched
+        in combined groups so that each group needs only its own search requests.
+        :return: A generator that yields lists of submissions, one for each listing page.
+        """
+        reddit = self.get_thread_reddit_instance()
+        matched = 0
+        for group in self.group_subreddits(self.validated_subreddits):
+            posts = reddit.subreddit('+'.join(group)).search('author:"%s"' % user.name, sort='new',
+                                                             limit=user.post_limit)
+            for page in self.filter_submissions(posts, user, True):
+                matched += len(page)
+                yield page
+        user.record_listing_cost(None, matched)
 
     def add_downloaded_object(self, obj_tuple):
         """
@@ -370,13 +904,18 @@ class DownloadRunner(QObject):
             for post in self.queued_posts.get():
                 self.unfinished_downloads_signal.emit(post)
 
-    @DeprecationWarning
     def finish_downloads(self):
-        """This method is deprecated."""
-        self.queued_posts = self.unfinished_downloads_list
-        self.final_download_count = len(self.queued_posts)
+        """
+        Sends the unfinished downloads list straight to the downloader.  The content in the list has already been
+        validated and extracted, such as content rebuilt from the download journal after the application was closed
+        during a download, so nothing is validated or extracted again.
+        """
+        self.final_download_count = len(self.unfinished_downloads_list)
         self.status_bar_update.emit('Downloaded: 0  of  %s' % self.final_download_count)
-        self.start_downloader()
+        for content in self.unfinished_downloads_list:
+            content.install_queue(self.queue)
+            self.queued_posts.put(content)
+        self.validated_objects.put(None)  # The extractor ends the download queue once it finishes
 
     def skip_user_validation(self):
         """
@@ -400,13 +939,15 @@ class ExtractionRunner(QObject):
     send_object = pyqtSignal(tuple)
     send_failed_extract = pyqtSignal(object)
 
-    def __init__(self, queue, valid_objects, post_queue, user_extract):
+    def __init__(self, queue, valid_objects, post_queue, user_extract, record_seen=False):
         """
         A class that is extracts downloadable links from container websites who's links have been posted to reddit
 
         :param queue: The main window queue used to update the GUI output box
         :param valid_objects: Users or subreddits that have been validated
         :param post_queue: The queue where downloadable links are passed to be downloaded by the downloader thread
+        :param record_seen: True if the extracted posts are to be recorded as seen, which is the case when the listings
+                            of the run are not chronological.
         """
         super().__init__()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
@@ -414,6 +955,7 @@ class ExtractionRunner(QObject):
         self.validated_objects = valid_objects
         self.post_queue = post_queue
         self.user_extract = user_extract
+        self.record_seen = record_seen
         self.extract_count = 0
         self.run = True
 
@@ -427,6 +969,7 @@ class ExtractionRunner(QObject):
             working_object = self.validated_objects.get()
             if working_object is not None:
                 working_object.load_unfinished_downloads()
+                self.queue_content(working_object.content)
                 self.extract(working_object)
 
                 if len(working_object.failed_extracts) > 0:
@@ -434,12 +977,7 @@ class ExtractionRunner(QObject):
                         self.send_failed_extract.emit(entry)
                         self.queue.put(entry.format_failed_text())
                 if len(working_object.content) > 0:
-                    self.queue.put('Count %s' % len(working_object.content))
                     self.send_object.emit((working_object.name, [x.filename for x in working_object.content]))
-                for post in working_object.content:
-                    self.extract_count += 1
-                    post.queue = self.queue
-                    self.post_queue.put(post)
                 self.update_progress_bar.emit()
             else:
                 self.run = False
@@ -451,9 +989,35 @@ class ExtractionRunner(QObject):
         :param reddit_object: The reddit object for which content is to be extracted.
         :type reddit_object: RedditObject
         """
-        extractor = Extractor(reddit_object)
+        extractor = Extractor(reddit_object, self.queue_content, self.record_seen)
         extractor.run()
 
+    def queue_content(self, content_list):
+        """
+        Sends the supplied content to the downloader as soon as it has been extracted so that downloads can begin
+        before the rest of the reddit objects submissions have been extracted.
+        :param content_list: A list of content items that have been extracted and are ready to be downloaded.
+        :type content_list: list
+        """
+        if len(content_list) > 0:
+            self.queue.put('Count %s' % len(content_list))
+            self.journal_content(content_list)
+            for content in content_list:
+                self.extract_count += 1
+                content.queue = self.queue
+                self.post_queue.put(content)
+
+    def journal_content(self, content_list):
+        """
+        Records the supplied content in the download journal so that it can be resumed if the application is closed
+        before it is downloaded.  Content that is already journaled, such as unfinished content being downloaded
+        again, is not recorded twice.
+        """
+        try:
+            Injector.get_download_journal().enqueue([x for x in content_list if x.journal is None])
+        except Exception:
+            self.logger.error('Failed to record content in download journal', exc_info=True)
+
     def finish(self):
         """
         Cleans up items for the end of the extraction run.
@@ -0,0 +1,196 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+from PyQt5.QtCore import Qt
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+import json
+import logging
+
+from ..Core.DownloadRunner import DownloadRunner, ExtractionRunner
+
+
+class HeadlessDownloadRunner(DownloadRunner):
+
+    def __init__(self, user_list, subreddit_list, queue, unfinished_downloads_list):
+        """
+        A download runner that does not need a Qt event loop, so that a list can be downloaded from the command line on
+        a machine without a display.  Validation, extraction, and downloading each run on a plain thread and the
+        downloads are run by a thread pool executor in place of the QThreadPool.  Signals are connected directly, as
+        there is no event loop to deliver queued signals.  See DownloadRunner for the parameters.
+        """
+        self.invalid_objects = []
+        self.failed_posts = []
+        self.connection_failed = False
+        self.interrupted = False
+        super().__init__(user_list, subreddit_list, queue, unfinished_downloads_list)
+        self.remove_invalid_object.connect(self.invalid_objects.append, Qt.DirectConnection)
+        self.failed_download_signal.connect(self.failed_posts.append, Qt.DirectConnection)
+
+    def start_extractor(self):
+        self.extraction_runner = ExtractionRunner(self.queue, self.validated_objects, self.queued_posts, self.user_run,
+                                                  not self.is_chronological_listing())
+        self.stop.connect(self.extraction_runner.stop, Qt.DirectConnection)
+        self.extraction_runner.update_progress_bar.connect(self.update_progress_bar, Qt.DirectConnection)
+        self.extraction_runner.send_object.connect(self.add_downloaded_object, Qt.DirectConnection)
+        self.extraction_runner.send_failed_extract.connect(self.send_failed_extract, Qt.DirectConnection)
+        self.extraction_thread = threading.Thread(target=self.extraction_runner.run_extraction, daemon=True)
+        self.extraction_thread.start()
+
+    def start_downloader(self):
+        self.downloader = HeadlessDownloader(self.queued_posts, self.settings_manager.max_download_thread_count)
+        self.stop.connect(self.downloader.stop, Qt.DirectConnection)
+        self.downloader_thread = threading.Thread(target=self.downloader.download, daemon=True)
+        self.downloader_thread.start()
+
+    def run_download(self, download_type):
+        """
+        Runs the download to completion and blocks until it is finished.  The download can be stopped by a keyboard
+        interrupt, in which case the content that was not downloaded remains in the download journal.
+        :param download_type: One of 'USER', 'SUBREDDIT', 'USERS_AND_SUBREDDITS', or 'UNFINISHED', as used by the main
+                              window to select the download runner method.
+        :type download_type: str
+        """
+        validate = {'USER': self.validate_users,
+                    'SUBREDDIT': self.validate_subreddits,
+                    'USERS_AND_SUBREDDITS': self.validate_users_and_subreddits,
+                    'UNFINISHED': self.finish_downloads}[download_type]
+        validation_thread = threading.Thread(target=validate, daemon=True)
+        validation_thread.start()
+        try:
+            while self.downloader_thread.is_alive():
+                self.downloader_thread.join(0.5)
+        except KeyboardInterrupt:
+            self.interrupted = True
+            self.stop_download()
+            self.validated_objects.put(None)
+            self.queued_posts.put(None)
+            self.downloader_thread.join()
+            self.extraction_thread.join()
+        self.final_download_count = self.downloader.download_count
+        self.downloads_finished(release_journal_jobs=not self.interrupted)
+
+    def handle_failed_connection(self):
+        self.connection_failed = True
+        super().handle_failed_connection()
+
+
+class HeadlessDownloader:
+
+    def __init__(self, queue, thread_limit):
+        """
+        The thread pool executor counterpart of the Downloader, which takes content from the download queue until it
+        receives None and downloads each item on one of its threads.
+        :param queue: The download queue in which extracted content is placed.
+        :param thread_limit: The maximum number of content items that are downloaded at once.
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.queue = queue
+        self.download_count = 0
+        self.run = True
+        self.executor = ThreadPoolExecutor(max(1, thread_limit))
+        self.futures = []
+
+    def download(self):
+        self.logger.info('Downloader started')
+        while self.run:
+            post = self.queue.get()
+            if post is not None and self.run:
+                self.futures.append(self.executor.submit(post.run))
+                self.download_count += 1
+            else:
+                self.run = False
+        wait(self.futures)
+        self.executor.shutdown()
+        self.logger.info('Downloader finished', extra={'download_count': self.download_count})
+
+    def stop(self):
+        """Stops the downloader.  Downloads that have started are allowed to finish, the rest are cancelled."""
+        self.run = False
+        for future in list(self.futures):
+            future.cancel()
+
+
+class ProgressReporter(threading.Thread):
+
+    def __init__(self, queue, stream):
+        """
+        Takes the output messages that the download run puts in the queue and writes each one to the supplied stream as
+        a line of JSON, along with running totals, so that the progress of a run can be read by other programs.
+        :param queue: The output queue that is supplied to the download runner.
+        :param stream: The text stream that progress is written to.
+        """
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.totals = {'queued': 0, 'downloaded': 0, 'failed': 0, 'invalid': 0}
+
+    def run(self):
+        message = self.queue.get()
+        while message is not None:
+            if message.strip():
+                self.report(*self.parse_message(message.strip()))
+            message = self.queue.get()
+
+    def stop(self):
+        """Stops the reporter once the messages already in the queue have been written."""
+        self.queue.put(None)
+        self.join()
+
+    @staticmethod
+    def parse_message(message):
+        """
+        Sorts an output message into a progress event.
+        :param message: A message put in the output queue by the download run.
+        :type message: str
+        :return: A tuple of the event name and a dict of the event details.
+        :rtype: tuple
+        """
+        if message.startswith('Saved: '):
+            return 'downloaded', {'file': message[len('Saved: '):]}
+        if message.startswith('Linked: '):
+            return 'downloaded', {'file': message[len('Linked: '):], 'linked': True}
+        if message.startswith('Count '):
+            return 'queued', {'count': int(message.rsplit(' ', 1)[1])}
+        if message.lower().startswith('fail'):
+            return 'failed', {'message': message}
+        if message.endswith(' is valid'):
+            return 'valid', {'name': message[:-len(' is valid')]}
+        if message.endswith(' does not exist'):
+            return 'invalid', {'name': message[:-len(' does not exist')]}
+        return 'message', {'message': message}
+
+    def report(self, event, details):
+        if event == 'queued':
+            self.totals['queued'] += details['count']
+        elif event in self.totals:
+            self.totals[event] += 1
+        self.write(event, dict(details, **self.totals))
+
+    def write(self, event, details):
+        with self.lock:
+            self.stream.write(json.dumps(dict(event=event, **details)) + '\n')
+            self.stream.flush()
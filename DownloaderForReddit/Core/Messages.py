@@ -63,6 +63,12 @@ class Message(object):
         reply = message.information(self, 'Cannot Save While Running', text, message.Ok)
         return reply == message.Ok
 
+    def cannot_save_while_loading(self):
+        text = 'Cannot save while the user and subreddit lists are loading.  Please wait for the lists to finish ' \
+               'loading and try again'
+        reply = message.information(self, 'Cannot Save While Loading', text, message.Ok)
+        return reply == message.Ok
+
     def remove_reddit_object(self, name):
         text = 'Are you sure you sure you want to remove %s from the list along with all associated information?' % name
         reply = message.question(self, 'Remove %s' % name, text, message.Yes, message.No)
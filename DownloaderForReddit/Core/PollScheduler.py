@@ -0,0 +1,112 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from time import time
+
+from ..Utils import Injector
+
+
+MIN_POST_LIMIT = 10  # The smallest post limit given to a reddit object that is expected to have no new posts
+
+
+class PollScheduler:
+
+    def __init__(self):
+        """
+        Decides which reddit objects are due to be downloaded based on the rate at which each reddit object posts.  A
+        reddit object is polled again once it is expected to have accumulated half of its post limit in new posts,
+        within the minimum and maximum poll interval settings, so busy reddit objects are polled often and reddit
+        objects that rarely post are polled rarely.  The post rate is learned from the number of posts newer than the
+        reddit objects date limit that were listed each time the reddit object is polled.
+        """
+        self.settings_manager = Injector.get_settings_manager()
+
+    def is_due(self, reddit_object, now=None):
+        """
+        Returns True if the supplied reddit object is due to be polled.  Reddit objects that have not been scheduled
+        are always due.
+        :param reddit_object: The reddit object to be checked.
+        :param now: The current time.  Supplied so that a whole list can be checked against the same time.
+        :rtype: bool
+        """
+        now = now if now is not None else time()
+        return reddit_object.next_due is None or reddit_object.next_due <= now
+
+    @staticmethod
+    def get_post_rate(reddit_object):
+        """
+        Returns the post rate, in posts per second, of the supplied reddit object as observed from the listings of its
+        previous polls, or None if the reddit object has not been polled twice since scheduling began.
+        """
+        return reddit_object.post_rate
+
+    def get_post_limit(self, reddit_object, now=None):
+        """
+        Returns the post limit to use for the supplied reddit object.  The reddit objects post limit is bounded to
+        twice the number of posts it is expected to have made since it was last polled, so that quiet reddit objects
+        are not read further than needed.  The bound is never less than MIN_POST_LIMIT or the number of new posts that
+        were listed in the last poll.
+        :rtype: int
+        """
+        now = now if now is not None else time()
+        rate = self.get_post_rate(reddit_object)
+        if rate is None or reddit_object.last_checked is None:
+            return reddit_object.post_limit
+        expected = rate * (now - reddit_object.last_checked)
+        return min(reddit_object.post_limit,
+                   max(MIN_POST_LIMIT, reddit_object.last_post_count or 0, int(expected * 2) + 1))
+
+    def record_poll(self, reddit_object, new_post_count, now=None, truncated=False):
+        """
+        Updates the post rate of the supplied reddit object with the number of new posts found since it was last
+        polled and calculates the time that the reddit object is next due.
+        :param reddit_object: The reddit object that has been polled.
+        :param new_post_count: The number of posts newer than the reddit objects date limit that were listed for the
+                               reddit object, before any of the other post filters were applied.
+        :param now: The time of the poll.
+        :param truncated: True if the listing ended at its post limit while every post listed was new, in which case
+                          new_post_count is only a lower bound and the next listing is not bounded by the scheduler.
+        :type new_post_count: int
+        :type truncated: bool
+        """
+        now = now if now is not None else time()
+        if reddit_object.last_checked is not None:
+            observed = new_post_count / max(now - reddit_object.last_checked, 1)
+            rate = self.get_post_rate(reddit_object)
+            reddit_object.post_rate = observed if rate is None else (rate + observed) / 2
+        reddit_object.last_post_count = reddit_object.post_limit if truncated else new_post_count
+        reddit_object.last_checked = now
+        reddit_object.next_due = now + self.get_poll_interval(reddit_object)
+        reddit_object.dirty = True
+
+    def get_poll_interval(self, reddit_object):
+        """Returns the number of seconds until the supplied reddit object should be polled again."""
+        min_interval = self.settings_manager.min_poll_interval_hours * 3600
+        max_interval = self.settings_manager.max_poll_interval_hours * 3600
+        rate = self.get_post_rate(reddit_object)
+        if rate is None:
+            return min_interval
+        if rate <= 0:
+            return max_interval
+        return min(max_interval, max(min_interval, (reddit_object.post_limit / 2) / rate))
@@ -22,24 +22,93 @@ You should have received a copy of the GNU General Public License
 along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
-from ..Utils import Injector
+import re
+import logging
+import operator
+
+from ..Utils import Injector, RedditUtils
 
 
 class PostFilter:
 
     def __init__(self):
         self.settings_manager = Injector.get_settings_manager()
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.last_compiled = (None, None)  # The last reddit object that filter_post was called for and its filter
 
     def filter_post(self, post, reddit_object):
         """
         Filters a post by calling various methods to see if the post meets the methods criteria based on global and
-        reddit object settings and returns True of False depending on if the post passed all criteria.
+        reddit object settings and returns True of False depending on if the post passed all criteria.  The compiled
+        filter of the last reddit object is reused so that the filter is only compiled once while the posts of a reddit
+        object are filtered one at a time.
         :param post: A praw submission item that is tested to see if it will be extracted.
         :param reddit_object: The reddit object to which the post belongs.
         :return: True or False depending on if the post passed the filter criteria.
         """
-        return self.score_filter(post) and self.nsfw_filter(post, reddit_object) and \
-               self.date_filter(post, reddit_object)
+        last_object, compiled = self.last_compiled
+        if last_object is not reddit_object:
+            compiled = self.compile(reddit_object)
+            self.last_compiled = (reddit_object, compiled)
+        return compiled.passes(post)
+
+    def compile(self, reddit_object):
+        """
+        Builds the effective filter for the supplied reddit object from the global settings and the reddit objects
+        filter rules.  Settings and limits are read once here and bound into the rules, so that applying the returned
+        filter only tests the posts, and rules that do not apply to the reddit object are left out.  Any of the
+        rule settings can be overridden for a single reddit object by an entry of the same name in its filter_rules
+        dict.  A title filter regex that cannot be compiled is logged and left out of the filter.
+        :param reddit_object: The reddit object to which the posts that are to be filtered belong.
+        :return: A compiled filter for the reddit object.
+        :rtype: CompiledFilter
+        """
+        overrides = reddit_object.filter_rules
+        rule = lambda name: overrides.get(name, getattr(self.settings_manager, name))
+        rules = []
+        if self.settings_manager.restrict_by_score:
+            score_limit = self.settings_manager.post_score_limit
+            compare = operator.ge if self.settings_manager.score_limit_operator == 'GREATER' else operator.le
+            rules.append(lambda post: compare(post.score, score_limit))
+        if reddit_object.nsfw_filter in ('EXCLUDE', 'ONLY'):
+            nsfw_only = reddit_object.nsfw_filter == 'ONLY'
+            rules.append(lambda post: bool(post.over_18) is nsfw_only)
+        date_limit = self.get_date_limit(reddit_object)
+        rules.append(lambda post: post.created > date_limit)
+
+        allowed_domains = tuple(x.lower() for x in rule('domain_whitelist'))
+        if allowed_domains:
+            rules.append(lambda post: self.match_domain(post.domain, allowed_domains))
+        denied_domains = tuple(x.lower() for x in rule('domain_blacklist'))
+        if denied_domains:
+            rules.append(lambda post: not self.match_domain(post.domain, denied_domains))
+        title_regex = rule('title_filter_regex')
+        if title_regex:
+            try:
+                pattern = re.compile(title_regex, re.IGNORECASE)
+                rules.append(lambda post: pattern.search(post.title or '') is not None)
+            except re.error:
+                self.logger.warning('Invalid title filter regex skipped', extra={'regex': title_regex,
+                                                                                  'reddit_object': reddit_object.name},
+                                    exc_info=True)
+        flairs = {x.lower() for x in rule('flair_filter')}
+        if flairs:
+            rules.append(lambda post: (RedditUtils.get_post_value(post, 'link_flair_text') or '').lower() in flairs)
+        min_resolution = rule('min_post_resolution')
+        if min_resolution > 0:
+            rules.append(lambda post: self.meets_resolution(RedditUtils.get_post_height(post), min_resolution))
+        return CompiledFilter(reddit_object, rules, date_limit)
+
+    @staticmethod
+    def match_domain(domain, domains):
+        """Returns True if the supplied domain is one of, or a subdomain of one of, the supplied domains."""
+        domain = (domain or '').lower()
+        return any(domain == x or domain.endswith('.' + x) for x in domains)
+
+    @staticmethod
+    def meets_resolution(height, min_resolution):
+        """Returns True if the height is at least the minimum resolution.  Posts with an unknown height pass."""
+        return height is None or height >= min_resolution
 
     def score_filter(self, post):
         """
@@ -79,6 +148,27 @@ class PostFilter:
         date_limit = self.get_date_limit(reddit_object)
         return post.created > date_limit
 
+    def reached_date_limit(self, post, reddit_object):
+        """
+        Tests if the post was made at or before the reddit objects date limit and is not a pinned post.  In a listing
+        that is sorted by new, every post that follows such a post is also older than the date limit, so the listing
+        does not need to be read any further.  Pinned and stickied posts are ignored because they are shown at the top
+        of a listing regardless of their age.
+        :param post: A praw submission item to be tested.
+        :param reddit_object: A reddit object (User or Subreddit) which holds the date limit criteria to be tested.
+        :return: True if the post is an unpinned post that is older than the reddit objects date limit.
+        """
+        return not self.is_pinned(post) and not self.date_filter(post, reddit_object)
+
+    @staticmethod
+    def is_pinned(post):
+        """
+        Returns True if the post is pinned to a users profile or stickied in a subreddit.  The attributes are read
+        so that a lazy praw submission is not fetched when they are not present.
+        """
+        return bool(RedditUtils.get_post_value(post, 'stickied', False) or
+                    RedditUtils.get_post_value(post, 'pinned', False))
+
     @staticmethod
     def get_date_limit(reddit_object):
         """
@@ -89,3 +179,46 @@ class PostFilter:
             return reddit_object.date_limit
         else:
             return reddit_object.custom_date_limit
+
+
+class CompiledFilter:
+
+    def __init__(self, reddit_object, rules, date_limit):
+        """
+        The effective filter of a single reddit object as built by PostFilter.compile.  Each rule takes a post and
+        returns True if the post passes the rule.  A whole listing page is evaluated one rule at a time, and each rule
+        is only applied to the posts that passed the rules before it.
+        :param reddit_object: The reddit object that the filter was compiled for.
+        :param rules: A list of the rule callables that a post must pass.
+        :param date_limit: The date limit of the reddit object at the time the filter was compiled.
+        """
+        self.reddit_object = reddit_object
+        self.rules = rules
+        self.date_limit = date_limit
+
+    def evaluate(self, posts):
+        """
+        Evaluates the rules against the supplied posts.
+        :param posts: A list of posts from a listing page.
+        :return: A list containing True for each post that passed every rule and False for each post that did not.
+        :rtype: list
+        """
+        passing = range(len(posts))
+        for rule in self.rules:
+            passing = [index for index in passing if rule(posts[index])]
+        mask = [False] * len(posts)
+        for index in passing:
+            mask[index] = True
+        return mask
+
+    def passes(self, post):
+        """Returns True if the post passes every rule.  No more rules are applied once the post fails one."""
+        return all(rule(post) for rule in self.rules)
+
+    def date_filter(self, post):
+        """See PostFilter.date_filter"""
+        return post.created > self.date_limit
+
+    def reached_date_limit(self, post):
+        """See PostFilter.reached_date_limit"""
+        return not PostFilter.is_pinned(post) and not self.date_filter(post)
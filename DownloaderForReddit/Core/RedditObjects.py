@@ -23,12 +23,20 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 
+from time import time
+import threading
+
 from ..Extractors.BaseExtractor import *
+from .DownloadHistory import DownloadHistory
 from ..Utils import Injector
 from ..Utils import SystemUtil
 from ..Logging import LogUtils
 
 
+# Held by a download run while it changes reddit objects so that checkpoints are taken from a consistent state
+state_lock = threading.RLock()
+
+
 class RedditObject:
 
     def __init__(self, version, name, save_path, post_limit, avoid_duplicates, download_videos, download_images,
@@ -38,7 +46,8 @@ class RedditObject:
         will be filled with Content objects that contain links for download.
 
         :param name: The name of the user or subreddit which is to be extracted from
-        :param new_submissions: A list of submissions as PRAW objects containing all the reddit data extracted by PRAW
+        :param new_submissions: A SubmissionStream of PRAW submissions or submission records that is filled as the
+                                listing is retrieved
 
         :date_limit: This is set to the most recent download for the user/sub and cannot be changed by the end user
         :custom_date_limit: This is used as a way to override the date_limit variable without losing the last date that
@@ -58,21 +67,63 @@ class RedditObject:
         self.user_added = user_added
         self.do_not_edit = False
         self.new_submissions = []  # Will be erased at end of download
-        self.saved_submissions = []
-        self.previous_downloads = []
+        self._saved_submissions = []
+        self._previous_downloads = DownloadHistory()
         self.date_limit = 86400
         self.custom_date_limit = None
         self.content = []  # Will be erased at end of download (QRunnable objects cannot be pickled)
         self.failed_extracts = []  # This will be erased at the end of download
-        self.saved_content = {}
+        self._saved_content = {}
         self.save_undownloaded_content = True
         self.object_type = None
         self.content_display_only = False
         self.enable_download = True
+        self.fullname = None  # The reddit fullname found when the object was last validated
+        self.validation_status = None
+        self.validation_time = None
+        self.seen_posts = {}  # Integer post ids of processed posts mapped to the last time they were seen in a listing
+        self.last_checked = None  # The following are maintained by the PollScheduler
+        self.next_due = None
+        self.post_rate = None
+        self.last_post_count = None
+        self.filter_rules = {}  # Overrides of the global filter rule settings for this object only
+        self.use_global_dedupe = False  # Check content against the DedupeIndex shared by all reddit objects
+        self.store_id = None  # The row id of the object in the ObjectStore
+        self.store = None  # The ObjectStore that the stored fields are loaded from when they are released
+        self.stored_counts = {}  # The lengths of the stored fields when the object was last saved
+        self.dirty = False  # Set when the object is changed by a download run and cleared when it is checkpointed
 
     def __str__(self):
         return '%s: %s' % (self.object_type, self.name)
 
+    # The fields that are held in their own tables in the ObjectStore.  They are loaded from the store the first time
+    # they are accessed and are released once they have been saved.
+    STORED_FIELDS = ('previous_downloads', 'saved_submissions', 'saved_content')
+
+    def __setstate__(self, state):
+        """
+        Restores the object from a pickled state.  Attributes that have been added since the object was saved are given
+        their default values so that objects saved by an earlier build of the same version can still be used.
+        """
+        for key, value in self.get_attribute_defaults().items():
+            state.setdefault(key, value)
+        for field in self.STORED_FIELDS:
+            state.setdefault('_%s' % field, state.pop(field, None))
+        if isinstance(state['_previous_downloads'], list):
+            state['_previous_downloads'] = DownloadHistory(state['_previous_downloads'])
+        self.__dict__.update(state)
+
+    @staticmethod
+    def get_attribute_defaults():
+        """
+        Returns a dict of the default values for attributes which may be missing from objects saved by an earlier
+        build.
+        """
+        return {'fullname': None, 'validation_status': None, 'validation_time': None, 'seen_posts': {},
+                'last_checked': None, 'next_due': None, 'post_rate': None, 'last_post_count': None,
+                'filter_rules': {}, 'use_global_dedupe': False, 'store_id': None, 'store': None, 'stored_counts': {},
+                'dirty': False}
+
     @property
     def json(self):
         """
@@ -87,37 +138,100 @@ class RedditObject:
                 'save_path': self.save_path,
                 'post_limit': self.post_limit,
                 'avoid_duplicates': self.avoid_duplicates,
+                'use_global_dedupe': self.use_global_dedupe,
                 'download_videos': self.download_videos,
                 'download_images': self.download_images,
                 'nsfw_filter': self.nsfw_filter,
                 'added_on': self.user_added,
                 'do_not_edit': self.do_not_edit,
                 'new_submission_count': len(self.new_submissions) if self.new_submissions is not None else None,
-                'saved_submission_count': len(self.saved_submissions),
-                'previous_download_count': len(self.previous_downloads),
+                'saved_submission_count': self.get_field_length('saved_submissions'),
+                'previous_download_count': self.get_field_length('previous_downloads'),
                 'date_limit': self.date_limit,
                 'custom_date_limit': self.custom_date_limit,
                 'content_count': len(self.content),
                 'failed_extract_count': len(self.failed_extracts),
-                'saved_content_count': len(self.saved_content),
+                'saved_content_count': self.get_field_length('saved_content'),
                 'save_undownloaded_content': self.save_undownloaded_content,
-                'download_enabled': self.enable_download}
+                'download_enabled': self.enable_download,
+                'validation_status': self.validation_status,
+                'seen_post_count': len(self.seen_posts)}
 
     @property
     def number_of_downloads(self):
-        return len(self.previous_downloads)
+        return self.get_field_length('previous_downloads')
+
+    @property
+    def previous_downloads(self):
+        if self._previous_downloads is None:
+            self._previous_downloads = self.store.load_field(self.store_id, 'previous_downloads')
+        return self._previous_downloads
+
+    @previous_downloads.setter
+    def previous_downloads(self, value):
+        self._previous_downloads = value
+
+    @property
+    def saved_submissions(self):
+        if self._saved_submissions is None:
+            self._saved_submissions = self.store.load_field(self.store_id, 'saved_submissions')
+        return self._saved_submissions
+
+    @saved_submissions.setter
+    def saved_submissions(self, value):
+        self._saved_submissions = value
+
+    @property
+    def saved_content(self):
+        if self._saved_content is None:
+            self._saved_content = self.store.load_field(self.store_id, 'saved_content')
+        return self._saved_content
+
+    @saved_content.setter
+    def saved_content(self, value):
+        self._saved_content = value
+
+    def get_field_length(self, field):
+        """
+        Returns the length of one of the stored fields without loading the field from the object store if it has been
+        released.
+        :param field: The name of the stored field.
+        :type field: str
+        :rtype: int
+        """
+        value = self.__dict__.get('_%s' % field)
+        return len(value) if value is not None else self.stored_counts.get(field, 0)
+
+    def release_stored_fields(self):
+        """
+        Releases the stored fields so that they are loaded from the object store again the next time they are
+        accessed.  This must only be called once the fields have been saved to the store.
+        """
+        if self.store is not None and self.store_id is not None:
+            for field in self.STORED_FIELDS:
+                self.__dict__['_%s' % field] = None
 
     @property
     def save_directory(self):
         return self.save_path
 
-    def save_unfinished_downloads(self):
+    def save_unfinished_downloads(self, include_journaled=True):
         for content in self.content:
-            if not content.downloaded:
+            if not content.downloaded and (include_journaled or content.journal is None):
                 self.saved_content[content.url] = [content.user, content.post_title, content.subreddit,
                                                    content.submission_id, content.number_in_seq, content.file_ext,
                                                    content.date_created]
 
+    def release_journal_jobs(self):
+        """
+        Removes the content that was not downloaded from the download journal once the run has ended normally.  The
+        content is either held in saved_content or discarded, depending on the users settings, so it must not also be
+        resumed from the journal.
+        """
+        for content in self.content:
+            if not content.downloaded and content.journal is not None:
+                content.journal.mark_finished(content.journal_id)
+
     def load_unfinished_downloads(self):
         try:
             for key, value in self.saved_content.items():
@@ -136,6 +250,53 @@ class RedditObject:
             self.date_limit = last_download_time
         if not self.do_not_edit and None is not self.custom_date_limit < last_download_time:
             self.custom_date_limit = None
+        self.dirty = True
+
+    def set_validation_status(self, status):
+        """
+        Records the outcome of the most recent validation of the reddit object along with the time it was recorded.
+        :param status: The validation outcome.  One of 'VALID', 'NOT_FOUND', or 'FORBIDDEN'.
+        :type status: str
+        """
+        self.validation_status = status
+        self.validation_time = time()
+        self.dirty = True
+
+    def get_cached_validation_status(self, ttl):
+        """
+        Returns the recorded validation status if it was recorded within the supplied number of seconds, otherwise
+        None is returned to indicate that the reddit object needs to be validated again.
+        :param ttl: The number of seconds that a recorded validation status is considered current.
+        :type ttl: int
+        """
+        if self.validation_time is None or time() - self.validation_time > ttl:
+            return None
+        return self.validation_status
+
+    def mark_post_seen(self, post):
+        """Records that the supplied post has been processed so that it can be skipped if it is listed again."""
+        self.seen_posts[int(post.id, 36)] = int(time())
+        self.dirty = True
+
+    def check_post_seen(self, post):
+        """
+        Returns True if the supplied post has already been processed.  The time the post was last seen is refreshed so
+        that posts which stay in a listing for a long time are not pruned while they are still being listed.
+        """
+        key = int(post.id, 36)
+        if key in self.seen_posts:
+            self.seen_posts[key] = int(time())
+            return True
+        return False
+
+    def prune_seen_posts(self, max_age):
+        """
+        Removes the posts that have not been seen in a listing within the supplied number of seconds.
+        :param max_age: The number of seconds a post is kept after it was last seen.
+        :type max_age: int
+        """
+        cutoff = time() - max_age
+        self.seen_posts = {key: value for key, value in self.seen_posts.items() if value >= cutoff}
 
     def check_save_directory(self):
         try:
@@ -143,12 +304,24 @@ class RedditObject:
         except:
             LogUtils.log_proxy(__name__, 'ERROR', 'Failed to create directory', exc_info=True, reddit_object=self.json)
 
-    def clear_download_session_data(self):
-        if Injector.get_settings_manager().save_undownloaded_content:
-            self.save_unfinished_downloads()
-        self.content.clear()
-        self.new_submissions = None
-        self.failed_extracts.clear()
+    def clear_download_session_data(self, release_journal_jobs=True):
+        """
+        Clears the content and submissions of the last run.
+        :param release_journal_jobs: False if the run was interrupted.  The content that was not downloaded is then left
+                                     in the download journal to be resumed, and is not also held in saved_content.
+        :type release_journal_jobs: bool
+        """
+        settings_manager = Injector.get_settings_manager()
+        with state_lock:
+            if settings_manager.save_undownloaded_content:
+                self.save_unfinished_downloads(include_journaled=release_journal_jobs)
+            if release_journal_jobs:
+                self.release_journal_jobs()
+            self.prune_seen_posts(settings_manager.seen_post_retention_days * 86400)
+            self.content.clear()
+            self.new_submissions = None
+            self.failed_extracts.clear()
+            self.dirty = True
 
     def toggle_enable_download(self):
         self.enable_download = not self.enable_download
@@ -165,11 +338,39 @@ class User(RedditObject):
                          nsfw_filter, name_downloads_by, user_added)
         self.subreddit_save_method = None
         self.object_type = 'USER'
+        self.listing_scan_average = None  # Average number of posts read from the users listing in constrained runs
+        self.listing_match_average = None  # Average number of those posts that were in the constrained subreddits
+        self.searches_since_listing_scan = 0  # Number of constrained runs since the users listing was last read
+
+    @staticmethod
+    def get_attribute_defaults():
+        defaults = RedditObject.get_attribute_defaults()
+        defaults.update({'listing_scan_average': None, 'listing_match_average': None,
+                         'searches_since_listing_scan': 0})
+        return defaults
 
     @property
     def save_directory(self):
         return '%s%s%s' % (self.save_path, '/' if not self.save_path.endswith('/') else '', self.name)
 
+    def record_listing_cost(self, scanned, matched):
+        """
+        Adds the number of posts read and the number of posts matched during a user and subreddit constrained run to
+        the users running averages.  The averages are used to estimate which download strategy is cheaper for the
+        user in the next constrained run.
+        :param scanned: The number of posts read from the users listing, or None if the users listing was not read.
+        :param matched: The number of posts that were found in the constrained subreddits.
+        """
+        if scanned is not None:
+            self.listing_scan_average = scanned if self.listing_scan_average is None else \
+                (self.listing_scan_average + scanned) / 2
+            self.searches_since_listing_scan = 0
+        else:
+            self.searches_since_listing_scan += 1
+        self.listing_match_average = matched if self.listing_match_average is None else \
+            (self.listing_match_average + matched) / 2
+        self.dirty = True
+
 
 class Subreddit(RedditObject):
 
@@ -0,0 +1,73 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+from collections import deque
+from queue import Queue
+
+
+class SubmissionStream:
+
+    def __init__(self, first_page=None):
+        """
+        An iterable of submissions that is filled one listing page at a time by the thread that retrieves a reddit
+        objects listing and read by the extraction thread.  This allows extraction and downloading of a reddit object
+        to begin as soon as the first page of its listing has been retrieved instead of after the whole listing has
+        been read.  Submissions are released as they are read so that the praw objects are not held for the duration of
+        the reddit objects download.
+
+        :param first_page: An optional list of submissions to start the stream with.
+        :type first_page: list
+        """
+        self.pages = Queue()
+        self.count = 0
+        if first_page:
+            self.put_page(first_page)
+
+    def __len__(self):
+        """Returns the number of submissions that have been added to the stream."""
+        return self.count
+
+    def __iter__(self):
+        while True:
+            page = self.pages.get()
+            if page is None:
+                self.pages.put(None)  # Leave the stream closed for any subsequent reads
+                return
+            while page:
+                yield page.popleft()
+
+    def put_page(self, page):
+        """
+        Adds a page of submissions to the stream.
+        :param page: A list of submissions that have been retrieved and filtered.
+        :type page: list
+        """
+        if len(page) > 0:
+            self.count += len(page)
+            self.pages.put(deque(page))
+
+    def close(self):
+        """Marks the end of the stream.  Reading from the stream ends once all pages before this call have been read."""
+        self.pages.put(None)
@@ -26,54 +26,83 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 import logging
 import time
 
-from ..Extractors.BaseExtractor import BaseExtractor
+from ..Extractors import ExtractorRegistry
 from ..Extractors.DirectExtractor import DirectExtractor
 from ..Utils import Injector
 from ..Core import Const
+from ..Core.RedditObjects import state_lock
 from ..Utils.RedditUtils import convert_praw_post
 from ..Utils import ExtractorUtils
 
 
 class Extractor:
 
-    def __init__(self, reddit_object):
+    def __init__(self, reddit_object, content_handler=None, record_seen=False):
         """
         Extracts content from hosting websites obtained from links that are posted to reddit.  Responsible for assigning
         the extractor object to be used, calling the necessary methods to extract the content, handling failed extract
         messages and logging, and storing extracted content in the supplied reddit objects content list.
         :param reddit_object: The reddit object for which contains lists of posts to be extracted.
+        :param content_handler: An optional callable that is supplied a list of the content that passes the content
+                                filters each time a post is extracted.  This is used to send content to be downloaded
+                                while the rest of the reddit objects posts are still being extracted.
+        :param record_seen: True if successfully extracted new submissions are to be recorded as seen by the reddit
+                            object.  This is only needed for non chronological listings, which are the only listings
+                            that seen posts are checked against.
         :type reddit_object: RedditObject
+        :type record_seen: bool
         """
         self.settings_manager = Injector.get_settings_manager()
         self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
         self.reddit_object = reddit_object
+        self.content_handler = content_handler
+        self.record_seen = record_seen
+        self.newest_post_date = None
 
     def run(self):
+        """
+        Extracts the reddit objects saved submissions and new submissions.  The reddit objects date limit is updated
+        once all submissions have been extracted because new submissions may be streamed in while extraction is running
+        and are filtered against the date limit as they arrive.  If record_seen is set, new submissions that were
+        extracted successfully are recorded as seen so that they are skipped if they appear in a non chronological
+        listing again, while submissions that failed to extract are retried in the next run.
+        """
         for post in self.reddit_object.saved_submissions:
             self.extract(post)
-            self.reddit_object.saved_submissions.remove(post)
+            with state_lock:
+                self.reddit_object.saved_submissions.remove(post)
         for post in self.reddit_object.new_submissions:
-            self.extract(post)
+            if self.extract(post) and self.record_seen:
+                with state_lock:
+                    self.reddit_object.mark_post_seen(post)
+        if self.newest_post_date is not None:
+            with state_lock:
+                self.reddit_object.set_date_limit(self.newest_post_date)
 
     def extract(self, post):
         """
         Creates the proper extractor object and calls its extract method, then handles the extractions.
         :param post: The post that is to be extracted.
         :type post: Praw.Post
+        :return: True if the post was extracted without any failures.
+        :rtype: bool
         """
         if post.created is not None:  # None here indicates an outdated saved post which contains no created date
-            self.reddit_object.set_date_limit(post.created)
+            if self.newest_post_date is None or post.created > self.newest_post_date:
+                self.newest_post_date = post.created
         try:
             extractor = self.assign_extractor(post)(post, self.reddit_object)
             self.check_timeout(extractor)
             extractor.extract_content()
             self.handle_content(extractor)
+            return len(extractor.failed_extract_posts) == 0
         except TypeError:
             self.handle_unsupported_domain(post)
         except ConnectionError:
             self.handle_connection_error(post)
         except:
             self.handle_unknown_error(post)
+        return False
 
     @staticmethod
     def check_timeout(extractor):
@@ -130,16 +159,16 @@ class Extractor:
     @staticmethod
     def assign_extractor(post):
         """
-        Selects and returns the extractor to be used based on the url of the supplied post.
+        Selects and returns the extractor to be used based on the url of the supplied post.  The extractor is found
+        from the domain keys in the extractor manifest, so only the module of the selected extractor is imported.
         :param post: The post that is to be extracted.
         :type post: praw.Post
         :return: The extractor that is to be used to extract content from the supplied post.
         :rtype: BaseExtractor
         """
-        for extractor in BaseExtractor.__subclasses__():
-            key = extractor.get_url_key()
-            if key is not None and any(x in post.url.lower() for x in key):
-                return extractor
+        extractor = ExtractorRegistry.get_extractor(post.url)
+        if extractor is not None:
+            return extractor
         if post.url.lower().endswith(Const.ALL_EXT):
             return DirectExtractor
         return None
@@ -150,16 +179,22 @@ class Extractor:
         :param extractor: The extractor that contains the extracted content.
         :type extractor: BaseExtractor
         """
-        self.save_submissions(extractor)
-        for x in extractor.failed_extract_posts:
-            self.reddit_object.failed_extracts.append(x)
-        for content in extractor.extracted_content:
-            if type(content) == str and content.startswith('Failed'):
-                self.reddit_object.failed_extracts.append(content)
-            else:
-                if self.filter_content(content):
-                    self.reddit_object.content.append(content)
-                    self.reddit_object.previous_downloads.append(content.url)
+        passed_content = []
+        with state_lock:
+            self.save_submissions(extractor)
+            for x in extractor.failed_extract_posts:
+                self.reddit_object.failed_extracts.append(x)
+            for content in extractor.extracted_content:
+                if type(content) == str and content.startswith('Failed'):
+                    self.reddit_object.failed_extracts.append(content)
+                else:
+                    if self.filter_content(content):
+                        self.reddit_object.content.append(content)
+                        self.reddit_object.previous_downloads.append(content.url)
+                        passed_content.append(content)
+            self.reddit_object.dirty = True
+        if self.content_handler is not None:
+            self.content_handler(passed_content)
 
     def save_submissions(self, extractor):
         """
@@ -180,7 +215,8 @@ class Extractor:
         :return: True or false depending on if the content passes or fails the filter.
         :rtype: bool
         """
-        return self.check_image(content) and self.check_video(content) and self.check_duplicate(content)
+        return self.check_image(content) and self.check_video(content) and self.check_duplicate(content) and \
+            self.check_global_duplicate(content)
 
     def check_image(self, content):
         return self.reddit_object.download_images or content.file_ext not in Const.IMAGE_EXT
@@ -190,3 +226,27 @@ class Extractor:
 
     def check_duplicate(self, content):
         return not self.reddit_object.avoid_duplicates or content.url not in self.reddit_object.previous_downloads
+
+    def check_global_duplicate(self, content):
+        """
+        Checks the dedupe index shared by all reddit objects for content that has already been downloaded from the same
+        url, if the reddit object has opted in to global duplicate checking.  Duplicate content is either set to be
+        linked to the existing file or is filtered out, depending on the users link_global_duplicates setting.  Content
+        that is not a duplicate is claimed in the index so that later content with the same url during this download
+        session is treated as a duplicate of it.
+        :param content: The content that is to be checked.
+        :type content: Content
+        :return: True if the content is to be downloaded or linked, False if it is to be skipped.
+        :rtype: bool
+        """
+        if not self.reddit_object.use_global_dedupe or content.display_only:
+            return True
+        index = Injector.get_dedupe_index()
+        content.dedupe_index = index
+        existing = index.claim(content.url, content.filename)
+        if existing is None:
+            return True
+        if existing == content.filename or not self.settings_manager.link_global_duplicates:
+            return False
+        content.link_source = existing
+        return True
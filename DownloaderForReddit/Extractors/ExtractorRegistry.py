@@ -0,0 +1,110 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import importlib
+import threading
+
+from ..Core import Const
+from ..Logging import LogUtils
+
+
+# The domain keys of each extractor, in the order they are checked, mapped from the name of the module in the
+# Extractors package that holds the extractor class of the same name.  Extractor modules import the libraries used to
+# reach their site, so a module is only imported the first time a url is routed to it.  The keys must match the
+# url_key of the extractor class.  A key of None means the keys are the sites supported by youtube_dl, which are read
+# from the supported sites file when they are first needed.
+MANIFEST = (
+    ('ImgurExtractor', ('imgur', )),
+    ('GfycatExtractor', ('gfycat', )),
+    ('VidbleExtractor', ('vidble', )),
+    ('RedditUploadsExtractor', ('reddituploads', 'i.redd.it')),
+    ('RedditVideoExtractor', ('v.redd.it', )),
+    ('GenericVideoExtractor', None),
+)
+
+extractors = {}
+supported_video_sites = None
+lock = threading.Lock()
+
+
+def get_supported_video_sites():
+    """
+    Returns the list of sites supported by the GenericVideoExtractor.  The list is read from the supported sites file
+    the first time it is requested.
+    :return: A list of site keys, or None if the supported sites file could not be read.
+    :rtype: list
+    """
+    global supported_video_sites
+    if supported_video_sites is None:
+        try:
+            with open(Const.SUPPORTED_SITES_FILE, 'r') as file:
+                supported_video_sites = [x.strip() for x in file.readlines() if x.strip()]
+        except FileNotFoundError:
+            supported_video_sites = []
+            LogUtils.log_proxy(__name__, 'WARNING', message='Failed to load supported video sites')
+    return supported_video_sites if len(supported_video_sites) > 0 else None
+
+
+def get_url_keys(module_name):
+    """
+    Returns the domain keys declared in the manifest for the extractor held in the supplied module without importing
+    the module.
+    :param module_name: The name of the extractor module.
+    :type module_name: str
+    :return: The url keys of the extractor.
+    """
+    keys = dict(MANIFEST)[module_name]
+    return keys if keys is not None else get_supported_video_sites()
+
+
+def load_extractor(module_name):
+    """
+    Imports the supplied extractor module, if it has not already been imported, and returns the extractor class that
+    it holds.
+    :param module_name: The name of the extractor module, which is also the name of the extractor class.
+    :type module_name: str
+    :return: The extractor class.
+    """
+    with lock:
+        if module_name not in extractors:
+            module = importlib.import_module('.%s' % module_name, __package__)
+            extractors[module_name] = getattr(module, module_name)
+        return extractors[module_name]
+
+
+def get_extractor(url):
+    """
+    Finds the extractor whose domain keys match the supplied url.  Only the module of the matching extractor is
+    imported.
+    :param url: The url that is to be extracted.
+    :type url: str
+    :return: The extractor class to be used for the url, or None if no extractor in the manifest matches the url.
+    """
+    url = url.lower()
+    for module_name, _ in MANIFEST:
+        keys = get_url_keys(module_name)
+        if keys is not None and any(x in url for x in keys):
+            return load_extractor(module_name)
+    return None
@@ -26,19 +26,17 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 import youtube_dl
 
 from ..Extractors.BaseExtractor import BaseExtractor
-from ..Core import Const
-from ..Logging import LogUtils
+from ..Extractors import ExtractorRegistry
 
 
 class GenericVideoExtractor(BaseExtractor):
 
-    try:
-        file = open(Const.SUPPORTED_SITES_FILE, 'r')
-        url_key = [x.strip() for x in file.readlines()]
-        file.close()
-    except FileNotFoundError:
-        url_key = None
-        LogUtils.log_proxy(__name__, 'WARNING', message='Failed to load supported video sites')
+    url_key = None
+
+    @classmethod
+    def get_url_key(cls):
+        """Returns the sites supported by youtube_dl, which are read from the supported sites file when first needed."""
+        return ExtractorRegistry.get_supported_video_sites()
 
     def __init__(self, post, reddit_object, content_display_only=False):
         super().__init__(post, reddit_object, content_display_only)
@@ -1,8 +1,13 @@
+import requests
+from xml.etree import ElementTree
 
 from ..Extractors.BaseExtractor import BaseExtractor
 from ..Utils import RedditUtils, VideoMerger
 
 
+DASH_PLAYLIST_TIMEOUT = 10  # Seconds to wait for the DASH playlist before falling back to the fallback url
+
+
 class RedditVideoExtractor(BaseExtractor):
 
     url_key = ['v.redd.it']
@@ -12,23 +17,22 @@ class RedditVideoExtractor(BaseExtractor):
         self.post = post
         self.host_vid = self.get_host_vid(post)
         self.url = None
+        self.audio_url = None
         self.contains_audio = False
-        self.get_vid_url()
 
     @staticmethod
     def get_host_vid(post):
         """
         Finds the actual submission that holds the video file to be extracted.  If the post is the original post that
         the video was uploaded to, then None is returned.  If the post is a crosspost from another location,
-        the parent crosspost is returned as it is the post which holds the full video information.
+        the parent crosspost is returned as it is the post which holds the full video information.  Parents are taken
+        from the crosspost parent cache which is filled in batches when the listing is retrieved.
         :param post: The post which is to be extracted.
         :return: The top level post which holds the video information to be downloaded if the supplied post is a
                  crosspost, otherwise None.
         """
-        try:
-            return RedditUtils.get_reddit_instance().submission(post.crosspost_parent.split('_')[1])
-        except AttributeError:
-            return None
+        fullname = RedditUtils.get_crosspost_parent_name(post)
+        return RedditUtils.get_crosspost_parent(fullname) if fullname is not None else None
 
     def get_download_vid(self):
         return self.host_vid if self.host_vid is not None else self.post
@@ -36,16 +40,108 @@ class RedditVideoExtractor(BaseExtractor):
     def get_vid_url(self):
         """
         Extracts the video url from the reddit post and determines if the post is a video and will contain an audio
-        file.
+        file.  If the post supplies a DASH playlist, the playlist is used to select the video representation that fits
+        within the users resolution and bitrate limits and to find the exact audio representation, if there is one.
+        Otherwise the fallback url is used and the audio track location is guessed from it.  This is called when the
+        content is extracted so that the playlist request is made on the extraction thread.
         """
         try:
-            self.url = self.get_download_vid().media['reddit_video']['fallback_url']
-            self.contains_audio = self.get_download_vid().is_video
-        except AttributeError:
+            reddit_video = self.get_download_vid().media['reddit_video']
+        except (AttributeError, KeyError, TypeError):
             self.url = self.get_download_vid().url
+            return
+        if not self.get_dash_urls(reddit_video.get('dash_url')):
+            self.url = reddit_video['fallback_url']
+            self.contains_audio = self.get_download_vid().is_video
+            if self.contains_audio:
+                index = self.url.rfind('/')
+                self.audio_url = self.url[:index] + '/audio'  # replace end of fallback url to target audio file
+
+    def get_dash_urls(self, dash_url):
+        """
+        Retrieves and parses the DASH playlist at the supplied url and sets the video and audio urls from the selected
+        representations.
+        :param dash_url: The url of the DASHPlaylist.mpd file supplied with the reddit video media.
+        :type dash_url: str
+        :return: True if a video url was found in the playlist, False if it was not.
+        :rtype: bool
+        """
+        if dash_url is None:
+            return False
+        try:
+            playlist = self.get_dash_playlist(dash_url)
+            videos, audios = self.parse_dash_playlist(playlist, dash_url)
+        except Exception:
+            self.logger.warning('Failed to parse DASH playlist', extra={'dash_url': dash_url}, exc_info=True)
+            return False
+        video = self.select_video_representation(videos)
+        if video is None:
+            return False
+        self.url = video['url']
+        audio = max(audios, key=lambda x: x['bandwidth']) if audios else None
+        self.audio_url = audio['url'] if audio is not None else None
+        self.contains_audio = self.audio_url is not None
+        return True
+
+    @staticmethod
+    def get_dash_playlist(dash_url):
+        response = requests.get(dash_url, timeout=DASH_PLAYLIST_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+    @staticmethod
+    def parse_dash_playlist(playlist, dash_url):
+        """
+        Parses the supplied DASH playlist text into lists of video and audio representations.
+        :param playlist: The text of the DASHPlaylist.mpd file.
+        :param dash_url: The url the playlist was retrieved from.  Relative BaseURL entries are resolved against it.
+        :return: A tuple of the video representation list and the audio representation list.  Each representation is
+                 a dict containing the 'url', 'height', and 'bandwidth' of the representation.
+        :rtype: tuple
+        """
+        base = dash_url.split('?', 1)[0].rsplit('/', 1)[0]
+        videos = []
+        audios = []
+        root = ElementTree.fromstring(playlist)
+        for adaptation_set in root.iter():
+            if not adaptation_set.tag.endswith('AdaptationSet'):
+                continue
+            for representation in adaptation_set:
+                if not representation.tag.endswith('Representation'):
+                    continue
+                base_url = next((x.text.strip() for x in representation if x.tag.endswith('BaseURL') and x.text), None)
+                if base_url is None:
+                    continue
+                mime_type = representation.get('mimeType', adaptation_set.get('mimeType', ''))
+                content_type = adaptation_set.get('contentType', mime_type.split('/')[0])
+                item = {'url': base_url if base_url.startswith('http') else '%s/%s' % (base, base_url),
+                        'height': int(representation.get('height', 0)),
+                        'bandwidth': int(representation.get('bandwidth', 0))}
+                if content_type == 'audio':
+                    audios.append(item)
+                elif content_type == 'video':
+                    videos.append(item)
+        return videos, audios
+
+    def select_video_representation(self, videos):
+        """
+        Selects the highest quality video representation that is within the users max resolution and max bitrate
+        settings.  If no representation fits within the limits, the lowest quality representation is selected.
+        :param videos: A list of video representation dicts as returned by parse_dash_playlist.
+        :return: The selected video representation or None if the list is empty.
+        """
+        if len(videos) < 1:
+            return None
+        max_height = self.settings_manager.reddit_video_max_resolution
+        max_bandwidth = self.settings_manager.reddit_video_max_bitrate * 1000
+        allowed = [x for x in videos if (max_height <= 0 or x['height'] <= max_height) and
+                   (max_bandwidth <= 0 or x['bandwidth'] <= max_bandwidth)]
+        quality = lambda x: (x['height'], x['bandwidth'])
+        return max(allowed, key=quality) if allowed else min(videos, key=quality)
 
     def extract_content(self):
         if self.settings_manager.download_reddit_hosted_videos:
+            self.get_vid_url()
             if self.url is not None:
                 video_content = self.get_video_content()
                 try:
@@ -63,14 +159,18 @@ class RedditVideoExtractor(BaseExtractor):
                 self.handle_failed_extract(message=message, log_exception=True, extractor_error_message=message)
 
     def get_video_content(self):
-        ext = 'mp4'
+        ext = self.get_extension(self.url, 'mp4')
         return self.make_content(self.url, self.make_name(True), ext)
 
     def get_audio_content(self):
-        ext = 'mp3'
-        index = self.url.rfind('/')
-        url = self.url[:index] + '/audio'  # replace end of fallback url to target audio file
-        return self.make_content(url, self.make_name(False), ext)
+        ext = self.get_extension(self.audio_url, 'mp3')
+        return self.make_content(self.audio_url, self.make_name(False), ext)
+
+    @staticmethod
+    def get_extension(url, default):
+        """Returns the file extension of the supplied url or the supplied default if the url does not have one."""
+        name = url.split('?', 1)[0].rsplit('/', 1)[-1]
+        return name.rsplit('.', 1)[1] if '.' in name else default
 
     def make_name(self, video_url):
         """
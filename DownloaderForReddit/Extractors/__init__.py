@@ -27,14 +27,8 @@ import sys
 
 from ..Core.Post import Post
 
-# Import each extractor class in the Extractors package so that BaseExtractor.__subclasses__() will pick up the
-# extractor class to be used in the Extractor.assign_extractor method.
-from .ImgurExtractor import ImgurExtractor
-from .GfycatExtractor import GfycatExtractor
-from .VidbleExtractor import VidbleExtractor
-from .RedditUploadsExtractor import RedditUploadsExtractor
-from .RedditVideoExtractor import RedditVideoExtractor
-from .GenericVideoExtractor import GenericVideoExtractor
+# Extractor modules are not imported here.  Each one is imported by the ExtractorRegistry the first time a url is
+# routed to it, so that the libraries they use are not loaded by sessions that do not download.
 
 
 sys.modules['Post'] = Post
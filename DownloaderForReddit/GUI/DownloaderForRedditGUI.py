@@ -25,6 +25,7 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
 import sys
+import bisect
 from datetime import datetime
 from PyQt5 import QtWidgets, QtCore, QtGui
 import logging
@@ -44,6 +45,8 @@ from ..GUI.DownloaderForRedditSettingsGUI import RedditDownloaderSettingsGUI
 from ..Utils import Injector, SystemUtil, ImgurUtils, VideoMerger
 from ..Utils.Exporters import TextExporter, JsonExporter, XMLExporter
 from ..Persistence.ObjectStateHandler import ObjectStateHandler
+from ..Persistence.Checkpointer import Checkpointer
+from ..Persistence.StateLoader import StateLoader
 from ..ViewModels.ListModel import ListModel
 from ..GUI.AddRedditObjectDialog import AddUserDialog
 from ..GUI.FfmpegInfoDialog import FfmpegInfoDialog
@@ -74,6 +77,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.downloaded = 0
         self.running = False
         self.saved = True
+        self.checkpointer = None
         self.user_finder = None
 
         # region Settings
@@ -100,7 +104,15 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.receiver = receiver
         self.user_view_chooser_dict = {}
         self.subreddit_view_chooser_dict = {}
+        self.state_loaded = False
+        self.state_load_failed = False
+        self.state_loader = None
+        self.state_loader_thread = None
+        self.list_editing_enabled = True
+        self.last_views = {'user': '', 'subreddit': ''}
+        self.list_positions = {'user': [], 'subreddit': []}
         self.load_state()
+        self.check_download_journal(self.settings_manager.resume_journaled_downloads)
 
         self.file_add_user_list.triggered.connect(self.add_user_list)
         self.file_remove_user_list.triggered.connect(self.remove_user_list)
@@ -246,7 +258,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             open_user_folder.setVisible(False)
             remove_user.setVisible(False)
 
-        if self.running:
+        if not self.list_editing_enabled:
             add_user.setEnabled(False)
             remove_user.setEnabled(False)
 
@@ -289,7 +301,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             open_subreddit_folder.setVisible(False)
             remove_subreddit.setVisible(False)
 
-        if self.running:
+        if not self.list_editing_enabled:
             add_subreddit.setEnabled(False)
             remove_subreddit.setEnabled(False)
 
@@ -301,6 +313,8 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         remove_list = menu.addAction('Remove User List')
         add_list.triggered.connect(self.add_user_list)
         remove_list.triggered.connect(self.remove_user_list)
+        add_list.setEnabled(self.list_editing_enabled)
+        remove_list.setEnabled(self.list_editing_enabled)
         menu.exec(QtGui.QCursor.pos())
 
     def subreddit_list_combo_right_click(self):
@@ -309,6 +323,8 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         remove_list = menu.addAction('Remove Subreddit List')
         add_list.triggered.connect(self.add_subreddit_list)
         remove_list.triggered.connect(self.remove_subreddit_list)
+        add_list.setEnabled(self.list_editing_enabled)
+        remove_list.setEnabled(self.list_editing_enabled)
         menu.exec(QtGui.QCursor.pos())
 
     def user_settings(self, page, from_menu):
@@ -475,6 +491,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.started_download_gui_shift()
         user_list = [user]
         self.download_runner = DownloadRunner(user_list, None, self.queue, None)
+        self.download_runner.use_scheduler = False
         self.start_reddit_extractor_thread('USER')
 
     def run_subreddit(self):
@@ -493,8 +510,8 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
                                                                        'settings': self.settings_manager.json})
         self.started_download_gui_shift()
         subreddit_list = [download_tuple[0]]
-        self.download_runner = DownloadRunner(None, subreddit_list, self.queue, None)
-        self.download_runner.single_subreddit_run_method = download_tuple[1]
+        self.download_runner = DownloadRunner(None, subreddit_list, self.queue, None, download_tuple[1])
+        self.download_runner.use_scheduler = False
         self.start_reddit_extractor_thread('SUBREDDIT')
 
     def run_user_and_subreddit(self):
@@ -511,7 +528,10 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.start_reddit_extractor_thread('USERS_AND_SUBREDDITS')
 
     def run_unfinished_downloads(self):
-        """Downloads the content that was left during the last run if the user clicked the stop download button"""
+        """
+        Downloads the content that was left during the last run if the user clicked the stop download button, or that
+        was found in the download journal after the application was closed during a download.
+        """
         self.logger.info('Unfinished downloads download initiated', extra={'list_size': len(self.unfinished_downloads),
                                                                            'settings': self.settings_manager.json})
         self.download_count = 0
@@ -544,6 +564,24 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.thread.finished.connect(self.finished_download_gui_shift)
         self.thread.start()
         self.logger.info('Downloader thread started')
+        self.start_checkpointer()
+
+    def start_checkpointer(self):
+        """Starts the thread that periodically saves the reddit objects that are changed during the download run."""
+        if self.settings_manager.checkpoint_interval > 0:
+            self.checkpointer = Checkpointer(self.get_checkpoint_lists, self.settings_manager.checkpoint_interval)
+            self.checkpointer.start()
+
+    def stop_checkpointer(self):
+        """Stops the checkpoint thread, which saves any remaining changes before it ends."""
+        if self.checkpointer is not None:
+            self.checkpointer.stop()
+            self.checkpointer = None
+
+    def get_checkpoint_lists(self):
+        """Returns the user and subreddit lists to be checkpointed.  This is called from the checkpoint thread."""
+        return ({name: x.reddit_object_list for name, x in list(self.user_view_chooser_dict.items())},
+                {name: x.reddit_object_list for name, x in list(self.subreddit_view_chooser_dict.items())})
 
     def handle_failed_download_object(self, failed_post):
         """
@@ -1104,35 +1142,41 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.download_count = 0
         self.output_box.clear()
         self.download_button.setText('Downloading...Click to Stop Download')
-        self.add_user_button.setDisabled(True)
-        self.remove_user_button.setDisabled(True)
-        self.add_subreddit_button.setDisabled(True)
-        self.remove_subreddit_button.setDisabled(True)
-        self.file_add_user_list.setDisabled(True)
-        self.file_add_subreddit_list.setDisabled(True)
-        self.file_remove_user_list.setDisabled(True)
-        self.file_remove_subreddit_list.setDisabled(True)
+        self.set_list_editing_enabled(False)
         self.progress_label.setVisible(False)
         self.progress_bar.setVisible(True)
 
     def finished_download_gui_shift(self):
         """Re-enables disabled GUI options"""
         self.running = False
+        self.stop_checkpointer()
         self.download_button.setText('Download')
-        self.add_user_button.setDisabled(False)
-        self.remove_user_button.setDisabled(False)
-        self.add_subreddit_button.setDisabled(False)
-        self.remove_subreddit_button.setDisabled(False)
-        self.file_add_user_list.setDisabled(False)
-        self.file_add_subreddit_list.setDisabled(False)
-        self.file_remove_user_list.setDisabled(False)
-        self.file_remove_subreddit_list.setDisabled(False)
+        self.set_list_editing_enabled(self.state_loader is None)
+        self.check_download_journal(False)
         if len(self.failed_list) > 0:
             self.file_failed_download_list.setEnabled(True)
             if self.settings_manager.auto_display_failed_list:
                 self.display_failed_downloads()
         self.download_count = 0
 
+    def set_list_editing_enabled(self, enabled):
+        """
+        Enables or disables the options that add or remove lists and reddit objects.  These are disabled while the
+        downloader is running and while the lists are loading.
+        :param enabled: True if the options are to be enabled.
+        :type enabled: bool
+        """
+        self.list_editing_enabled = enabled
+        self.add_user_button.setEnabled(enabled)
+        self.remove_user_button.setEnabled(enabled)
+        self.add_subreddit_button.setEnabled(enabled)
+        self.remove_subreddit_button.setEnabled(enabled)
+        self.file_add_user_list.setEnabled(enabled)
+        self.file_add_subreddit_list.setEnabled(enabled)
+        self.file_remove_user_list.setEnabled(enabled)
+        self.file_remove_subreddit_list.setEnabled(enabled)
+        self.file_import_save_file.setEnabled(enabled)
+
     def finish_progress_bar(self):
         """
         Changes the progress bar text to show that it is complete and also moves the progress bar value to the maximum
@@ -1251,6 +1295,24 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.unfinished_downloads_available = True
         self.file_unfinished_downloads.setEnabled(True)
 
+    def check_download_journal(self, resume):
+        """
+        Makes any downloads left in the download journal, which were not completed because the application was closed
+        during a download, available as unfinished downloads.
+        :param resume: If True, the unfinished downloads are started as soon as the event loop is running.
+        :type resume: bool
+        """
+        try:
+            pending = Injector.get_download_journal().get_pending_content(Injector.get_dedupe_index())
+        except Exception:
+            self.logger.error('Failed to read download journal', exc_info=True)
+            return
+        if len(pending) > 0:
+            self.logger.info('Unfinished downloads found in download journal', extra={'pending_count': len(pending)})
+            self.set_unfinished_downloads(pending)
+            if resume:
+                QtCore.QTimer.singleShot(0, self.run_unfinished_downloads)
+
     def display_unfinished_downloads_dialog(self):
         try:
             unfinished_dialog = UnfinishedDownloadsDialog()
@@ -1264,6 +1326,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def clear_unfinished_list(self):
         self.unfinished_downloads.clear()
+        Injector.get_download_journal().clear()
         self.unfinished_downloads_available = False
 
     def reset_unfinished_downloads(self):
@@ -1377,6 +1440,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             return True
 
     def check_save_status(self):
+        self.wait_for_load_state()
         if self.settings_manager.auto_save:
             self.save_state()
             return True
@@ -1393,6 +1457,7 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             return True
 
     def close(self):
+        self.stop_load_state()
         self.receiver.stop_run()
         self.save_main_window_settings()
         super().close()
@@ -1407,30 +1472,125 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
         self.settings_manager.download_subreddits = self.download_subreddit_checkbox.isChecked()
         self.settings_manager.save_main_window()
 
-    def load_state(self):
-        reddit_object_list = ObjectStateHandler.load_pickled_state()
-        if reddit_object_list is False:
-            Message.save_file_permission_denied(self, ObjectStateHandler.get_save_path())
+    def load_state(self, import_save_file=False):
+        """
+        Starts the state loader on a separate thread.  The lists are added to the GUI one at a time as they are loaded,
+        beginning with the lists that were last displayed, so the GUI can be used while the rest of the lists load.
+        :param import_save_file: True if the pickled save file should replace the contents of the object store.
+        :type import_save_file: bool
+        """
+        self.set_list_editing_enabled(False)
+        self.state_loaded = False
+        self.state_load_failed = False
+        self.list_positions = {'user': [], 'subreddit': []}
+        self.state_loader_thread = QtCore.QThread()
+        self.state_loader = StateLoader(import_save_file)
+        self.state_loader.moveToThread(self.state_loader_thread)
+        self.state_loader_thread.started.connect(self.state_loader.run)
+        self.state_loader.views_loaded.connect(self.set_last_views)
+        self.state_loader.list_loaded.connect(self.add_loaded_list)
+        self.state_loader.progress.connect(self.update_load_progress)
+        self.state_loader.failed.connect(self.load_state_failed)
+        # quit directly from the loader thread so that the thread can be waited on from the main thread
+        self.state_loader.finished.connect(self.state_loader_thread.quit, QtCore.Qt.DirectConnection)
+        self.state_loader.finished.connect(self.state_loader.deleteLater)
+        self.state_loader_thread.finished.connect(self.state_loader_thread.deleteLater)
+        self.state_loader_thread.finished.connect(self.finish_load_state)
+        self.statusbar.showMessage('Loading lists...', -1)
+        self.state_loader_thread.start()
+
+    def set_last_views(self, last_user_view, last_subreddit_view):
+        self.last_views = {'user': last_user_view, 'subreddit': last_subreddit_view}
+
+    def add_loaded_list(self, list_type, name, position, reddit_object_list):
+        """
+        Adds a list received from the state loader to the GUI.  The list name is inserted into the list chooser combo at
+        the place it was saved in, and if the list was the last list displayed, it is displayed again.  If a list with
+        the same name is already displayed, the loaded list is added under a new name so that neither list is lost.
+        :param list_type: The type of reddit object held in the list, either 'user' or 'subreddit'.
+        :param name: The name of the list.
+        :param position: The position of the list in the combo when it was saved.
+        :param reddit_object_list: The reddit objects held in the list.
+        :type list_type: str
+        :type name: str
+        :type position: int
+        :type reddit_object_list: list
+        """
+        if list_type == 'user':
+            view_dict, combo, view = self.user_view_chooser_dict, self.user_lists_combo, 'USER'
         else:
+            view_dict, combo, view = self.subreddit_view_chooser_dict, self.subreddit_list_combo, 'SUB'
+        if name in view_dict:
+            new_name = self.get_unused_list_name(name, view_dict)
+            self.logger.warning('Loaded list name already in use', extra={'list_name': name, 'list_type': list_type,
+                                                                          'new_name': new_name})
+            name = new_name
+        model = ListModel(name, list_type)
+        model.reddit_object_list = reddit_object_list
+        view_dict[name] = model
+        positions = self.list_positions[list_type]
+        index = bisect.bisect(positions, position)
+        positions.insert(index, position)
+        combo.insertItem(index, name)
+        if name == self.last_views[list_type]:
+            combo.setCurrentText(name)
+            self.set_last_view_model(view, name)
+        elif combo.count() == 1:
+            combo.setCurrentIndex(0)
+            self.set_last_view_model(view, name)
+        self.statusbar.showMessage('Loaded %s list: %s' % (list_type, name), -1)
+
+    @staticmethod
+    def get_unused_list_name(name, view_dict):
+        """Returns the supplied list name with the lowest number appended to it that is not in the view dict."""
+        count = 2
+        while '%s (%s)' % (name, count) in view_dict:
+            count += 1
+        return '%s (%s)' % (name, count)
+
+    def update_load_progress(self, description, completed, total):
+        self.statusbar.showMessage('%s: %s of %s' % (description, completed, total), -1)
+
+    def load_state_failed(self):
+        """Records that the lists could not be loaded so that the store is not overwritten by the empty lists."""
+        self.state_load_failed = True
+        Message.save_file_permission_denied(self, ObjectStateHandler.get_store_path())
+
+    def finish_load_state(self):
+        self.state_loaded = not self.state_load_failed
+        self.state_loader = None
+        self.state_loader_thread = None
+        self.set_list_editing_enabled(not self.running)
+        self.statusbar.clearMessage()
+        self.logger.info('Save_file successfully loaded into gui',
+                         extra={'user_lists': len(self.user_view_chooser_dict),
+                                'subreddit_lists': len(self.subreddit_view_chooser_dict)})
+
+    def stop_load_state(self):
+        """
+        Stops the state loader, if it is running, and waits for it to finish.  The lists that were sent before the
+        loader stopped are still added, but the state is not marked as loaded as the remaining lists were not.
+        """
+        if self.state_loader is not None:
+            self.state_loader.stop()
+            self.state_loader_thread.quit()
+            self.state_loader_thread.wait()
+            QtWidgets.QApplication.processEvents()
+            self.state_loaded = False
+
+    def wait_for_load_state(self):
+        """
+        Waits for the state loader, if it is running, to finish loading the lists so that the lists can be saved before
+        the application is closed.  The lists that are sent by the loader are added before this returns.
+        """
+        if self.state_loader_thread is not None:
+            self.statusbar.showMessage('Waiting for lists to finish loading...', -1)
+            QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
             try:
-                last_user_view = reddit_object_list['last_user_view']
-                last_subreddit_view = reddit_object_list['last_sub_view']
-                self.user_view_chooser_dict = reddit_object_list['user_dict']
-                self.subreddit_view_chooser_dict = reddit_object_list['sub_dict']
-
-                for name in self.user_view_chooser_dict.keys():
-                    self.user_lists_combo.addItem(name)
-                for name in self.subreddit_view_chooser_dict.keys():
-                    self.subreddit_list_combo.addItem(name)
-                self.user_lists_combo.setCurrentText(last_user_view)
-                self.subreddit_list_combo.setCurrentText(last_subreddit_view)
-                self.set_last_view_model('USER', last_user_view)
-                self.set_last_view_model('SUB', last_subreddit_view)
-                self.logger.info('Save_file successfully loaded into gui')
-            except KeyError:
-                self.logger.error('Load state key error', exc_info=True)
-            except TypeError:
-                self.logger.error('Load state error: No save file found', exc_info=True)
+                self.state_loader_thread.wait()
+                QtWidgets.QApplication.processEvents()
+            finally:
+                QtWidgets.QApplication.restoreOverrideCursor()
 
     def set_last_view_model(self, view_dict, last_view):
         try:
@@ -1442,8 +1602,16 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
             pass
 
     def save_state(self):
-        """Pickles the user and subreddit lists and saves any settings that need to be saved"""
-        if not self.running:
+        """
+        Saves the user and subreddit lists to the object store and saves any settings that need to be saved.  If a
+        download is running, the objects changed by the run are checkpointed instead.  Nothing is saved until all of
+        the lists have been loaded, as lists that are not supplied are removed from the store.
+        """
+        if self.state_loader is not None:
+            Message.cannot_save_while_loading(self)
+        elif not self.state_loaded:
+            self.logger.warning('Save attempted after lists failed to load')
+        elif not self.running:
             self.settings_manager.save_all()
             save_object_dict = {
                 'user_view_chooser_dict': self.user_view_chooser_dict,
@@ -1451,11 +1619,13 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
                 'current_user_view': self.user_lists_combo.currentText(),
                 'current_sub_view': self.subreddit_list_combo.currentText()
             }
-            if not ObjectStateHandler.save_pickled_state(save_object_dict):
+            if not ObjectStateHandler.save_state(save_object_dict):
                 Message.failed_to_save(self)
                 self.set_not_saved()
             else:
                 self.set_saved()
+        elif self.checkpointer is not None:
+            self.checkpointer.request_checkpoint()
         else:
             Message.cannot_save_while_running(self)
 
@@ -1483,9 +1653,12 @@ class DownloaderForRedditGUI(QtWidgets.QMainWindow, Ui_MainWindow):
 
     def load_new_save_file(self):
         """Clears the list names from the list chooser combos and loads the newly moved save file into the GUI"""
+        self.stop_load_state()
         self.user_lists_combo.clear()
         self.subreddit_list_combo.clear()
-        self.load_state()
+        self.user_view_chooser_dict.clear()
+        self.subreddit_view_chooser_dict.clear()
+        self.load_state(import_save_file=True)
 
     def move_save_files(self, source_folder, first_attempt):
         """
@@ -126,6 +126,7 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
         self.link_filter_video_checkbox.setChecked(self.settings_manager.download_videos)
         self.link_filter_image_checkbox.setChecked(self.settings_manager.download_images)
         self.link_filter_avoid_duplicates_checkbox.setChecked(self.settings_manager.avoid_duplicates)
+        self.link_global_duplicates_checkbox.setChecked(self.settings_manager.link_global_duplicates)
 
         self.nsfw_filter_combo.addItems(self.settings_manager.nsfw_filter_dict.keys())
         for key, value in self.settings_manager.nsfw_filter_dict.items():
@@ -297,6 +298,7 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
         self.settings_manager.download_videos = self.link_filter_video_checkbox.isChecked()
         self.settings_manager.download_images = self.link_filter_image_checkbox.isChecked()
         self.settings_manager.avoid_duplicates = self.link_filter_avoid_duplicates_checkbox.isChecked()
+        self.settings_manager.link_global_duplicates = self.link_global_duplicates_checkbox.isChecked()
 
         self.settings_manager.nsfw_filter = self.settings_manager.nsfw_filter_dict[self.nsfw_filter_combo.currentText()]
 
@@ -362,6 +364,7 @@ class RedditDownloaderSettingsGUI(QtWidgets.QDialog, Ui_SettingsGUI):
         self.link_filter_video_checkbox.setChecked(True)
         self.link_filter_image_checkbox.setChecked(True)
         self.link_filter_avoid_duplicates_checkbox.setChecked(True)
+        self.link_global_duplicates_checkbox.setChecked(True)
         self.nsfw_filter_combo.setCurrentText('Include')
         self.download_reddit_videos_checkbox.setChecked(True)
         self.subreddit_save_by_combo.setCurrentIndex(0)
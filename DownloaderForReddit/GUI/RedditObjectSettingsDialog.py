@@ -186,6 +186,7 @@ class RedditObjectSettingsDialog(QtWidgets.QDialog, Ui_RedditObjectSettingsDialo
         self.download_videos_checkbox.setEnabled(False)
         self.download_images_checkbox.setEnabled(False)
         self.avoid_duplicates_checkbox.setEnabled(False)
+        self.use_global_dedupe_checkbox.setEnabled(False)
         self.nsfw_filter_combo.setEnabled(False)
         self.restore_defaults_button.setEnabled(False)
         self.save_cancel_buton_box.button(QtWidgets.QDialogButtonBox.Ok).setEnabled(False)
@@ -215,6 +216,7 @@ class RedditObjectSettingsDialog(QtWidgets.QDialog, Ui_RedditObjectSettingsDialo
         self.download_videos_checkbox.setChecked(reddit_object.download_videos)
         self.download_images_checkbox.setChecked(reddit_object.download_images)
         self.avoid_duplicates_checkbox.setChecked(reddit_object.avoid_duplicates)
+        self.use_global_dedupe_checkbox.setChecked(reddit_object.use_global_dedupe)
         self.set_nsfw_filter_combo(reddit_object)
         self.total_downloads_label.setText(str(reddit_object.number_of_downloads))
         added_on = datetime.date.strftime(datetime.datetime.fromtimestamp(reddit_object.user_added),
@@ -330,6 +332,7 @@ class RedditObjectSettingsDialog(QtWidgets.QDialog, Ui_RedditObjectSettingsDialo
         self.current_temp_object.download_videos = self.download_videos_checkbox.isChecked()
         self.current_temp_object.download_images = self.download_images_checkbox.isChecked()
         self.current_temp_object.avoid_duplicates = self.avoid_duplicates_checkbox.isChecked()
+        self.current_temp_object.use_global_dedupe = self.use_global_dedupe_checkbox.isChecked()
         self.current_temp_object.nsfw_filter = \
             self.settings_manager.nsfw_filter_dict[self.nsfw_filter_combo.currentText()]
         if self.object_type == 'SUBREDDIT':
@@ -183,6 +183,12 @@ class Ui_SettingsGUI(object):
         self.link_filter_avoid_duplicates_checkbox.setFont(font)
         self.link_filter_avoid_duplicates_checkbox.setObjectName("link_filter_avoid_duplicates_checkbox")
         self.gridLayout_4.addWidget(self.link_filter_avoid_duplicates_checkbox, 0, 0, 1, 1)
+        self.link_global_duplicates_checkbox = QtWidgets.QCheckBox(self.groupBox_2)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        self.link_global_duplicates_checkbox.setFont(font)
+        self.link_global_duplicates_checkbox.setObjectName("link_global_duplicates_checkbox")
+        self.gridLayout_4.addWidget(self.link_global_duplicates_checkbox, 1, 0, 1, 3)
         self.label_3 = QtWidgets.QLabel(self.groupBox_2)
         self.label_3.setObjectName("label_3")
         self.gridLayout_4.addWidget(self.label_3, 2, 0, 1, 1)
@@ -415,6 +421,8 @@ class Ui_SettingsGUI(object):
         self.date_limit_edit.setDisplayFormat(_translate("SettingsGUI", "M/d/yyyy hh:mm ap"))
         self.groupBox_2.setTitle(_translate("SettingsGUI", "Content Filters"))
         self.link_filter_avoid_duplicates_checkbox.setText(_translate("SettingsGUI", "Avoid Duplicates"))
+        self.link_global_duplicates_checkbox.setToolTip(_translate("SettingsGUI", "Link content that was already downloaded for another user or subreddit instead of skipping it"))
+        self.link_global_duplicates_checkbox.setText(_translate("SettingsGUI", "Link Global Duplicates"))
         self.label_3.setText(_translate("SettingsGUI", "NSFW filter:"))
         self.link_filter_video_checkbox.setText(_translate("SettingsGUI", "Download Videos"))
         self.link_filter_image_checkbox.setText(_translate("SettingsGUI", "Download Images"))
@@ -141,6 +141,9 @@ class Ui_RedditObjectSettingsDialog(object):
         self.avoid_duplicates_checkbox = QtWidgets.QCheckBox(self.page)
         self.avoid_duplicates_checkbox.setObjectName("avoid_duplicates_checkbox")
         self.gridLayout_5.addWidget(self.avoid_duplicates_checkbox, 8, 1, 1, 2)
+        self.use_global_dedupe_checkbox = QtWidgets.QCheckBox(self.page)
+        self.use_global_dedupe_checkbox.setObjectName("use_global_dedupe_checkbox")
+        self.gridLayout_5.addWidget(self.use_global_dedupe_checkbox, 8, 0, 1, 1)
         self.nsfw_filter_combo = QtWidgets.QComboBox(self.page)
         self.nsfw_filter_combo.setObjectName("nsfw_filter_combo")
         self.gridLayout_5.addWidget(self.nsfw_filter_combo, 9, 1, 1, 2)
@@ -198,4 +201,6 @@ class Ui_RedditObjectSettingsDialog(object):
         self.sub_sort_combo.setToolTip(_translate("RedditObjectSettingsDialog", "<html><head/><body><p><span style=\" font-size:10pt;\">This combo box is only considered if this subreddit is downloaded as a single download</span></p></body></html>"))
         self.download_images_checkbox.setText(_translate("RedditObjectSettingsDialog", "Download Images"))
         self.avoid_duplicates_checkbox.setText(_translate("RedditObjectSettingsDialog", "Avoid Duplicates"))
+        self.use_global_dedupe_checkbox.setToolTip(_translate("RedditObjectSettingsDialog", "Skip or link content that has already been downloaded for any user or subreddit"))
+        self.use_global_dedupe_checkbox.setText(_translate("RedditObjectSettingsDialog", "Global Duplicates"))
 
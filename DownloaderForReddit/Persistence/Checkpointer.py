@@ -0,0 +1,75 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import threading
+import logging
+
+from ..Persistence.ObjectStateHandler import ObjectStateHandler
+
+
+class Checkpointer(threading.Thread):
+
+    def __init__(self, get_lists, interval):
+        """
+        A background thread that periodically saves the reddit objects that have been changed by a download run to the
+        object store, so that the updated date limits and download history survive a crash during a long run.  A final
+        checkpoint is taken when the thread is stopped, after which the stored fields of the saved reddit objects are
+        released so that the history loaded by the download run is not held in memory once the run is over.
+        :param get_lists: A callable that returns a tuple of the user lists and the subreddit lists, each a dict of
+                          list names mapped to the list of reddit objects in the list.
+        :param interval: The number of seconds between checkpoints.
+        :type interval: int
+        """
+        super().__init__(daemon=True)
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.get_lists = get_lists
+        self.interval = interval
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while True:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            final = self.stopped.is_set()
+            self.checkpoint(final)
+            if final:
+                break
+
+    def request_checkpoint(self):
+        """Takes a checkpoint as soon as possible instead of waiting for the interval to pass."""
+        self.wake.set()
+
+    def stop(self):
+        """Takes a final checkpoint and ends the thread.  This does not wait for the checkpoint to finish."""
+        self.stopped.set()
+        self.wake.set()
+
+    def checkpoint(self, release_stored_fields=False):
+        try:
+            user_lists, subreddit_lists = self.get_lists()
+            ObjectStateHandler.checkpoint(user_lists, subreddit_lists, release_stored_fields)
+        except Exception:
+            self.logger.error('Failed to checkpoint reddit objects', exc_info=True)
@@ -0,0 +1,121 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import shelve
+import os
+import threading
+import logging
+
+from ..Utils import SystemUtil
+
+
+class DedupeIndex:
+
+    """
+    A persistent index, shared by every reddit object, that maps the url of downloaded content to the path the content
+    was saved to.  Reddit objects that opt in to global duplicate checking consult the index before content is
+    downloaded so that the same file is not downloaded again for each user and subreddit that links to it.  Urls that
+    have been claimed during the current session, but which have not finished downloading, are held in memory.
+    """
+
+    def __init__(self, path=None):
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.path = path if path is not None else os.path.join(SystemUtil.get_data_directory(), 'dedupe_index')
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.shelf = None
+
+    def open(self):
+        if self.shelf is None:
+            self.shelf = shelve.open(self.path, 'c')
+        return self.shelf
+
+    def close(self):
+        """Closes the index file and forgets the urls claimed during the download session."""
+        with self.lock:
+            self.pending.clear()
+            if self.shelf is not None:
+                self.shelf.close()
+                self.shelf = None
+
+    def get_path(self, url):
+        """
+        Returns the path that the content at the supplied url has been or is being saved to.  Paths of stored entries
+        that no longer exist on disk are removed from the index.
+        :param url: The url of the content to look up.
+        :type url: str
+        :return: The path of the existing file or None if the url is not in the index.
+        :rtype: str
+        """
+        with self.lock:
+            path = self.pending.get(url)
+            if path is not None:
+                return path
+            shelf = self.open()
+            path = shelf.get(url)
+            if path is not None and not os.path.isfile(path):
+                del shelf[url]
+                path = None
+            return path
+
+    def claim(self, url, path):
+        """
+        Returns the path of existing content for the supplied url if there is one, otherwise records that the url is
+        about to be downloaded to the supplied path and returns None.
+        :param url: The url of the content that is to be downloaded.
+        :param path: The path the content will be saved to.
+        :type url: str
+        :type path: str
+        :return: The path of the existing file or None if the url has been claimed for the supplied path.
+        :rtype: str
+        """
+        existing = self.get_path(url)
+        if existing is None:
+            with self.lock:
+                self.pending[url] = path
+        return existing
+
+    def release(self, url, path):
+        """
+        Removes the claim on the supplied url that was made for the supplied path, so that content with the same url
+        is downloaded again instead of being linked to a file that was never saved.
+        :param url: The url of the content that failed to download.
+        :param path: The path that the url was claimed for.
+        """
+        with self.lock:
+            if self.pending.get(url) == path:
+                del self.pending[url]
+
+    def add(self, url, path):
+        """Records that the content at the supplied url has been saved to the supplied path."""
+        with self.lock:
+            self.pending.pop(url, None)
+            try:
+                shelf = self.open()
+                shelf[url] = path
+                shelf.sync()
+            except Exception:
+                self.logger.error('Failed to add entry to dedupe index', extra={'url': url, 'path': path},
+                                  exc_info=True)
@@ -0,0 +1,139 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import sqlite3
+import os
+import threading
+import logging
+from time import time
+
+from ..Core import Content
+from ..Utils import SystemUtil
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, url TEXT NOT NULL, user TEXT, post_title TEXT,
+                                 subreddit TEXT, submission_id TEXT, number_in_seq TEXT, file_ext TEXT,
+                                 save_path TEXT, subreddit_save_method TEXT, date_created INTEGER, link_source TEXT,
+                                 dedupe INTEGER NOT NULL, state TEXT NOT NULL, updated INTEGER NOT NULL);
+"""
+
+QUEUED = 'QUEUED'
+STARTED = 'STARTED'
+
+
+class DownloadJournal:
+
+    def __init__(self, path=None):
+        """
+        A durable record of the content that has been sent to the downloader.  Content is recorded when it is queued,
+        marked when its download starts, and removed when its download completes, so the jobs left in the journal are
+        exactly the downloads that were not completed.  If the application is stopped or closed during a run, the
+        remaining jobs can be rebuilt into content and downloaded without validating or extracting anything again.
+        :param path: The path of the journal database.  Defaults to a file in the application data directory.
+        :type path: str
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.path = path if path is not None else os.path.join(SystemUtil.get_data_directory(), 'download_journal.db')
+        self.lock = threading.Lock()
+        self.connection = None
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def enqueue(self, content_list):
+        """
+        Records the supplied content as queued for download and gives each content item the id of its job.
+        :param content_list: The content that is about to be sent to the downloader.
+        :type content_list: list
+        """
+        now = int(time())
+        with self.lock, self.connect() as connection:
+            for content in content_list:
+                content.journal = self
+                content.journal_id = connection.execute(
+                    'INSERT INTO jobs (url, user, post_title, subreddit, submission_id, number_in_seq, file_ext, '
+                    'save_path, subreddit_save_method, date_created, link_source, dedupe, state, updated) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (content.url, content.user, content.post_title, content.subreddit, content.submission_id,
+                     None if content.number_in_seq is None else str(content.number_in_seq), content.file_ext,
+                     content.save_path, content.subreddit_save_method, content.date_created, content.link_source,
+                     content.dedupe_index is not None, QUEUED, now)).lastrowid
+
+    def mark_started(self, job_id):
+        self.update(job_id, 'UPDATE jobs SET state = ?, updated = ? WHERE id = ?', (STARTED, int(time()), job_id))
+
+    def mark_finished(self, job_id):
+        self.update(job_id, 'DELETE FROM jobs WHERE id = ?', (job_id,))
+
+    def update(self, job_id, statement, parameters):
+        try:
+            with self.lock, self.connect() as connection:
+                connection.execute(statement, parameters)
+        except Exception:
+            self.logger.error('Failed to update download journal', extra={'job_id': job_id}, exc_info=True)
+
+    def pending_count(self):
+        with self.lock:
+            return self.connect().execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def get_pending_content(self, dedupe_index=None):
+        """
+        Rebuilds the content for each job that has not been completed, in the order the jobs were queued.  Jobs that
+        were started but not completed are downloaded again from the beginning.
+        :param dedupe_index: The dedupe index that content which was recorded in it is to be recorded in again.
+        :type dedupe_index: DedupeIndex
+        :return: A list of content that is ready to be sent to the downloader.
+        :rtype: list
+        """
+        with self.lock:
+            rows = self.connect().execute(
+                'SELECT id, url, user, post_title, subreddit, submission_id, number_in_seq, file_ext, save_path, '
+                'subreddit_save_method, date_created, link_source, dedupe FROM jobs ORDER BY id').fetchall()
+        content_list = []
+        for row in rows:
+            content = Content.Content(row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8], row[9], row[10],
+                                      False)
+            content.link_source = row[11]
+            content.dedupe_index = dedupe_index if row[12] else None
+            content.journal = self
+            content.journal_id = row[0]
+            content_list.append(content)
+        return content_list
+
+    def clear(self):
+        """Removes every job from the journal."""
+        with self.lock, self.connect() as connection:
+            connection.execute('DELETE FROM jobs')
@@ -29,6 +29,9 @@ import logging
 
 from ..ViewModels.ListModel import ListModel
 from ..Persistence.ObjectUpdater import ObjectUpdater
+from ..Persistence.ObjectStore import ObjectStore
+from ..Persistence.StoreMigrator import StoreMigrator
+from ..Core.RedditObjects import state_lock
 from ..Utils import SystemUtil
 from ..version import __version__
 
@@ -46,6 +49,132 @@ class ObjectStateHandler:
     sub_update_count = 0
     saved_post_count = 0
     saved_content_count = 0
+    store = None
+
+    @classmethod
+    def get_store(cls):
+        if cls.store is None:
+            cls.store = ObjectStore(cls.get_store_path())
+        return cls.store
+
+    @classmethod
+    def get_store_path(cls):
+        """
+        Builds and returns a path to the object store database based on the users OS.
+        :return: The object store location.
+        :rtype: str
+        """
+        return os.path.join(SystemUtil.get_data_directory(), 'reddit_objects.db')
+
+    @classmethod
+    def load_state(cls, import_save_file=False, progress=None):
+        """
+        Loads the reddit object lists from the object store and packs them into the view_chooser_dicts that they will
+        be used in.  The first time the store is used, or when a save file has been imported, the lists held in the
+        pickled save file are migrated into the store.  A store written by an earlier version is upgraded once, in
+        bulk, by the StoreMigrator before it is loaded, so the version of each object is not checked here.
+        :param import_save_file: True if the pickled save file should replace the contents of the store.
+        :param progress: An optional callable that is supplied the progress of any migration that is run.
+        :type import_save_file: bool
+        :return: A dict of view chooser dicts and a string representing which value should be displayed currently,
+                 None if there are no saved lists, or False if the store could not be loaded.
+        """
+        store_path = cls.get_store_path()
+        try:
+            state = cls.prepare_store(import_save_file, progress).load()
+            if len(state['user_lists']) < 1 and len(state['subreddit_lists']) < 1:
+                return None
+            user_view_chooser_dict = {}
+            subreddit_view_chooser_dict = {}
+            for name, user_list in state['user_lists'].items():
+                x = ListModel(name, 'user')
+                x.reddit_object_list = user_list
+                user_view_chooser_dict[name] = x
+                cls.total_user_count += len(user_list)
+                cls.sum_saved_objects(user_list)
+            for name, sub_list in state['subreddit_lists'].items():
+                x = ListModel(name, 'subreddit')
+                x.reddit_object_list = sub_list
+                subreddit_view_chooser_dict[name] = x
+                cls.total_sub_count += len(sub_list)
+                cls.sum_saved_objects(sub_list)
+            cls.logger.info('Object lists loaded from object store', extra={'total_users': cls.total_user_count,
+                                                                            'total_subreddits': cls.total_sub_count})
+            return {'user_dict': user_view_chooser_dict, 'sub_dict': subreddit_view_chooser_dict,
+                    'last_user_view': state['last_user_view'], 'last_sub_view': state['last_sub_view']}
+        except Exception:
+            cls.logger.error('Failed to load from object store', extra={'store_location': store_path}, exc_info=True)
+            return False
+
+    @classmethod
+    def prepare_store(cls, import_save_file=False, progress=None):
+        """
+        Returns the object store once any migration of the pickled save file, or of a store written by an earlier
+        version, has been run.
+        :param import_save_file: True if the pickled save file should replace the contents of the store.
+        :param progress: An optional callable that is supplied the progress of any migration that is run.
+        :rtype: ObjectStore
+        """
+        store = cls.get_store()
+        if import_save_file or (store.get_meta('save_file_migrated') is None and store.is_empty()):
+            cls.migrate_save_file(store)
+        StoreMigrator(store, progress).run()
+        return store
+
+    @classmethod
+    def migrate_save_file(cls, store):
+        """
+        Replaces the contents of the object store with the lists held in the pickled save file, if there is one, and
+        records that the migration has been done so that it is not attempted again.
+        :param store: The object store that the lists are to be moved to.
+        :type store: ObjectStore
+        """
+        if cls.save_file_exists():
+            state = cls.load_pickled_state()
+            if state:
+                store.clear()
+                store.save({name: x.reddit_object_list for name, x in state['user_dict'].items()},
+                           {name: x.reddit_object_list for name, x in state['sub_dict'].items()},
+                           state['last_user_view'], state['last_sub_view'])
+                cls.logger.info('Save file migrated to object store', extra={'store_location': store.path})
+        store.set_meta('save_file_migrated', __version__)
+
+    @classmethod
+    def save_file_exists(cls):
+        save_path = cls.get_save_path()
+        return any(os.path.exists(save_path + ext) for ext in ('', '.db', '.dat'))
+
+    @classmethod
+    def save_state(cls, object_dict, release_stored_fields=True):
+        """
+        Saves the user and subreddit lists held in the supplied object_dict to the object store.  Only the changes to
+        each objects history since the last save are written.
+        :param object_dict: A dict of view chooser dicts and strings representing which view chooser value is currently
+                            displayed
+        :param release_stored_fields: If True, the history, saved content, and saved submissions of each object are
+                                      released once they are saved so that they are only held in memory again when
+                                      they are next used.
+        :type object_dict: dict
+        :type release_stored_fields: bool
+        :return: True if the save was successful and False if it was not.
+        :rtype: bool
+        """
+        store_path = cls.get_store_path()
+        try:
+            user_lists = cls.get_list_models(object_dict['user_view_chooser_dict'])
+            subreddit_lists = cls.get_list_models(object_dict['sub_view_chooser_dict'])
+            cls.get_store().save(user_lists, subreddit_lists, object_dict['current_user_view'],
+                                 object_dict['current_sub_view'])
+            if release_stored_fields:
+                for reddit_object_list in list(user_lists.values()) + list(subreddit_lists.values()):
+                    for reddit_object in reddit_object_list:
+                        reddit_object.release_stored_fields()
+            cls.logger.info('Objects successfully saved', extra={'total_users_saved': cls.total_user_count,
+                                                                 'total_subreddits_saved': cls.total_sub_count})
+            return True
+        except Exception:
+            cls.logger.error('Unable to save to object store', extra={'store_location': store_path}, exc_info=True)
+            return False
 
     @classmethod
     def load_pickled_state(cls):
@@ -102,8 +231,8 @@ class ObjectStateHandler:
     @classmethod
     def sum_saved_objects(cls, ro_list):
         for ro in ro_list:
-            cls.saved_post_count += len(ro.saved_submissions)
-            cls.saved_content_count += len(ro.saved_content)
+            cls.saved_post_count += ro.get_field_length('saved_submissions')
+            cls.saved_content_count += ro.get_field_length('saved_content')
 
     @classmethod
     def get_save_path(cls):
@@ -143,6 +272,38 @@ class ObjectStateHandler:
             cls.logger.error('Unable to save to save_file', extra={'save_file_location': save_path}, exc_info=True)
             return False
 
+    @classmethod
+    def checkpoint(cls, user_lists, subreddit_lists, release_stored_fields=False):
+        """
+        Saves the reddit objects in the supplied lists that have changed since they were last saved.  Objects are saved
+        from a snapshot taken while the download run is not changing them, so this is safe to call while a download is
+        running.
+        :param user_lists: A dict of user list names mapped to the list of users in each list.
+        :param subreddit_lists: A dict of subreddit list names mapped to the list of subreddits in each list.
+        :param release_stored_fields: If True, the stored fields of the saved objects are released once they are saved,
+                                      unless the object has been changed again since its snapshot was taken.
+        :type user_lists: dict
+        :type subreddit_lists: dict
+        :type release_stored_fields: bool
+        :return: The number of objects that were saved.
+        :rtype: int
+        """
+        entries = []
+        for list_type, lists in (('user', user_lists), ('subreddit', subreddit_lists)):
+            for name, reddit_object_list in lists.items():
+                entries.extend((name, list_type, position, reddit_object) for position, reddit_object in
+                               enumerate(list(reddit_object_list)) if reddit_object.dirty)
+        if len(entries) < 1:
+            return 0
+        count = cls.get_store().save_objects(entries, state_lock)
+        if release_stored_fields:
+            with state_lock:
+                for entry in entries:
+                    if not entry[3].dirty:
+                        entry[3].release_stored_fields()
+        cls.logger.info('Checkpoint saved', extra={'saved_object_count': count})
+        return count
+
     @classmethod
     def get_list_models(cls, view_chooser_dict):
         """
@@ -0,0 +1,385 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import sqlite3
+import pickle
+import threading
+import logging
+
+from ..Core.RedditObjects import User, Subreddit
+from ..Core.DownloadHistory import DownloadHistory
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS lists (id INTEGER PRIMARY KEY, name TEXT NOT NULL, list_type TEXT NOT NULL,
+                                  position INTEGER NOT NULL, UNIQUE (name, list_type));
+CREATE TABLE IF NOT EXISTS objects (id INTEGER PRIMARY KEY, list_id INTEGER NOT NULL, position INTEGER NOT NULL,
+                                    object_type TEXT, name TEXT NOT NULL, state BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS objects_list ON objects (list_id);
+CREATE TABLE IF NOT EXISTS history (id INTEGER PRIMARY KEY, object_id INTEGER NOT NULL, url TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS history_object ON history (object_id, url);
+CREATE TABLE IF NOT EXISTS saved_content (object_id INTEGER NOT NULL, url TEXT NOT NULL, value BLOB NOT NULL,
+                                          PRIMARY KEY (object_id, url));
+CREATE TABLE IF NOT EXISTS saved_submissions (object_id INTEGER NOT NULL, position INTEGER NOT NULL,
+                                              value BLOB NOT NULL);
+CREATE INDEX IF NOT EXISTS saved_submissions_object ON saved_submissions (object_id);
+"""
+
+# Attributes that are stored in their own tables, or that only hold download session data and are not stored, rather
+# than being stored in the pickled object state
+SEPARATELY_STORED = ('store_id', 'store', 'dirty', '_previous_downloads', '_saved_submissions', '_saved_content',
+                     'content', 'new_submissions', 'failed_extracts')
+
+OBJECT_CLASSES = {'user': User, 'subreddit': Subreddit}
+
+
+class ObjectStore:
+
+    def __init__(self, path):
+        """
+        A SQLite database, in WAL mode, that holds the user and subreddit lists.  Each reddit object is stored as a row
+        holding its pickled attributes, with its download history, saved content, and saved submissions held in
+        separate tables keyed by the objects row id.  Saves update the object rows in place and only append the urls
+        that have been added to each objects history since it was last saved, so the time taken to save does not grow
+        with the size of the history.
+        :param path: The path of the database file.
+        :type path: str
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.path = path
+        self.lock = threading.RLock()
+        self.connection = None
+
+    def __deepcopy__(self, memo):
+        return self  # Copies of reddit objects share the store of the object they were copied from
+
+    def connect(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            self.connection.executescript(SCHEMA)
+        return self.connection
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.connect().execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+            return row[0] if row is not None else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.connect() as connection:
+            connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def is_empty(self):
+        with self.lock:
+            return self.connect().execute('SELECT 1 FROM lists LIMIT 1').fetchone() is None
+
+    def clear(self):
+        """Removes every list and reddit object from the store."""
+        with self.lock, self.connect() as connection:
+            for table in ('lists', 'objects', 'history', 'saved_content', 'saved_submissions'):
+                connection.execute('DELETE FROM %s' % table)
+
+    def save(self, user_lists, subreddit_lists, current_user_view, current_sub_view):
+        """
+        Saves the supplied lists to the store in a single transaction.  Lists and reddit objects that are in the store
+        but are not in the supplied lists are removed.
+        :param user_lists: A dict of user list names mapped to the list of users in each list.
+        :param subreddit_lists: A dict of subreddit list names mapped to the list of subreddits in each list.
+        :param current_user_view: The name of the user list that is currently displayed.
+        :param current_sub_view: The name of the subreddit list that is currently displayed.
+        :type user_lists: dict
+        :type subreddit_lists: dict
+        """
+        with self.lock:
+            snapshots = []
+            written = []
+            try:
+                with self.connect() as connection:
+                    existing_lists = {(name, list_type): list_id for list_id, name, list_type in
+                                      connection.execute('SELECT id, name, list_type FROM lists')}
+                    existing_objects = {row[0] for row in connection.execute('SELECT id FROM objects')}
+                    saved_lists = set()
+                    saved_objects = set()
+                    position = 0
+                    for list_type, lists in (('user', user_lists), ('subreddit', subreddit_lists)):
+                        for name, reddit_object_list in lists.items():
+                            list_id = self.get_list_id(connection, name, list_type, position)
+                            saved_lists.add(list_id)
+                            position += 1
+                            for object_position, reddit_object in enumerate(reddit_object_list):
+                                # An object that is in more than one list is given a row for each list
+                                stored = reddit_object.store_id in existing_objects and \
+                                    reddit_object.store_id not in saved_objects
+                                snapshot = self.take_snapshot(reddit_object, stored)
+                                snapshots.append(snapshot)
+                                object_id = self.write_snapshot(connection, snapshot, list_id, object_position)
+                                written.append((snapshot, object_id))
+                                saved_objects.add(object_id)
+                    for list_id in set(existing_lists.values()).difference(saved_lists):
+                        connection.execute('DELETE FROM lists WHERE id = ?', (list_id,))
+                    for object_id in existing_objects.difference(saved_objects):
+                        self.delete_object(connection, object_id)
+                    connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                       ('current_user_view', current_user_view))
+                    connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                       ('current_sub_view', current_sub_view))
+            except Exception:
+                self.mark_unsaved(snapshots)
+                raise
+            for snapshot, object_id in written:
+                self.finish_snapshot(snapshot, object_id)
+
+    def save_objects(self, entries, snapshot_lock):
+        """
+        Saves only the supplied reddit objects.  This is used to checkpoint the objects that have changed during a
+        download run.  Snapshots of the objects are taken while the supplied lock is held so that each object is saved
+        in a consistent state, and the snapshots are written once the lock is released so that the download run is
+        not held up by the write.
+        :param entries: A list of tuples of the list name, list type, position in the list, and reddit object for each
+                        object that is to be saved.
+        :param snapshot_lock: The lock that is held by the download run while it changes reddit objects.
+        :type entries: list
+        :return: The number of objects that were saved.
+        :rtype: int
+        """
+        with self.lock:
+            existing_objects = {row[0] for row in self.connect().execute('SELECT id FROM objects')}
+            with snapshot_lock:
+                snapshots = [(name, list_type, position,
+                              self.take_snapshot(reddit_object, reddit_object.store_id in existing_objects))
+                             for name, list_type, position, reddit_object in entries]
+            written = []
+            try:
+                with self.connect() as connection:
+                    for name, list_type, position, snapshot in snapshots:
+                        list_id = self.get_list_id(connection, name, list_type)
+                        written.append((snapshot, self.write_snapshot(connection, snapshot, list_id, position)))
+            except Exception:
+                self.mark_unsaved([entry[3] for entry in snapshots])
+                raise
+            for snapshot, object_id in written:
+                self.finish_snapshot(snapshot, object_id)
+            return len(written)
+
+    @staticmethod
+    def get_list_id(connection, name, list_type, position=None):
+        """
+        Returns the row id of the list with the supplied name and type, adding the list if it is not in the store.  The
+        position of the list is updated if one is supplied.
+        """
+        row = connection.execute('SELECT id, position FROM lists WHERE name = ? AND list_type = ?',
+                                 (name, list_type)).fetchone()
+        if row is None:
+            if position is None:
+                position = connection.execute('SELECT COUNT(*) FROM lists').fetchone()[0]
+            return connection.execute('INSERT INTO lists (name, list_type, position) VALUES (?, ?, ?)',
+                                      (name, list_type, position)).lastrowid
+        if position is not None and position != row[1]:
+            connection.execute('UPDATE lists SET position = ? WHERE id = ?', (position, row[0]))
+        return row[0]
+
+    def take_snapshot(self, reddit_object, stored):
+        """
+        Copies everything that is to be written for the supplied reddit object so that it can be written while the
+        object continues to change.  Stored fields that have been released are unchanged since they were last saved
+        and are not copied.  The object is marked clean, as its current state is held in the snapshot, so that changes
+        made while the snapshot is written mark it dirty again.  If the write fails the object is marked dirty again
+        by mark_unsaved.
+        :param reddit_object: The reddit object that is to be saved.
+        :param stored: True if the object already has a row in the store.
+        :return: A dict holding the pickled object state and the rows to be written for each loaded stored field.
+        :rtype: dict
+        """
+        if not stored:
+            for field in reddit_object.STORED_FIELDS:
+                getattr(reddit_object, field)  # Released fields are loaded before the object is given a new row
+        reddit_object.stored_counts = {field: reddit_object.get_field_length(field)
+                                       for field in reddit_object.STORED_FIELDS}
+        reddit_object.dirty = False
+        loaded = reddit_object.__dict__
+        snapshot = {'object': reddit_object, 'stored': stored, 'object_type': reddit_object.object_type,
+                    'name': reddit_object.name, 'history': None, 'saved_content': None, 'saved_submissions': None,
+                    'state': pickle.dumps({key: value for key, value in loaded.items() if key not in SEPARATELY_STORED},
+                                          pickle.HIGHEST_PROTOCOL)}
+        history = loaded['_previous_downloads']
+        if history is not None:
+            # The full history is written if the object is new to the store, the history has not been saved before
+            # (such as a copy of a stored history), or a url has been removed from the history
+            start = history.saved_length
+            rewrite = not stored or start == 0 or history.rewrite_required or start > len(history)
+            snapshot['history'] = (history, rewrite, list(history.get_urls_from(0 if rewrite else start)),
+                                   len(history))
+        if loaded['_saved_content'] is not None:
+            snapshot['saved_content'] = [(url, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+                                         for url, value in loaded['_saved_content'].items()]
+        if loaded['_saved_submissions'] is not None:
+            snapshot['saved_submissions'] = [pickle.dumps(post, pickle.HIGHEST_PROTOCOL)
+                                             for post in loaded['_saved_submissions']]
+        return snapshot
+
+    @staticmethod
+    def write_snapshot(connection, snapshot, list_id, position):
+        """
+        Writes the supplied snapshot to the object row, inserting the row if the object is not yet stored.
+        :return: The row id of the object.
+        :rtype: int
+        """
+        values = (list_id, position, snapshot['object_type'], snapshot['name'], snapshot['state'])
+        if snapshot['stored']:
+            object_id = snapshot['object'].store_id
+            connection.execute('UPDATE objects SET list_id = ?, position = ?, object_type = ?, name = ?, state = ? '
+                               'WHERE id = ?', values + (object_id,))
+        else:
+            object_id = connection.execute(
+                'INSERT INTO objects (list_id, position, object_type, name, state) VALUES (?, ?, ?, ?, ?)',
+                values).lastrowid
+        if snapshot['history'] is not None:
+            history, rewrite, urls, length = snapshot['history']
+            if rewrite:
+                connection.execute('DELETE FROM history WHERE object_id = ?', (object_id,))
+            connection.executemany('INSERT INTO history (object_id, url) VALUES (?, ?)',
+                                   ((object_id, url) for url in urls))
+        if snapshot['saved_content'] is not None:
+            connection.execute('DELETE FROM saved_content WHERE object_id = ?', (object_id,))
+            connection.executemany('INSERT INTO saved_content (object_id, url, value) VALUES (?, ?, ?)',
+                                   ((object_id, url, value) for url, value in snapshot['saved_content']))
+        if snapshot['saved_submissions'] is not None:
+            connection.execute('DELETE FROM saved_submissions WHERE object_id = ?', (object_id,))
+            connection.executemany('INSERT INTO saved_submissions (object_id, position, value) VALUES (?, ?, ?)',
+                                   ((object_id, index, value) for index, value in
+                                    enumerate(snapshot['saved_submissions'])))
+        return object_id
+
+    @staticmethod
+    def mark_unsaved(snapshots):
+        """Marks the objects of snapshots that were not committed to the store dirty so that they are saved again."""
+        for snapshot in snapshots:
+            snapshot['object'].dirty = True
+
+    def finish_snapshot(self, snapshot, object_id):
+        """Records on the reddit object that the supplied snapshot has been committed to the store."""
+        reddit_object = snapshot['object']
+        reddit_object.store_id = object_id
+        reddit_object.store = self
+        if snapshot['history'] is not None:
+            history, rewrite, urls, length = snapshot['history']
+            history.saved_length = length
+            if rewrite:
+                history.rewrite_required = False
+
+    @staticmethod
+    def delete_object(connection, object_id):
+        for table, column in (('objects', 'id'), ('history', 'object_id'), ('saved_content', 'object_id'),
+                              ('saved_submissions', 'object_id')):
+            connection.execute('DELETE FROM %s WHERE %s = ?' % (table, column), (object_id,))
+
+    def load(self):
+        """
+        Loads the lists from the store.  The stored fields of each reddit object are not loaded until they are first
+        accessed.
+        :return: A dict containing the user lists and subreddit lists, each a dict of list names mapped to the list of
+                 reddit objects in the list, and the names of the last displayed user and subreddit lists.
+        :rtype: dict
+        """
+        lists = {'user': {}, 'subreddit': {}}
+        for list_type, name, position, reddit_object_list in self.iter_lists():
+            lists[list_type][name] = reddit_object_list
+        return {'user_lists': lists['user'], 'subreddit_lists': lists['subreddit'],
+                'last_user_view': self.get_meta('current_user_view'),
+                'last_sub_view': self.get_meta('current_sub_view')}
+
+    def iter_lists(self, priority=None):
+        """
+        Loads the lists from the store one at a time.  The store is only locked while each list is read, so the store
+        can be used between lists.
+        :param priority: An optional dict of list types mapped to the name of a list of that type which is to be loaded
+                         before the other lists.
+        :type priority: dict
+        :return: A generator of tuples of the list type, the list name, the position of the list, and the list of
+                 reddit objects in the list.  Lists are yielded in the order they were saved, apart from the priority
+                 lists which are yielded first.
+        """
+        priority = priority if priority is not None else {}
+        with self.lock:
+            lists = self.connect().execute('SELECT id, name, list_type, position FROM lists ORDER BY position').fetchall()
+        lists.sort(key=lambda x: priority.get(x[2]) != x[1])
+        for list_id, name, list_type, position in lists:
+            with self.lock:
+                rows = self.connect().execute('SELECT id, state FROM objects WHERE list_id = ? ORDER BY position',
+                                              (list_id,)).fetchall()
+            yield list_type, name, position, [self.restore_object(list_type, object_id, state)
+                                              for object_id, state in rows]
+
+    def restore_object(self, list_type, object_id, state):
+        reddit_object = OBJECT_CLASSES[list_type].__new__(OBJECT_CLASSES[list_type])
+        reddit_object.__setstate__(pickle.loads(state))
+        reddit_object.store_id = object_id
+        reddit_object.store = self
+        reddit_object.content = []
+        reddit_object.new_submissions = []
+        reddit_object.failed_extracts = []
+        return reddit_object
+
+    def load_field(self, object_id, field):
+        """
+        Loads one of the stored fields of the object with the supplied row id.
+        :param object_id: The row id of the reddit object.
+        :param field: The name of the field, one of RedditObject.STORED_FIELDS.
+        :type object_id: int
+        :type field: str
+        :return: A DownloadHistory for the previous_downloads field, a dict for the saved_content field, or a list for
+                 the saved_submissions field.
+        """
+        with self.lock:
+            connection = self.connect()
+            if field == 'previous_downloads':
+                history = DownloadHistory(self.get_history(object_id))
+                history.saved_length = len(history)
+                return history
+            if field == 'saved_content':
+                return {url: pickle.loads(value) for url, value in connection.execute(
+                    'SELECT url, value FROM saved_content WHERE object_id = ?', (object_id,))}
+            return [pickle.loads(row[0]) for row in connection.execute(
+                'SELECT value FROM saved_submissions WHERE object_id = ? ORDER BY position', (object_id,))]
+
+    def get_history(self, object_id):
+        """Returns the list of urls in the stored history of the object with the supplied row id."""
+        with self.lock:
+            return [row[0] for row in self.connect().execute(
+                'SELECT url FROM history WHERE object_id = ? ORDER BY id', (object_id,))]
+
+    def history_contains(self, object_id, url):
+        """Returns True if the supplied url is in the stored history of the object with the supplied row id."""
+        with self.lock:
+            return self.connect().execute('SELECT 1 FROM history WHERE object_id = ? AND url = ? LIMIT 1',
+                                          (object_id, url)).fetchone() is not None
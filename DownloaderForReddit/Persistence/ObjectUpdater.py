@@ -23,6 +23,7 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from ..Core.RedditObjects import User, Subreddit
+from ..Core.DownloadHistory import DownloadHistory
 from ..Utils import Injector
 from ..Core.Post import Post
 from ..version import __version__
@@ -95,6 +96,7 @@ class ObjectUpdater:
         cls.get_saved_submissions(old, new)
         cls.get_number_of_downloads(old, new)
         cls.set_enable_download(old, new)
+        cls.transfer_attribute_defaults(old, new)
 
     @staticmethod
     def update_save_path(old, new):
@@ -118,10 +120,10 @@ class ObjectUpdater:
         type new: RedditObject
         """
         try:
-            new.previous_downloads = old.previous_downloads
+            new.previous_downloads = DownloadHistory(old.previous_downloads)
         except AttributeError:
             try:
-                new.previous_downloads = old.already_downloaded
+                new.previous_downloads = DownloadHistory(old.already_downloaded)
             except:
                 print('Could not transfer previous downloads')
 
@@ -202,6 +204,22 @@ class ObjectUpdater:
         except AttributeError:
             new.enable_download = True
 
+    @staticmethod
+    def transfer_attribute_defaults(old, new):
+        """
+        Transfers the attributes that are given defaults when an object is loaded from an earlier build from the old
+        object to the new object if the old object contains them.
+        :param old: The old reddit object.
+        :param new: The new reddit object.
+        :type old: RedditObject
+        :type new: RedditObject
+        """
+        for key in new.get_attribute_defaults().keys():
+            try:
+                setattr(new, key, getattr(old, key))
+            except AttributeError:
+                pass
+
     @staticmethod
     def check_settings_manager(settings_manager):
         """
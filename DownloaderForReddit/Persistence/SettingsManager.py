@@ -62,6 +62,8 @@ class SettingsManager:
         self.last_update = self.settings.value('last_update', None, type=str)
         self.total_files_downloaded = self.settings.value('total_files_downloaded', 0, type=int)
         self.auto_save = self.settings.value('auto_save', False, type=bool)
+        self.checkpoint_interval = self.settings.value('checkpoint_interval', 300, type=int)
+        self.resume_journaled_downloads = self.settings.value('resume_journaled_downloads', True, type=bool)
         self.imgur_client_id = self.settings.value('imgur_client_id', None, type=str)
         self.imgur_client_secret = self.settings.value('imgur_client_secret', None, type=str)
         self.auto_display_failed_list = self.settings.value("auto_display_failed_list", True, type=bool)
@@ -74,6 +76,22 @@ class SettingsManager:
         self.subreddit_sort_top_method = self.settings.value('subreddit_sort_top_method', 'DAY', type=str)
 
         self.post_limit = self.settings.value('post_limit', 25, type=int)
+        self.incremental_listing_fetch = self.settings.value('incremental_listing_fetch', True, type=bool)
+        self.raw_listing_ingestion = self.settings.value('raw_listing_ingestion', True, type=bool)
+        self.seen_post_retention_days = self.settings.value('seen_post_retention_days', 30, type=int)
+        self.adaptive_polling = self.settings.value('adaptive_polling', False, type=bool)
+        self.min_poll_interval_hours = self.settings.value('min_poll_interval_hours', 1, type=int)
+        self.max_poll_interval_hours = self.settings.value('max_poll_interval_hours', 168, type=int)
+        self.skip_validation_request = self.settings.value('skip_validation_request', False, type=bool)
+        self.combine_subreddit_listings = self.settings.value('combine_subreddit_listings', False, type=bool)
+        self.allow_constrained_search = self.settings.value('allow_constrained_search', True, type=bool)
+        self.validation_cache_ttl = self.settings.value('validation_cache_ttl', 86400, type=int)
+
+        self.domain_whitelist = self.settings.value('domain_whitelist', [], type=list)
+        self.domain_blacklist = self.settings.value('domain_blacklist', [], type=list)
+        self.title_filter_regex = self.settings.value('title_filter_regex', '', type=str)
+        self.flair_filter = self.settings.value('flair_filter', [], type=list)
+        self.min_post_resolution = self.settings.value('min_post_resolution', 0, type=int)
 
         self.restrict_by_date = self.settings.value('restrict_by_date', False, type=bool)
         self.restrict_by_custom_date = self.settings.value("restrict_by_custom_date", False, type=bool)
@@ -84,10 +102,13 @@ class SettingsManager:
         self.download_videos = self.settings.value('download_video', True, type=bool)
         self.download_images = self.settings.value('download_images', True, type=bool)
         self.avoid_duplicates = self.settings.value('avoid_duplicates', True, type=bool)
+        self.link_global_duplicates = self.settings.value('link_global_duplicates', True, type=bool)
 
         self.nsfw_filter = self.settings.value('nsfw_filter', 'INCLUDE', type=str)
 
         self.download_reddit_hosted_videos = self.settings.value('download_reddit_hosted_videos', True, type=bool)
+        self.reddit_video_max_resolution = self.settings.value('reddit_video_max_resolution', 0, type=int)
+        self.reddit_video_max_bitrate = self.settings.value('reddit_video_max_bitrate', 0, type=int)
 
         self.save_subreddits_by = self.settings.value('save_subreddits_by', 'Subreddit Name', type=str)
         self.name_downloads_by = self.settings.value('name_downloads_by', 'Image/Album Id', type=str)
@@ -95,6 +116,8 @@ class SettingsManager:
         default_folder = os.path.join(os.path.expanduser("~"), "Downloads")
         self.save_directory = self.settings.value("save_directory", default_folder, type=str)
         self.max_download_thread_count = self.settings.value('max_download_thread_count', 4, type=int)
+        self.max_listing_fetch_thread_count = self.settings.value('max_listing_fetch_thread_count', 4, type=int)
+        self.reddit_client_ids = self.settings.value('reddit_client_ids', [], type=list)
         self.save_undownloaded_content = self.settings.value("save_undownloaded_content", True, type=bool)
         self.save_failed_extracts = self.settings.value('save_failed_extracts', True, type=bool)
         self.set_file_modified_date = self.settings.value('set_file_modified_date', False, type=bool)
@@ -205,6 +228,8 @@ class SettingsManager:
         self.settings.setValue("last_update", self.last_update)
         self.settings.setValue("total_files_downloaded", self.total_files_downloaded)
         self.settings.setValue("auto_save", self.auto_save)
+        self.settings.setValue('checkpoint_interval', self.checkpoint_interval)
+        self.settings.setValue('resume_journaled_downloads', self.resume_journaled_downloads)
         self.settings.setValue("imgur_client_id", self.imgur_client_id)
         self.settings.setValue("imgur_client_secret", self.imgur_client_secret)
         self.settings.setValue("auto_display_failed_list", self.auto_display_failed_list)
@@ -214,18 +239,38 @@ class SettingsManager:
         self.settings.setValue("subreddit_sort_method", self.subreddit_sort_method)
         self.settings.setValue("subreddit_sort_top_method", self.subreddit_sort_top_method)
         self.settings.setValue("post_limit", self.post_limit)
+        self.settings.setValue('incremental_listing_fetch', self.incremental_listing_fetch)
+        self.settings.setValue('raw_listing_ingestion', self.raw_listing_ingestion)
+        self.settings.setValue('seen_post_retention_days', self.seen_post_retention_days)
+        self.settings.setValue('adaptive_polling', self.adaptive_polling)
+        self.settings.setValue('min_poll_interval_hours', self.min_poll_interval_hours)
+        self.settings.setValue('max_poll_interval_hours', self.max_poll_interval_hours)
+        self.settings.setValue('skip_validation_request', self.skip_validation_request)
+        self.settings.setValue('combine_subreddit_listings', self.combine_subreddit_listings)
+        self.settings.setValue('allow_constrained_search', self.allow_constrained_search)
+        self.settings.setValue('validation_cache_ttl', self.validation_cache_ttl)
+        self.settings.setValue('domain_whitelist', self.domain_whitelist)
+        self.settings.setValue('domain_blacklist', self.domain_blacklist)
+        self.settings.setValue('title_filter_regex', self.title_filter_regex)
+        self.settings.setValue('flair_filter', self.flair_filter)
+        self.settings.setValue('min_post_resolution', self.min_post_resolution)
         self.settings.setValue("restrict_by_date", self.restrict_by_date)
         self.settings.setValue("restrict_by_custom_date", self.restrict_by_custom_date)
         self.settings.setValue("settings_custom_date", self.custom_date)
         self.settings.setValue("download_video", self.download_videos)
         self.settings.setValue("download_images", self.download_images)
         self.settings.setValue("avoid_duplicates", self.avoid_duplicates)
+        self.settings.setValue('link_global_duplicates', self.link_global_duplicates)
         self.settings.setValue('nsfw_filter', self.nsfw_filter)
         self.settings.setValue('download_reddit_hosted_videos', self.download_reddit_hosted_videos)
+        self.settings.setValue('reddit_video_max_resolution', self.reddit_video_max_resolution)
+        self.settings.setValue('reddit_video_max_bitrate', self.reddit_video_max_bitrate)
         self.settings.setValue("save_subreddits_by", self.save_subreddits_by)
         self.settings.setValue("name_downloads_by", self.name_downloads_by)
         self.settings.setValue("save_directory", self.save_directory)
         self.settings.setValue("max_download_thread_count", self.max_download_thread_count)
+        self.settings.setValue('max_listing_fetch_thread_count', self.max_listing_fetch_thread_count)
+        self.settings.setValue('reddit_client_ids', self.reddit_client_ids)
         self.settings.setValue("save_undownloaded_content", self.save_undownloaded_content)
         self.settings.setValue('save_failed_extracts', self.save_failed_extracts)
         self.settings.setValue('set_file_modified_date', self.set_file_modified_date)
@@ -322,17 +367,37 @@ class SettingsManager:
             'subreddit_sort_method': self.subreddit_sort_method,
             'subreddit_sort_top_method': self.subreddit_sort_top_method,
             'post_limit': self.post_limit,
+            'incremental_listing_fetch': self.incremental_listing_fetch,
+            'raw_listing_ingestion': self.raw_listing_ingestion,
+            'seen_post_retention_days': self.seen_post_retention_days,
+            'adaptive_polling': self.adaptive_polling,
+            'min_poll_interval_hours': self.min_poll_interval_hours,
+            'max_poll_interval_hours': self.max_poll_interval_hours,
+            'skip_validation_request': self.skip_validation_request,
+            'combine_subreddit_listings': self.combine_subreddit_listings,
+            'allow_constrained_search': self.allow_constrained_search,
+            'validation_cache_ttl': self.validation_cache_ttl,
+            'domain_whitelist': self.domain_whitelist,
+            'domain_blacklist': self.domain_blacklist,
+            'title_filter_regex': self.title_filter_regex,
+            'flair_filter': self.flair_filter,
+            'min_post_resolution': self.min_post_resolution,
             'restrict_by_date': self.restrict_by_date,
             'restrict_by_custom_date': self.restrict_by_custom_date,
             'custom_date': self.custom_date,
             'download_videos': self.download_videos,
             'download_images': self.download_images,
             'avoid_duplicates': self.avoid_duplicates,
+            'link_global_duplicates': self.link_global_duplicates,
             'nsfw_filter': self.nsfw_filter,
+            'reddit_video_max_resolution': self.reddit_video_max_resolution,
+            'reddit_video_max_bitrate': self.reddit_video_max_bitrate,
             'save_subreddits_by': self.save_subreddits_by,
             'name_downloads_by': self.name_downloads_by,
             'save_directory': self.save_directory,
             'max_download_thread_count': self.max_download_thread_count,
+            'max_listing_fetch_thread_count': self.max_listing_fetch_thread_count,
+            'reddit_client_count': len(self.reddit_client_ids) + 1,
             'save_undownloaded_content': self.save_undownloaded_content
         }
 
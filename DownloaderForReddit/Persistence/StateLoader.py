@@ -0,0 +1,78 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..Persistence.ObjectStateHandler import ObjectStateHandler
+
+
+class StateLoader(QObject):
+
+    views_loaded = pyqtSignal(str, str)
+    list_loaded = pyqtSignal(str, str, int, list)
+    progress = pyqtSignal(str, int, int)
+    failed = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, import_save_file=False):
+        """
+        Class that runs on a separate thread from the main GUI and loads the reddit object lists from the object store
+        one list at a time, so that the GUI can be shown and used while the lists are loaded.  The last lists that were
+        displayed are loaded first.  The list models are made by the GUI when each list is received, as they belong to
+        the GUI thread.
+        :param import_save_file: True if the pickled save file should replace the contents of the store before the
+                                 lists are loaded.
+        :type import_save_file: bool
+        """
+        super().__init__()
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.import_save_file = import_save_file
+        self.continue_run = True
+
+    def run(self):
+        try:
+            store = ObjectStateHandler.prepare_store(self.import_save_file, self.progress.emit)
+            last_user_view = store.get_meta('current_user_view') or ''
+            last_sub_view = store.get_meta('current_sub_view') or ''
+            self.views_loaded.emit(last_user_view, last_sub_view)
+            count = 0
+            for list_type, name, position, reddit_object_list in \
+                    store.iter_lists({'user': last_user_view, 'subreddit': last_sub_view}):
+                if not self.continue_run:
+                    break
+                count += len(reddit_object_list)
+                self.list_loaded.emit(list_type, name, position, reddit_object_list)
+            self.logger.info('Object lists loaded from object store', extra={'total_objects': count})
+        except Exception:
+            self.logger.error('Failed to load from object store',
+                              extra={'store_location': ObjectStateHandler.get_store_path()}, exc_info=True)
+            self.failed.emit()
+        finally:
+            self.finished.emit()
+
+    def stop(self):
+        """Stops the loader before the next list is loaded."""
+        self.continue_run = False
@@ -0,0 +1,115 @@
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import logging
+
+from ..Persistence.ObjectUpdater import ObjectUpdater
+from ..version import __version__
+
+
+SCHEMA_VERSION = 1
+
+
+class StoreMigrator:
+
+    def __init__(self, store, progress=None):
+        """
+        Upgrades the object store in bulk, once, when it was written by an earlier version of the application.  Each
+        schema migration is run in order and the schema version is recorded after each one, then every reddit object
+        saved by an earlier version is rebuilt by the ObjectUpdater and the store is saved with the application version
+        recorded.  Loads of a store that is current do not check the version of each object.
+        :param store: The object store that is to be upgraded.
+        :param progress: An optional callable that is supplied a description of the current step, the number of items
+                         completed, and the total number of items as the migration runs.
+        :type store: ObjectStore
+        """
+        self.logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+        self.store = store
+        self.progress = progress
+        # A list of tuples of the schema version each migration upgrades the store to, a description of the migration,
+        # and the method that performs it on an open connection.  Migrations are added here when the store schema
+        # changes and SCHEMA_VERSION is raised to match.
+        self.migrations = [(1, 'Create object store schema', lambda connection: None)]
+
+    def needs_migration(self):
+        return self.get_schema_version() < SCHEMA_VERSION or self.store.get_meta('object_version') != __version__
+
+    def get_schema_version(self):
+        return int(self.store.get_meta('schema_version', 0))
+
+    def run(self):
+        """
+        Runs any migrations that the store has not had and upgrades any outdated reddit objects.
+        :return: True if the store was changed, False if it was already current.
+        :rtype: bool
+        """
+        if not self.needs_migration():
+            return False
+        self.migrate_schema()
+        if self.store.get_meta('object_version') != __version__:
+            self.upgrade_objects()
+            self.store.set_meta('object_version', __version__)
+        return True
+
+    def migrate_schema(self):
+        current = self.get_schema_version()
+        pending = [x for x in self.migrations if x[0] > current]
+        for count, (version, description, migrate) in enumerate(pending):
+            self.report(description, count, len(pending))
+            with self.store.lock, self.store.connect() as connection:
+                migrate(connection)
+                connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                   ('schema_version', str(version)))
+            self.logger.info('Object store migrated', extra={'schema_version': version, 'migration': description})
+
+    def upgrade_objects(self):
+        """
+        Rebuilds every reddit object that was saved by an earlier version of the application and saves the store.
+        """
+        state = self.store.load()
+        lists = [(x, state['user_lists'], ObjectUpdater.update_user) for x in state['user_lists']] + \
+                [(x, state['subreddit_lists'], ObjectUpdater.update_subreddit) for x in state['subreddit_lists']]
+        outdated = [(lists_dict[name], index, update) for name, lists_dict, update in lists
+                    for index, reddit_object in enumerate(lists_dict[name]) if not self.check_version(reddit_object)]
+        description = 'Upgrading reddit objects'
+        for count, (reddit_object_list, index, update) in enumerate(outdated):
+            self.report(description, count, len(outdated))
+            reddit_object_list[index] = update(reddit_object_list[index])
+        self.report(description, len(outdated), len(outdated))
+        if len(outdated) > 0:
+            self.store.save(state['user_lists'], state['subreddit_lists'], state['last_user_view'],
+                            state['last_sub_view'])
+        self.logger.info('Reddit objects upgraded', extra={'upgraded_count': len(outdated), 'version': __version__})
+
+    def report(self, description, completed, total):
+        if self.progress is not None:
+            self.progress(description, completed, total)
+
+    @staticmethod
+    def check_version(item):
+        try:
+            return item.version == __version__
+        except AttributeError:
+            return False
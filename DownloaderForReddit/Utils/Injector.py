@@ -24,10 +24,14 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 from queue import Queue
 
 from ..Persistence.SettingsManager import SettingsManager
+from ..Persistence.DedupeIndex import DedupeIndex
+from ..Persistence.DownloadJournal import DownloadJournal
 
 
 settings_manager = None
 queue = None
+dedupe_index = None
+download_journal = None
 
 
 def get_settings_manager():
@@ -42,3 +46,17 @@ def get_queue():
     if queue is None:
         queue = Queue()
     return queue
+
+
+def get_dedupe_index():
+    global dedupe_index
+    if dedupe_index is None:
+        dedupe_index = DedupeIndex()
+    return dedupe_index
+
+
+def get_download_journal():
+    global download_journal
+    if download_journal is None:
+        download_journal = DownloadJournal()
+    return download_journal
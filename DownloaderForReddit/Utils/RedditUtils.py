@@ -25,6 +25,8 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 import praw
 import prawcore
 from PyQt5.QtCore import QObject, pyqtSignal
+from time import time, sleep
+import threading
 import logging
 
 from ..Core.Post import Post
@@ -32,28 +34,409 @@ from ..version import __version__
 
 
 reddit_instance = None
+DEFAULT_CLIENT_ID = 'frGEUVAuHGL2PQ'
+DEFAULT_RATE_LIMIT = 600  # The number of requests assumed to be available in a window before reddit reports it
+
+# Media information for the parent posts of crossposts keyed by the parents fullname.  This is filled in batches as
+# listings are retrieved so that each crossposted video does not need its own request to find the parents media.
+crosspost_parent_cache = {}
+INFO_BATCH_SIZE = 100
+LISTING_PAGE_SIZE = 100
+MULTIREDDIT_SIZE = 100  # The number of subreddits requested together in one combined listing
 
 
 def get_reddit_instance():
     global reddit_instance
     if not reddit_instance:
-        reddit_instance = praw.Reddit(user_agent='python:DownloaderForReddit:%s (by /u/MalloyDelacroix)' % __version__,
-                                      client_id='frGEUVAuHGL2PQ', client_secret=None)
+        reddit_instance = make_reddit_instance()
     return reddit_instance
 
 
+def make_reddit_instance(client_id=DEFAULT_CLIENT_ID):
+    """
+    Returns a new praw instance.  Praw instances are not thread safe, so any thread that makes requests alongside
+    other threads must use its own instance instead of the shared instance returned by get_reddit_instance.  Reddit's
+    rate limit applies to the client id rather than to the instance, so every instance made for a client id draws its
+    requests from the same RateLimitBudget.
+    :param client_id: The reddit application client id that the instance authenticates with.
+    """
+    return praw.Reddit(user_agent='python:DownloaderForReddit:%s (by /u/MalloyDelacroix)' % __version__,
+                       client_id=client_id, client_secret=None, requestor_class=BudgetedRequestor,
+                       requestor_kwargs={'budget': get_rate_limit_budget(client_id)})
+
+
+rate_limit_budgets = {}
+rate_limit_budgets_lock = threading.Lock()
+
+
+def get_rate_limit_budget(client_id):
+    """Returns the rate limit budget that is shared by every praw instance made for the supplied client id."""
+    with rate_limit_budgets_lock:
+        if client_id not in rate_limit_budgets:
+            rate_limit_budgets[client_id] = RateLimitBudget()
+        return rate_limit_budgets[client_id]
+
+
+class RateLimitBudget:
+
+    def __init__(self):
+        """
+        The rate limit of one client id, shared by the praw instances of every thread that uses the client id.  Each
+        praw instance only knows about its own requests, so on its own each one would assume it has the whole rate
+        limit.  Here the remaining requests and the seconds until the window resets, as reported by reddit to any of
+        the instances, are used to space out the requests of all of them so that the remaining requests last until the
+        window resets.
+        """
+        self.lock = threading.Lock()
+        self.remaining = None
+        self.reset_time = None
+        self.next_request_time = 0
+
+    def reserve(self):
+        """
+        Reserves the next request slot and returns the number of seconds the caller must wait before it is made.
+        :rtype: float
+        """
+        with self.lock:
+            now = time()
+            if self.remaining is None or self.reset_time is None or now >= self.reset_time:
+                return 0
+            if self.remaining <= 0:
+                return self.reset_time - now
+            slot = max(now, self.next_request_time)
+            self.next_request_time = slot + (self.reset_time - slot) / self.remaining
+            self.remaining -= 1
+            return slot - now
+
+    def acquire(self):
+        """Blocks until the calling thread may make its next request."""
+        delay = self.reserve()
+        if delay > 0:
+            sleep(delay)
+
+    def update(self, headers):
+        """Records the remaining requests and the time until the window resets from reddit's response headers."""
+        try:
+            remaining = float(headers['x-ratelimit-remaining'])
+            reset = float(headers['x-ratelimit-reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self.lock:
+            self.remaining = remaining
+            self.reset_time = time() + reset
+            self.next_request_time = min(self.next_request_time, self.reset_time)
+
+
+class BudgetedRequestor(prawcore.Requestor):
+
+    def __init__(self, *args, budget=None, **kwargs):
+        """A prawcore requestor that makes each request from the supplied RateLimitBudget."""
+        super().__init__(*args, **kwargs)
+        self.budget = budget if budget is not None else RateLimitBudget()
+
+    def request(self, *args, **kwargs):
+        self.budget.acquire()
+        response = super().request(*args, **kwargs)
+        self.budget.update(response.headers)
+        return response
+
+
+class RedditClientPool:
+
+    def __init__(self, client_ids, reddit=None):
+        """
+        Spreads reddit requests across the rate limits of several reddit application client ids.  Each thread is given
+        its own praw instance for each client id because praw instances are not thread safe.  The remaining requests
+        reported by reddit for each client id are tracked, along with the time reddit reported that the rate limit
+        window resets, as instances are checked back in.  Each checkout is routed to the client id with the most
+        remaining requests, less the requests currently being made with it.
+        :param client_ids: A list of the client ids to use.  Duplicates are ignored.
+        :param reddit: An optional existing praw instance for the first client id that is used by the creating thread.
+        """
+        self.client_ids = list(dict.fromkeys(client_ids))
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.remaining = {client_id: None for client_id in self.client_ids}
+        self.reset_times = dict.fromkeys(self.client_ids, 0)
+        self.in_use = dict.fromkeys(self.client_ids, 0)
+        self.instance_ids = {}
+        if reddit is not None:
+            self.local.instances = {self.client_ids[0]: reddit}
+            self.instance_ids[id(reddit)] = self.client_ids[0]
+
+    def __len__(self):
+        return len(self.client_ids)
+
+    def get_headroom(self, client_id):
+        """
+        Returns the number of requests that are expected to be available to the supplied client id.  The remaining
+        count reported by reddit is ignored once the rate limit window it was reported in has reset.
+        """
+        remaining = self.remaining[client_id]
+        if remaining is None or time() >= self.reset_times[client_id]:
+            remaining = DEFAULT_RATE_LIMIT
+        return remaining - self.in_use[client_id]
+
+    def checkout(self):
+        """Returns the calling threads praw instance for the client id with the most headroom."""
+        with self.lock:
+            client_id = max(self.client_ids, key=self.get_headroom)
+            self.in_use[client_id] += 1
+        instances = self.local.__dict__.setdefault('instances', {})
+        reddit = instances.get(client_id)
+        if reddit is None:
+            reddit = make_reddit_instance(client_id)
+            instances[client_id] = reddit
+            with self.lock:
+                self.instance_ids[id(reddit)] = client_id
+        return reddit
+
+    def checkin(self, reddit):
+        """
+        Returns a praw instance to the pool and records the remaining requests and the rate limit reset time that reddit
+        reported to it.
+        """
+        with self.lock:
+            client_id = self.instance_ids[id(reddit)]
+            self.in_use[client_id] -= 1
+            try:
+                remaining = reddit.auth.limits.get('remaining')
+                reset_time = reddit.auth.limits.get('reset_timestamp')
+            except Exception:
+                remaining = None
+                reset_time = None
+            if isinstance(remaining, (int, float)) and isinstance(reset_time, (int, float)):
+                self.remaining[client_id] = remaining
+                self.reset_times[client_id] = reset_time
+
+
+class SubmissionRecord:
+
+    """
+    A compact record of a submission parsed directly from listing json.  Only the fields that are needed to filter
+    and extract the submission are kept.  The author and subreddit are held as name strings.
+    """
+
+    __slots__ = ('id', 'url', 'author', 'subreddit', 'created', 'score', 'over_18', 'domain', 'media', 'title',
+                 'is_video', 'crosspost_parent', 'stickied', 'pinned', 'link_flair_text', 'height')
+
+    def __init__(self, data):
+        """
+        :param data: The data dict of a t3 listing child.
+        :type data: dict
+        """
+        self.id = data['id']
+        self.url = data.get('url')
+        self.author = data.get('author')
+        self.subreddit = data.get('subreddit')
+        self.created = data.get('created', data.get('created_utc'))
+        self.score = data.get('score')
+        self.over_18 = data.get('over_18', False)
+        self.domain = data.get('domain')
+        self.media = data.get('media')
+        self.title = data.get('title')
+        self.is_video = data.get('is_video', False)
+        self.crosspost_parent = data.get('crosspost_parent')
+        self.stickied = data.get('stickied', False)
+        self.pinned = data.get('pinned', False)
+        self.link_flair_text = data.get('link_flair_text')
+        self.height = get_media_height(data.get('preview'), self.media)
+
+
+def get_listing_records(reddit, path, limit, params=None):
+    """
+    Requests the listing at the supplied path as raw json and parses each submission in it into a SubmissionRecord.
+    Pages are requested as the generator is read, in the same way as a praw listing generator.
+    :param reddit: The praw instance to make the requests with.
+    :param path: The api path of the listing, such as '/r/pics/new'.
+    :param limit: The maximum number of submissions to return.
+    :param params: Any extra query parameters of the listing, such as the time filter.
+    :return: A generator that yields a SubmissionRecord for each submission in the listing.
+    """
+    params = dict(params or {}, raw_json=1)
+    count = 0
+    while count < limit:
+        params['limit'] = min(LISTING_PAGE_SIZE, limit - count)
+        data = reddit.request(method='GET', path=path, params=params)['data']
+        for child in data['children']:
+            if child.get('kind') == 't3':
+                count += 1
+                yield SubmissionRecord(child['data'])
+                if count >= limit:
+                    return
+        params['after'] = data.get('after')
+        if params['after'] is None:
+            return
+
+
+def get_post_value(post, attribute, default=None):
+    """
+    Returns the value of the supplied attribute of a post without causing a lazy praw submission to be fetched when the
+    attribute is missing.  Praw submissions are checked through their instance dict and slotted records directly.
+    """
+    try:
+        return vars(post).get(attribute, default)
+    except TypeError:
+        return getattr(post, attribute, default)
+
+
+def get_post_height(post):
+    """Returns the height in pixels of the supplied posts image or video, or None if it is not known."""
+    if isinstance(post, SubmissionRecord):
+        return post.height
+    return get_media_height(get_post_value(post, 'preview'), get_post_value(post, 'media'))
+
+
+def get_media_height(preview, media):
+    """
+    Returns the height of the source image in a posts preview data, or the height of a reddit hosted video, or None if
+    neither is present.
+    """
+    try:
+        return preview['images'][0]['source']['height']
+    except (KeyError, IndexError, TypeError):
+        pass
+    try:
+        return media['reddit_video']['height']
+    except (KeyError, TypeError):
+        return None
+
+
+def get_subreddit_name(post):
+    """Returns the name of the subreddit the supplied post was made in for both praw submissions and records."""
+    subreddit = post.subreddit
+    return subreddit if isinstance(subreddit, str) else subreddit.display_name
+
+
 def convert_praw_post(praw_post):
     """
-    A utility function that converts a praw submission object into a Post object which can be marshaled.  The method
-    first checks to make sure that the supplied post is an instance of a praw submission object.
+    A utility function that converts a praw submission object or a submission record into a Post object which can be
+    marshaled.  The method first checks to make sure that the supplied post is an instance of a praw submission object
+    or a submission record.
     """
     if isinstance(praw_post, praw.models.reddit.submission.Submission):
         return Post(praw_post.url, praw_post.author.name, praw_post.title, praw_post.subreddit.display_name,
                     praw_post.created, domain=praw_post.domain)
+    elif isinstance(praw_post, SubmissionRecord):
+        return Post(praw_post.url, praw_post.author, praw_post.title, praw_post.subreddit, praw_post.created,
+                    domain=praw_post.domain)
     else:
         return praw_post
 
 
+class CrosspostParent:
+
+    """A minimal record of the parent of a crossposted post holding only what is needed to extract its media."""
+
+    __slots__ = ('url', 'is_video', 'media')
+
+    def __init__(self, url, is_video, media):
+        self.url = url
+        self.is_video = is_video
+        self.media = media
+
+
+def get_crosspost_parent_name(post):
+    """
+    Returns the fullname of the supplied posts crosspost parent, or None if the post is not a crosspost.
+    """
+    return get_post_value(post, 'crosspost_parent')
+
+
+def resolve_crosspost_parents(posts, reddit=None):
+    """
+    Finds the crossposted reddit videos in the supplied posts and requests the parent posts that are not already cached
+    in batches of up to 100 through reddit's info endpoint.  The parents media information is stored in the crosspost
+    parent cache to be used by the RedditVideoExtractor.
+    :param posts: A list of posts from a listing.
+    :param reddit: The praw instance to use for the requests.  The global instance is used if none is supplied.
+    """
+    fullnames = []
+    for post in posts:
+        name = get_crosspost_parent_name(post)
+        if name is not None and name not in crosspost_parent_cache and name not in fullnames and \
+                'v.redd.it' in post.url.lower():
+            fullnames.append(name)
+    if len(fullnames) > 0:
+        reddit = reddit if reddit is not None else get_reddit_instance()
+        for index in range(0, len(fullnames), INFO_BATCH_SIZE):
+            for parent in reddit.info(fullnames[index:index + INFO_BATCH_SIZE]):
+                crosspost_parent_cache[parent.fullname] = CrosspostParent(parent.url, parent.is_video, parent.media)
+
+
+def get_crosspost_parent(fullname):
+    """
+    Returns the cached parent record for the supplied fullname.  If the parent has not been cached it is requested
+    individually.
+    :param fullname: The fullname of the crosspost parent.
+    :return: The CrosspostParent for the supplied fullname or None if the parent could not be found.
+    :rtype: CrosspostParent
+    """
+    if fullname not in crosspost_parent_cache:
+        for parent in get_reddit_instance().info([fullname]):
+            crosspost_parent_cache[parent.fullname] = CrosspostParent(parent.url, parent.is_video, parent.media)
+    return crosspost_parent_cache.get(fullname)
+
+
+def batch_validate(object_type, names, fullnames=None, reddit=None):
+    """
+    Validates the supplied names up to 100 at a time and yields the result for each name as each batch is completed.
+    Subreddits are checked through reddit's info endpoint.  Users whose fullname is already known are checked through
+    the bulk user data endpoint.  Any name that is not confirmed by a batch request is checked individually so that a
+    name is never reported as invalid only because it was missing from a batch response.
+    :param object_type: The type of reddit object (USER or SUBREDDIT) that the supplied names are.
+    :param names: A list of names that are to be validated.
+    :param fullnames: An optional dict of user names to the fullname the user had when last validated.
+    :param reddit: The praw instance to use for the requests.  The global instance is used if none is supplied.
+    :return: A generator that yields a tuple of each name and its fullname, or None in place of the fullname if the
+             name is not valid.
+    """
+    reddit = reddit if reddit is not None else get_reddit_instance()
+    for index in range(0, len(names), INFO_BATCH_SIZE):
+        batch = names[index:index + INFO_BATCH_SIZE]
+        if object_type == 'USER':
+            found = get_user_fullnames(batch, fullnames if fullnames is not None else {}, reddit)
+        else:
+            found = get_subreddit_fullnames(batch, reddit)
+        for name in batch:
+            fullname = found.get(name.lower())
+            if fullname is None:
+                praw_object = reddit.redditor(name) if object_type == 'USER' else reddit.subreddit(name)
+                fullname = get_fullname(praw_object)
+            yield name, fullname
+
+
+def get_subreddit_fullnames(names, reddit):
+    """
+    Requests the supplied subreddit names from reddit's info endpoint in a single request.
+    :return: A dict of the lower case name of each subreddit that was found to its fullname.
+    """
+    listing = reddit.get('/api/info', params={'sr_name': ','.join(names)})
+    return {sub.display_name.lower(): sub.fullname for sub in listing}
+
+
+def get_user_fullnames(names, fullnames, reddit):
+    """
+    Requests the users with known fullnames from reddit's bulk user data endpoint in a single request.
+    :return: A dict of the lower case name of each user that was found to their fullname.
+    """
+    ids = [fullnames[name] for name in names if fullnames.get(name) is not None]
+    if len(ids) < 1:
+        return {}
+    data = reddit.request(method='GET', path='/api/user_data_by_account_ids', params={'ids': ','.join(ids)})
+    return {value['name'].lower(): key for key, value in data.items() if 'name' in value}
+
+
+def get_fullname(praw_object):
+    """
+    Returns the fullname of the supplied praw redditor or subreddit, or None if the object does not exist.
+    """
+    try:
+        return praw_object.fullname
+    except (prawcore.exceptions.NotFound, prawcore.exceptions.Redirect, AttributeError):
+        return None
+
+
 class NameChecker(QObject):
 
     """
@@ -81,15 +464,30 @@ class NameChecker(QObject):
 
     def run(self):
         """
-        Continuously checks the queue for a new name then calls the check name method when one is extracted from the
-        queue.  Responsible for emitting the finished signal when the class is done and is to be destroyed.
+        Continuously checks the queue for a new name then calls the check names method with the name and any other
+        names that are waiting in the queue, up to 100 names at a time.  Responsible for emitting the finished signal
+        when the class is done and is to be destroyed.
         """
         while self.continue_run:
             name = self.queue.get()
             if name is not None:
-                self.check_name(name)
+                self.check_names(self.get_waiting_names(name))
         self.finished.emit()
 
+    def get_waiting_names(self, name):
+        """
+        Returns a list containing the supplied name and the names that are currently waiting in the queue.  If the
+        stop signal is found in the queue it is put back so that the run loop will end after the names are checked.
+        """
+        names = [name]
+        while len(names) < INFO_BATCH_SIZE and not self.queue.empty():
+            next_name = self.queue.get()
+            if next_name is None:
+                self.queue.put(None)
+                break
+            names.append(next_name)
+        return names
+
     def stop_run(self):
         """
         Switches off the run cycle.  None is added to the queue because the run method will block until it receives
@@ -99,27 +497,37 @@ class NameChecker(QObject):
         self.queue.put(None)
 
     def check_name(self, name):
-        if self.object_type == 'USER':
-            self.check_user_name(name)
-        else:
-            self.check_subreddit_name(name)
+        self.check_names([name])
 
-    def check_user_name(self, name):
-        user = self.r.redditor(name)
+    def check_names(self, names):
+        """
+        Validates the supplied names in a batch and emits the result for each name as it is received.  If the batch
+        fails, the names that do not yet have a result are checked one at a time so that the failure of one name does
+        not prevent the rest from being validated.
+        :param names: A list of user or subreddit names to be checked.
+        :type names: list
+        """
+        checked_count = 0
         try:
-            test = user.fullname
-            self.name_validation.emit((name, True))
-        except (prawcore.exceptions.NotFound, prawcore.exceptions.Redirect, AttributeError):
-            self.name_validation.emit((name, False))
+            for name, fullname in batch_validate(self.object_type, names, reddit=self.r):
+                self.name_validation.emit((name, fullname is not None))
+                checked_count += 1
         except:
-            self.logger.error('Unable to validate user name', extra={'user_name': name}, exc_info=True)
+            self.logger.warning('Unable to validate names in a batch, checking names individually',
+                                extra={'object_type': self.object_type, 'names': names}, exc_info=True)
+            for name in names[checked_count:]:
+                self.check_single_name(name)
 
-    def check_subreddit_name(self, name):
-        sub = self.r.subreddit(name)
+    def check_single_name(self, name):
+        """
+        Validates a single name without a batch request and emits the result.  A name that cannot be checked is logged
+        and no result is emitted for it.
+        :param name: The user or subreddit name to be checked.
+        :type name: str
+        """
         try:
-            test = sub.fullname
-            self.name_validation.emit((name, True))
-        except (prawcore.exceptions.NotFound, prawcore.exceptions.Redirect, AttributeError):
-            self.name_validation.emit((name, False))
+            praw_object = self.r.redditor(name) if self.object_type == 'USER' else self.r.subreddit(name)
+            self.name_validation.emit((name, get_fullname(praw_object) is not None))
         except:
-            self.logger.error('Unable to validate subreddit name', extra={'subreddit_name': name}, exc_info=True)
+            self.logger.error('Unable to validate name', extra={'object_type': self.object_type, 'name': name},
+                              exc_info=True)
@@ -24,16 +24,16 @@ along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
 
 
 import subprocess
+import shutil
 import os
 import logging
-from distutils.spawn import find_executable
 
 from ..Utils import Injector
 
 
 logger = logging.getLogger(__name__)
 
-ffmpeg_valid = find_executable('ffmpeg') is not None
+ffmpeg_valid = shutil.which('ffmpeg') is not None
 
 
 # A list of MergeSet's containing the path of the video and audio files that are to be merged.
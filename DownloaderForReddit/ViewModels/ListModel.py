@@ -155,8 +155,9 @@ class ListModel(QAbstractListModel):
             'download_images': 'Download Images: %s' % reddit_object.download_images,
             'avoid_duplicates': 'Avoid Duplicates: %s' % reddit_object.avoid_duplicates,
             'nsfw_filter': 'NSFW Filter: %s' % self.nsfw_filter_display(reddit_object.nsfw_filter),
-            'saved_content_count': 'Saved Content Count: %s' % len(reddit_object.saved_content),
-            'saved_submission_count': 'Saved Submission Count: %s' % len(reddit_object.saved_submissions),
+            'saved_content_count': 'Saved Content Count: %s' % reddit_object.get_field_length('saved_content'),
+            'saved_submission_count': 'Saved Submission Count: %s' %
+                                      reddit_object.get_field_length('saved_submissions'),
             'total_download_count': 'Total Downloads: %s' % reddit_object.number_of_downloads,
             'added_on_date': 'Date Added: %s' % self.format_date(reddit_object.user_added)
         }
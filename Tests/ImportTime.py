@@ -0,0 +1,50 @@
+"""
+Measures the import time of a module by running it in a new interpreter with `-X importtime`.  Run as a script to
+print the slowest imports of a module:
+
+    python -m Tests.ImportTime DownloaderForReddit.GUI.DownloaderForRedditGUI
+"""
+
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output):
+    """
+    Parses the `-X importtime` output of an interpreter into a dict of module names mapped to a tuple of the self and
+    cumulative import time of the module in microseconds.
+    """
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        times[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return times
+
+
+def measure(module):
+    """Imports the supplied module in a new interpreter and returns the parsed import times of every module loaded."""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import %s' % module], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if result.returncode != 0:
+        raise ImportError('Failed to import %s:\n%s' % (module, result.stderr))
+    return parse_importtime(result.stderr)
+
+
+def main(module, count=20):
+    times = measure(module)
+    print('%s: %.1f ms' % (module, times[module][1] / 1000))
+    for name, (self_time, cumulative) in sorted(times.items(), key=lambda x: x[1][1], reverse=True)[:count]:
+        print('%10.1f ms %10.1f ms  %s' % (cumulative / 1000, self_time / 1000, name))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'DownloaderForReddit.GUI.DownloaderForRedditGUI')
@@ -5,13 +5,35 @@ class MockSettingsManager:
     def __init__(self):
         self.save_failed_extracts = True
         self.save_undownloaded_content = True
+        self.checkpoint_interval = 300
+        self.resume_journaled_downloads = True
         self.max_download_thread_count = 4
+        self.max_listing_fetch_thread_count = 1
+        self.reddit_client_ids = []
 
         self.restrict_by_score = False
         self.score_limit_operator = 'GREATER'
         self.post_score_limit = 3000
 
         self.post_limit = 25
+        self.subreddit_sort_method = 'HOT'
+        self.subreddit_sort_top_method = 'DAY'
+        self.incremental_listing_fetch = True
+        self.raw_listing_ingestion = False
+        self.seen_post_retention_days = 30
+        self.adaptive_polling = False
+        self.min_poll_interval_hours = 1
+        self.max_poll_interval_hours = 168
+        self.skip_validation_request = False
+        self.combine_subreddit_listings = False
+        self.allow_constrained_search = True
+        self.validation_cache_ttl = 86400
+
+        self.domain_whitelist = []
+        self.domain_blacklist = []
+        self.title_filter_regex = ''
+        self.flair_filter = []
+        self.min_post_resolution = 0
 
         self.restrict_by_date = False
         self.restrict_by_custom_date = False
@@ -20,4 +42,9 @@ class MockSettingsManager:
         self.download_images = True
         self.download_videos = True
         self.avoid_duplicates = True
+        self.link_global_duplicates = True
+
+        self.download_reddit_hosted_videos = True
+        self.reddit_video_max_resolution = 0
+        self.reddit_video_max_bitrate = 0
 
@@ -0,0 +1,53 @@
+import unittest
+import pickle
+
+from DownloaderForReddit.Core import DownloadHistory as history_module
+from DownloaderForReddit.Core.DownloadHistory import DownloadHistory
+
+
+class TestDownloadHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.urls = ['https://i.imgur.com/%s.jpg' % x for x in range(1500)]
+        self.history = DownloadHistory(self.urls)
+
+    def test_membership(self):
+        self.assertTrue('https://i.imgur.com/0.jpg' in self.history)
+        self.assertTrue('https://i.imgur.com/1499.jpg' in self.history)
+        self.assertFalse('https://i.imgur.com/1500.jpg' in self.history)
+
+    def test_list_behaviour(self):
+        self.assertEqual(1500, len(self.history))
+        self.assertEqual(self.urls, list(self.history))
+        self.assertEqual('https://i.imgur.com/700.jpg', self.history[700])
+        self.assertEqual('https://i.imgur.com/1499.jpg', self.history[-1])
+        with self.assertRaises(IndexError):
+            self.history[1500]
+
+    def test_append(self):
+        self.history.append('https://v.redd.it/abc')
+        self.assertTrue('https://v.redd.it/abc' in self.history)
+        self.assertEqual('https://v.redd.it/abc', self.history[-1])
+
+    def test_delete_from_compressed_chunk(self):
+        del self.history[10]
+        self.assertEqual(1499, len(self.history))
+        self.assertFalse('https://i.imgur.com/10.jpg' in self.history)
+        self.assertTrue('https://i.imgur.com/11.jpg' in self.history)
+        self.assertEqual('https://i.imgur.com/11.jpg', self.history[10])
+
+    def test_delete_from_tail(self):
+        del self.history[-1]
+        self.assertFalse('https://i.imgur.com/1499.jpg' in self.history)
+        self.assertEqual('https://i.imgur.com/1498.jpg', self.history[-1])
+
+    def test_recent_hashes_are_merged(self):
+        self.assertLess(len(self.history.recent_hashes), history_module.MERGE_SIZE)
+        self.assertTrue(len(self.history.hashes) > 0)
+
+    def test_pickle_round_trip(self):
+        restored = pickle.loads(pickle.dumps(self.history))
+        self.assertEqual(self.urls, list(restored))
+        self.assertTrue('https://i.imgur.com/1499.jpg' in restored)
+        restored.append('https://v.redd.it/abc')
+        self.assertTrue('https://v.redd.it/abc' in restored)
@@ -0,0 +1,259 @@
+import unittest
+import logging
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+import prawcore
+
+from DownloaderForReddit.Core.DownloadRunner import DownloadRunner, ExtractionRunner, LISTING_REMEASURE_INTERVAL
+from DownloaderForReddit.Core.RedditObjects import Subreddit
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+from Tests.MockObjects.MockObjects import MockPrawPost
+
+
+class TestDownloadRunner(unittest.TestCase):
+
+    logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+        self.reddit = MagicMock()
+        with patch('DownloaderForReddit.Utils.RedditUtils.get_reddit_instance', return_value=self.reddit), \
+                patch.object(DownloadRunner, 'start_extractor'), patch.object(DownloadRunner, 'start_downloader'):
+            self.user = MockObjects.get_blank_user()
+            self.runner = DownloadRunner([self.user], None, Queue(), None)
+        self.runner.remove_invalid_object = MagicMock()
+        self.user.check_save_directory = MagicMock()
+
+    def test_skip_validation_request_uses_listing_to_validate(self):
+        Injector.settings_manager.skip_validation_request = True
+        self.reddit.redditor.return_value.submissions.new.return_value = iter([])
+        self.runner.validate_users()
+        self.reddit.get.assert_not_called()
+        self.reddit.request.assert_not_called()
+        self.assertIs(self.user, self.runner.validated_objects.get())
+        self.assertIsNone(self.runner.validated_objects.get())
+
+    def test_skip_validation_request_listing_not_found_is_invalid(self):
+        Injector.settings_manager.skip_validation_request = True
+        self.reddit.redditor.return_value.submissions.new.side_effect = \
+            prawcore.exceptions.NotFound(MagicMock(status_code=404))
+        self.runner.validate_users()
+        self.runner.remove_invalid_object.emit.assert_called_once_with(self.user)
+        self.assertIsNone(self.runner.validated_objects.get())
+
+    def test_cached_validation_status_skips_validation(self):
+        self.user.set_validation_status('VALID')
+        self.reddit.redditor.return_value.submissions.new.return_value = iter([])
+        self.runner.validate_users()
+        self.assertEqual(1, self.runner.validation_cache_hits)
+        self.assertEqual(0, self.runner.validation_cache_misses)
+        self.assertIs(self.user, self.runner.validated_objects.get())
+
+    def test_expired_validation_status_is_validated(self):
+        self.user.set_validation_status('NOT_FOUND')
+        self.user.validation_time -= Injector.settings_manager.validation_cache_ttl + 1
+        self.reddit.redditor.return_value = MagicMock(fullname='t2_user')
+        self.reddit.redditor.return_value.submissions.new.return_value = iter([])
+        self.runner.validate_users()
+        self.assertEqual(0, self.runner.validation_cache_hits)
+        self.assertEqual(1, self.runner.validation_cache_misses)
+        self.assertEqual('VALID', self.user.validation_status)
+        self.assertEqual('t2_user', self.user.fullname)
+        self.assertIs(self.user, self.runner.validated_objects.get())
+
+    @patch('DownloaderForReddit.Utils.RedditUtils.INFO_BATCH_SIZE', 1)
+    @patch('DownloaderForReddit.Utils.RedditUtils.batch_validate')
+    def test_validation_instance_checked_in_after_each_batch(self, validate_mock):
+        validate_mock.side_effect = lambda object_type, names, fullnames, reddit: [(x, 't2_' + x) for x in names]
+        users = [MockObjects.get_blank_user() for _ in range(2)]
+        users[1].name = 'OtherUser'
+        self.runner.client_pool = MagicMock()
+        validated = self.runner.validate_reddit_objects(users)
+        self.assertIs(users[0], next(validated))
+        self.runner.client_pool.checkin.assert_called_once_with(self.runner.client_pool.checkout.return_value)
+        self.assertIs(users[1], next(validated))
+        self.assertEqual(2, self.runner.client_pool.checkin.call_count)
+
+    def test_listings_fetched_by_worker_instances(self):
+        Injector.settings_manager.skip_validation_request = True
+        Injector.settings_manager.max_listing_fetch_thread_count = 3
+        users = [MockObjects.get_blank_user() for _ in range(10)]
+        for user in users:
+            user.check_save_directory = MagicMock()
+        self.runner.user_list = users
+        instances = []
+
+        def make_instance(client_id):
+            reddit = MagicMock()
+            reddit.redditor.return_value.submissions.new.side_effect = lambda limit: iter([])
+            instances.append(reddit)
+            return reddit
+
+        with patch('DownloaderForReddit.Utils.RedditUtils.make_reddit_instance', side_effect=make_instance):
+            self.runner.validate_users()
+        fetched = [self.runner.validated_objects.get() for _ in range(len(users) + 1)]
+        self.assertIsNone(fetched[-1])
+        self.assertCountEqual([id(x) for x in users], [id(x) for x in fetched[:-1]])
+        self.assertEqual(3, len(instances))
+        self.assertEqual(10, sum(x.redditor.call_count for x in instances))
+        self.reddit.redditor.assert_not_called()
+
+    def test_combined_listing_demultiplexed_to_subreddits(self):
+        Injector.settings_manager.combine_subreddit_listings = True
+        Injector.settings_manager.skip_validation_request = True
+        Injector.settings_manager.subreddit_sort_method = 'NEW'
+        Injector.settings_manager.subreddit_sort_top_method = 'DAY'
+        first, second = [Subreddit('v0.0.0', name, 'downloads/', 2, True, True, True, 'INCLUDE', 'Subreddit Name',
+                                   'Image/Album Id', 86400) for name in ('SomeSub', 'OtherSub')]
+        for sub in (first, second):
+            sub.check_save_directory = MagicMock()
+        self.runner.user_run = False
+        self.runner.subreddit_list = [first, second]
+
+        def post(sub_name, title):
+            return MockPrawPost(title=title, subreddit=MagicMock(display_name=sub_name), created=1500000000,
+                                score=1, over_18=False)
+
+        posts = [post('somesub', 1), post('OtherSub', 2), post('SomeSub', 3), post('SomeSub', 4), post('OtherSub', 5),
+                 post('OtherSub', 6)]
+        self.reddit.subreddit.return_value.new.return_value = iter(posts)
+        self.runner.validate_subreddits()
+        self.reddit.subreddit.assert_called_once_with('SomeSub+OtherSub')
+        self.assertIs(first, self.runner.validated_objects.get())
+        self.assertIs(second, self.runner.validated_objects.get())
+        self.assertIsNone(self.runner.validated_objects.get())
+        self.assertEqual([1, 3], [x.title for x in first.new_submissions])
+        self.assertEqual([2, 5], [x.title for x in second.new_submissions])
+
+    def make_combined_subreddits(self, post_limit):
+        Injector.settings_manager.combine_subreddit_listings = True
+        Injector.settings_manager.skip_validation_request = True
+        Injector.settings_manager.subreddit_sort_top_method = 'DAY'
+        subs = [Subreddit('v0.0.0', name, 'downloads/', post_limit, True, True, True, 'INCLUDE', 'Subreddit Name',
+                          'Image/Album Id', 86400) for name in ('BusySub', 'QuietSub')]
+        for sub in subs:
+            sub.check_save_directory = MagicMock()
+        self.runner.user_run = False
+        self.runner.subreddit_list = subs
+        return subs
+
+    def make_post(self, sub_name, title):
+        post = MockPrawPost(title=title, subreddit=MagicMock(display_name=sub_name), created=1500000000, score=1,
+                            over_18=False)
+        post.id = title
+        return post
+
+    def test_exhausted_combined_listing_finished_individually(self):
+        Injector.settings_manager.subreddit_sort_method = 'NEW'
+        busy, quiet = self.make_combined_subreddits(3)
+        combined = [self.make_post('BusySub', 'b1'), self.make_post('QuietSub', 'q1'), self.make_post('BusySub', 'b2')]
+        individual = [self.make_post('QuietSub', x) for x in ('q1', 'q2', 'q3', 'q4')]
+        listings = {'BusySub+QuietSub': combined, 'QuietSub': individual, 'BusySub': combined[0::2]}
+        self.reddit.subreddit.side_effect = lambda name: MagicMock(
+            **{'new.side_effect': lambda limit: iter(listings[name][:limit])})
+        self.runner.validate_subreddits()
+        self.assertEqual(['b1', 'b2'], [x.title for x in busy.new_submissions])
+        self.assertEqual(['q1', 'q2', 'q3'], [x.title for x in quiet.new_submissions])
+        names = [x[0][0] for x in self.reddit.subreddit.call_args_list]
+        self.assertEqual('BusySub+QuietSub', names[0])
+        self.assertCountEqual(['QuietSub', 'BusySub'], names[1:])
+
+    def test_combined_listing_not_used_for_hot_listing(self):
+        Injector.settings_manager.subreddit_sort_method = 'HOT'
+        busy, quiet = self.make_combined_subreddits(3)
+        self.reddit.subreddit.side_effect = lambda name: MagicMock(**{'hot.return_value': iter([])})
+        self.runner.validate_subreddits()
+        self.assertCountEqual(['BusySub', 'QuietSub'], [x[0][0] for x in self.reddit.subreddit.call_args_list])
+
+    def test_constrained_run_records_listing_cost(self):
+        self.runner.validated_subreddits = ['SomeSub']
+        posts = [MockPrawPost(subreddit=MagicMock(display_name=name), created=1500000000, score=1, over_18=False)
+                 for name in ('SomeSub', 'Elsewhere', 'Elsewhere', 'Elsewhere')]
+        redditor = MagicMock()
+        redditor.submissions.new.return_value = iter(posts)
+        pages = list(self.runner.get_user_submissions_from_subreddits(redditor, self.user))
+        self.assertEqual(1, sum(len(x) for x in pages))
+        self.assertEqual(4, self.user.listing_scan_average)
+        self.assertEqual(1, self.user.listing_match_average)
+
+    def test_subreddit_search_used_when_cheaper(self):
+        self.runner.validated_subreddits = ['SomeSub', 'OtherSub']
+        self.user.record_listing_cost(1000, 3)
+        self.assertTrue(self.runner.use_subreddit_search(self.user))
+        self.reddit.subreddit.return_value.search.return_value = iter([])
+        list(self.runner.get_user_submissions_from_subreddits(MagicMock(), self.user))
+        self.reddit.subreddit.assert_called_once_with('SomeSub+OtherSub')
+        self.reddit.subreddit.return_value.search.assert_called_once_with('author:"JohnEveryman"', sort='new',
+                                                                          limit=self.user.post_limit)
+
+    def test_user_listing_re_measured_after_repeated_searches(self):
+        Injector.settings_manager.allow_constrained_search = True
+        self.runner.validated_subreddits = ['SomeSub', 'OtherSub']
+        self.user.record_listing_cost(1000, 3)
+        for _ in range(LISTING_REMEASURE_INTERVAL):
+            self.assertTrue(self.runner.use_subreddit_search(self.user))
+            self.user.record_listing_cost(None, 3)
+        self.assertFalse(self.runner.use_subreddit_search(self.user))
+        self.user.record_listing_cost(1000, 3)
+        self.assertTrue(self.runner.use_subreddit_search(self.user))
+
+    def test_user_listing_used_without_history_or_when_cheaper(self):
+        self.runner.validated_subreddits = ['SomeSub']
+        self.assertFalse(self.runner.use_subreddit_search(self.user))
+        self.user.record_listing_cost(80, 20)
+        self.assertFalse(self.runner.use_subreddit_search(self.user))
+
+    def test_poll_records_listed_posts_newer_than_date_limit(self):
+        self.runner.use_scheduler = True
+        self.user.date_limit = 100
+        self.user.nsfw_filter = 'EXCLUDE'
+        posts = [MockPrawPost(created=created, over_18=True) for created in (300, 200, 50)]
+        self.assertEqual([[]], list(self.runner.filter_submissions(posts, self.user, True, post_limit=10)))
+        self.runner.record_poll(self.user)
+        self.assertEqual(2, self.user.last_post_count)
+
+    def test_seen_posts_dropped_from_non_chronological_listing(self):
+        posts = [MockPrawPost(title=x, created=1500000000, score=1, over_18=False) for x in range(3)]
+        for post, post_id in zip(posts, ('a1', 'a2', 'a3')):
+            post.id = post_id
+        self.user.mark_post_seen(posts[1])
+        pages = list(self.runner.filter_submissions(iter(posts), self.user, False))
+        self.assertEqual([0, 2], [x.title for page in pages for x in page])
+        pages = list(self.runner.filter_submissions(iter(posts), self.user, True))
+        self.assertEqual([0, 1, 2], [x.title for page in pages for x in page])
+
+    def test_seen_posts_pruned_by_age(self):
+        post = MockPrawPost()
+        self.user.mark_post_seen(post)
+        self.user.prune_seen_posts(60)
+        self.assertTrue(self.user.check_post_seen(post))
+        self.user.seen_posts[int(post.id, 36)] -= 120
+        self.user.prune_seen_posts(60)
+        self.assertFalse(self.user.check_post_seen(post))
+
+    @patch('DownloaderForReddit.Extractors.Extractor.Extractor.extract', return_value=True)
+    @patch('DownloaderForReddit.Utils.Injector.get_download_journal')
+    def test_extraction_run_ends_download_queue(self, journal_mock, extract_mock):
+        post = MockPrawPost()
+        self.user.new_submissions = [post]
+        self.runner.validated_objects.put(self.user)
+        self.runner.validated_objects.put(None)
+        extraction_runner = ExtractionRunner(self.runner.queue, self.runner.validated_objects,
+                                             self.runner.queued_posts, True, True)
+        extraction_runner.run_extraction()
+        extract_mock.assert_called_once_with(post)
+        self.assertTrue(self.user.check_post_seen(post))
+        self.assertIsNone(self.runner.queued_posts.get_nowait())
+
+    @patch('DownloaderForReddit.Core.DownloadRunner.QThread')
+    @patch('DownloaderForReddit.Core.DownloadRunner.ExtractionRunner')
+    def test_extractor_records_seen_posts_of_non_chronological_listings(self, extraction_runner, thread):
+        self.runner.start_extractor()
+        self.assertFalse(extraction_runner.call_args[0][4])
+        self.runner.user_run = False
+        self.runner.single_subreddit_run_method = ('TOP', 'ALL')
+        self.runner.start_extractor()
+        self.assertTrue(extraction_runner.call_args[0][4])
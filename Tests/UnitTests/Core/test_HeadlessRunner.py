@@ -0,0 +1,101 @@
+import unittest
+import logging
+import io
+import json
+import os
+import tempfile
+from queue import Queue
+from unittest.mock import MagicMock, patch
+
+from DownloaderForReddit.Core.HeadlessRunner import HeadlessDownloadRunner, HeadlessDownloader, ProgressReporter
+from DownloaderForReddit.Persistence.DownloadJournal import DownloadJournal
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+
+
+class TestHeadlessRunner(unittest.TestCase):
+
+    logging.disable(logging.CRITICAL)
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+
+    def make_content(self, downloaded):
+        content = MagicMock()
+        content.run.side_effect = lambda: downloaded.append(content)
+        return content
+
+    def test_downloader_runs_queued_content(self):
+        downloaded = []
+        queue = Queue()
+        content_list = [self.make_content(downloaded) for _ in range(5)]
+        for content in content_list:
+            queue.put(content)
+        queue.put(None)
+        downloader = HeadlessDownloader(queue, 2)
+        downloader.download()
+        self.assertEqual(5, downloader.download_count)
+        self.assertCountEqual(content_list, downloaded)
+
+    @patch('DownloaderForReddit.Core.DownloadRunner.VideoMerger')
+    @patch('DownloaderForReddit.Utils.RedditUtils.get_reddit_instance')
+    def test_unfinished_downloads_run_to_completion(self, reddit_mock, merger_mock):
+        Injector.dedupe_index = MagicMock()
+        downloaded = []
+        content_list = [self.make_content(downloaded) for _ in range(3)]
+        runner = HeadlessDownloadRunner(None, None, Queue(), content_list)
+        runner.run_download('UNFINISHED')
+        self.assertCountEqual(content_list, downloaded)
+        self.assertEqual(3, runner.final_download_count)
+        self.assertFalse(runner.extraction_thread.is_alive())
+        self.assertFalse(runner.interrupted)
+        Injector.dedupe_index.close.assert_called_once()
+        Injector.dedupe_index = None
+
+    @patch('DownloaderForReddit.Core.DownloadRunner.VideoMerger')
+    @patch('DownloaderForReddit.Utils.RedditUtils.get_reddit_instance')
+    def test_interrupted_run_leaves_content_in_journal(self, reddit_mock, merger_mock):
+        Injector.dedupe_index = MagicMock()
+        directory = tempfile.TemporaryDirectory()
+        journal = DownloadJournal(os.path.join(directory.name, 'download_journal.db'))
+        user = MockObjects.get_blank_user()
+        content = MockObjects.create_content(user, 2, None)
+        user.content.append(content)
+        journal.enqueue([content])
+        runner = HeadlessDownloadRunner([user], None, Queue(), [])
+        downloader_thread = runner.downloader_thread
+        runner.downloader_thread = MagicMock()
+        runner.downloader_thread.is_alive.return_value = True
+        runner.downloader_thread.join.side_effect = [KeyboardInterrupt, None]
+        runner.run_download('UNFINISHED')
+        downloader_thread.join()
+        self.assertTrue(runner.interrupted)
+        self.assertFalse(runner.extraction_thread.is_alive())
+        pending = journal.get_pending_content()
+        self.assertEqual([content.url], [x.url for x in pending])
+        self.assertEqual({}, user.saved_content)
+        self.assertEqual([], user.content)
+        journal.close()
+        directory.cleanup()
+        Injector.dedupe_index = None
+
+    def test_parse_message(self):
+        self.assertEqual(('downloaded', {'file': '/a/b.jpg'}), ProgressReporter.parse_message('Saved: /a/b.jpg'))
+        self.assertEqual(('queued', {'count': 4}), ProgressReporter.parse_message('Count 4'))
+        self.assertEqual(('valid', {'name': 'SomeSub'}), ProgressReporter.parse_message('SomeSub is valid'))
+        self.assertEqual(('invalid', {'name': 'Nobody'}), ProgressReporter.parse_message('Nobody does not exist'))
+        self.assertEqual('failed', ProgressReporter.parse_message('Failed Download: File abc')[0])
+
+    def test_reporter_writes_json_lines_with_totals(self):
+        queue = Queue()
+        stream = io.StringIO()
+        reporter = ProgressReporter(queue, stream)
+        reporter.start()
+        for message in ('Count 2', 'Saved: /a/1.jpg', 'Failed to save content: /a/2.jpg'):
+            queue.put(message)
+        reporter.stop()
+        lines = [json.loads(x) for x in stream.getvalue().splitlines()]
+        self.assertEqual(['queued', 'downloaded', 'failed'], [x['event'] for x in lines])
+        self.assertEqual({'queued': 2, 'downloaded': 1, 'failed': 1, 'invalid': 0},
+                         {key: lines[-1][key] for key in reporter.totals})
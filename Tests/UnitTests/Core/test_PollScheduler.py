@@ -0,0 +1,56 @@
+import unittest
+
+from DownloaderForReddit.Core.PollScheduler import PollScheduler, MIN_POST_LIMIT
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+
+
+NOW = 1500000000
+HOUR = 3600
+
+
+class TestPollScheduler(unittest.TestCase):
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+        self.scheduler = PollScheduler()
+        self.user = MockObjects.get_blank_user()
+        self.user.post_limit = 100
+        self.user.user_added = None
+
+    def test_unscheduled_object_is_due(self):
+        self.assertTrue(self.scheduler.is_due(self.user, NOW))
+        self.assertEqual(100, self.scheduler.get_post_limit(self.user, NOW))
+
+    def test_busy_object_polled_at_min_interval(self):
+        self.user.last_checked = NOW - HOUR
+        self.scheduler.record_poll(self.user, 500, NOW)
+        self.assertEqual(NOW + HOUR, self.user.next_due)
+        self.assertFalse(self.scheduler.is_due(self.user, NOW + 60))
+        self.assertTrue(self.scheduler.is_due(self.user, NOW + HOUR))
+
+    def test_quiet_object_polled_less_often_with_bounded_limit(self):
+        self.user.last_checked = NOW - 24 * HOUR
+        self.scheduler.record_poll(self.user, 2, NOW)
+        self.assertEqual(NOW + 168 * HOUR, self.user.next_due)
+        self.assertEqual(MIN_POST_LIMIT, self.scheduler.get_post_limit(self.user, NOW + 24 * HOUR))
+        self.assertEqual(100, self.scheduler.get_post_limit(self.user, NOW + 10000 * HOUR))
+
+    def test_rate_learned_from_polls_only(self):
+        self.user.user_added = NOW - 24 * HOUR
+        self.user.previous_downloads.extend('https://i.imgur.com/%s.jpg' % x for x in range(1000))
+        self.user.last_checked = NOW - HOUR
+        self.assertEqual(100, self.scheduler.get_post_limit(self.user, NOW))
+        self.assertIsNone(self.scheduler.get_post_rate(self.user))
+
+    def test_limit_not_below_last_post_count(self):
+        self.user.last_checked = NOW - 24 * HOUR
+        self.scheduler.record_poll(self.user, 30, NOW)
+        self.user.post_rate = 0
+        self.assertEqual(30, self.scheduler.get_post_limit(self.user, NOW + HOUR))
+
+    def test_truncated_listing_not_bounded_next_poll(self):
+        self.user.last_checked = NOW - 24 * HOUR
+        self.scheduler.record_poll(self.user, MIN_POST_LIMIT, NOW, truncated=True)
+        self.assertEqual(100, self.scheduler.get_post_limit(self.user, NOW + HOUR))
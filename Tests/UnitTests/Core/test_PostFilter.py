@@ -1,5 +1,6 @@
 import unittest
 import logging
+from unittest.mock import MagicMock, call, patch
 
 from DownloaderForReddit.Core.PostFilter import PostFilter
 from DownloaderForReddit.Utils import Injector
@@ -86,3 +87,107 @@ class MyTestCase(unittest.TestCase):
         self.assertTrue(post_filter.date_filter(post, user))
         post = MockPrawPost(created=MOCK_DATE_LIMIT - 1000)
         self.assertFalse(post_filter.date_filter(post, user))
+
+    def test_reached_date_limit(self):
+        post_filter = PostFilter()
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        post = MockPrawPost(created=MOCK_DATE_LIMIT - 1000)
+        self.assertTrue(post_filter.reached_date_limit(post, user))
+        post = MockPrawPost(created=MOCK_DATE_LIMIT + 1000)
+        self.assertFalse(post_filter.reached_date_limit(post, user))
+
+    def test_reached_date_limit_ignores_pinned_posts(self):
+        post_filter = PostFilter()
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        post = MockPrawPost(created=MOCK_DATE_LIMIT - 1000)
+        post.stickied = True
+        self.assertFalse(post_filter.reached_date_limit(post, user))
+        post = MockPrawPost(created=MOCK_DATE_LIMIT - 1000)
+        post.pinned = True
+        self.assertFalse(post_filter.reached_date_limit(post, user))
+
+    def make_page(self):
+        posts = []
+        for domain, title, flair, height in (('i.imgur.com', 'A cat', 'Cats', 1080),
+                                             ('gfycat.com', 'A dog', 'Dogs', 480),
+                                             ('v.redd.it', 'Cat video', None, None)):
+            post = MockPrawPost(title=title, created=MOCK_DATE_LIMIT + 1000, score=10, over_18=False)
+            post.domain = domain
+            post.link_flair_text = flair
+            post.preview = {'images': [{'source': {'height': height}}]} if height is not None else None
+            posts.append(post)
+        return posts
+
+    def test_compiled_filter_evaluates_page(self):
+        settings = Injector.get_settings_manager()
+        settings.restrict_by_score = True
+        settings.post_score_limit = 5
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        self.assertEqual([True, True, True], PostFilter().compile(user).evaluate(self.make_page()))
+        settings.post_score_limit = 50
+        self.assertEqual([False, False, False], PostFilter().compile(user).evaluate(self.make_page()))
+
+    def test_compiled_filter_rules(self):
+        settings = Injector.get_settings_manager()
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        settings.domain_blacklist = ['imgur.com']
+        self.assertEqual([False, True, True], PostFilter().compile(user).evaluate(self.make_page()))
+        settings.domain_blacklist = []
+        settings.title_filter_regex = '^a '
+        self.assertEqual([True, True, False], PostFilter().compile(user).evaluate(self.make_page()))
+        settings.title_filter_regex = ''
+        settings.flair_filter = ['cats']
+        self.assertEqual([True, False, False], PostFilter().compile(user).evaluate(self.make_page()))
+        settings.flair_filter = []
+        settings.min_post_resolution = 720
+        self.assertEqual([True, False, True], PostFilter().compile(user).evaluate(self.make_page()))
+
+    def test_invalid_title_regex_skipped(self):
+        settings = Injector.get_settings_manager()
+        settings.title_filter_regex = '(unclosed'
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        self.assertEqual([True, True, True], PostFilter().compile(user).evaluate(self.make_page()))
+
+    def test_compiled_filter_binds_settings_and_skips_rejected_posts(self):
+        settings = Injector.get_settings_manager()
+        settings.restrict_by_score = True
+        settings.post_score_limit = 5
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        compiled = PostFilter().compile(user)
+        settings.post_score_limit = 50
+        user.date_limit = MOCK_DATE_LIMIT + 2000
+        page = self.make_page()
+        page[0].score = 1
+        last_rule = MagicMock(return_value=True)
+        compiled.rules.append(last_rule)
+        self.assertEqual([False, True, True], compiled.evaluate(page))
+        self.assertEqual([call(page[1]), call(page[2])], last_rule.call_args_list)
+        last_rule.reset_mock()
+        self.assertFalse(compiled.passes(page[0]))
+        last_rule.assert_not_called()
+        self.assertTrue(compiled.date_filter(page[0]))
+
+    def test_filter_post_compiles_once_per_reddit_object(self):
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        post_filter = PostFilter()
+        compiled = post_filter.compile(user)
+        with patch.object(post_filter, 'compile', return_value=compiled) as compile_mock:
+            for post in self.make_page():
+                self.assertTrue(post_filter.filter_post(post, user))
+            compile_mock.assert_called_once_with(user)
+
+    def test_reddit_object_rules_override_global_rules(self):
+        settings = Injector.get_settings_manager()
+        settings.domain_whitelist = ['gfycat.com']
+        user = MockObjects.get_blank_user()
+        user.date_limit = MOCK_DATE_LIMIT
+        self.assertEqual([False, True, False], PostFilter().compile(user).evaluate(self.make_page()))
+        user.filter_rules = {'domain_whitelist': []}
+        self.assertEqual([True, True, True], PostFilter().compile(user).evaluate(self.make_page()))
@@ -0,0 +1,38 @@
+import unittest
+import threading
+
+from DownloaderForReddit.Core.SubmissionStream import SubmissionStream
+
+
+class TestSubmissionStream(unittest.TestCase):
+
+    def test_read_pages_in_order(self):
+        stream = SubmissionStream([1, 2])
+        stream.put_page([])
+        stream.put_page([3])
+        stream.close()
+        self.assertEqual([1, 2, 3], list(stream))
+        self.assertEqual(3, len(stream))
+
+    def test_stream_stays_closed_after_read(self):
+        stream = SubmissionStream([1])
+        stream.close()
+        self.assertEqual([1], list(stream))
+        self.assertEqual([], list(stream))
+
+    def test_read_while_pages_are_added(self):
+        stream = SubmissionStream()
+        read = []
+
+        def reader():
+            for item in stream:
+                read.append(item)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for page in range(5):
+            stream.put_page([page * 10 + x for x in range(10)])
+        stream.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(list(range(50)), read)
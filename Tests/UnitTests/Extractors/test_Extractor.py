@@ -1,12 +1,15 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import logging
+import os
+import tempfile
 
 from DownloaderForReddit.Extractors.Extractor import Extractor
 from DownloaderForReddit.Extractors.ImgurExtractor import ImgurExtractor
 from DownloaderForReddit.Utils import Injector
 from DownloaderForReddit.Core import Const
 from DownloaderForReddit.Utils import ExtractorUtils
+from DownloaderForReddit.Persistence.DedupeIndex import DedupeIndex
 from Tests.MockObjects.MockSettingsManager import MockSettingsManager
 from Tests.MockObjects import MockObjects
 
@@ -89,6 +92,64 @@ class TestExtractor(unittest.TestCase):
         user.avoid_duplicates = False
         self.assertTrue(ex.filter_content(img_content))
 
+    def test_filter_content_global_duplicate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            Injector.dedupe_index = DedupeIndex(os.path.join(directory, 'dedupe_index'))
+            existing = os.path.join(directory, 'existing.jpg')
+            open(existing, 'w').close()
+            Injector.dedupe_index.add('https://i.imgur.com/shared.jpg', existing)
+            user = MockObjects.get_blank_user()
+            ex = Extractor(user)
+            content = MockObjects.create_content(user, None, None)
+            content.url = 'https://i.imgur.com/shared.jpg'
+
+            self.assertTrue(ex.filter_content(content))
+            self.assertIsNone(content.link_source)
+            user.use_global_dedupe = True
+            self.assertTrue(ex.filter_content(content))
+            self.assertEqual(existing, content.link_source)
+            Injector.settings_manager.link_global_duplicates = False
+            self.assertFalse(ex.filter_content(content))
+
+            other = MockObjects.create_content(user, None, None)
+            other.url = 'https://i.imgur.com/new.jpg'
+            self.assertTrue(ex.filter_content(other))
+            repeat = MockObjects.create_content(user, None, None)
+            repeat.url = 'https://i.imgur.com/new.jpg'
+            self.assertFalse(ex.filter_content(repeat))
+            Injector.dedupe_index.close()
+            Injector.dedupe_index = None
+
+    @patch('DownloaderForReddit.Extractors.Extractor.Extractor.extract')
+    def test_only_extracted_posts_recorded_as_seen(self, extract_mock):
+        extract_mock.side_effect = lambda post: post.id == 'ok'
+        posts = [MockObjects.MockPrawPost(), MockObjects.MockPrawPost()]
+        posts[0].id = 'ok'
+        posts[1].id = 'bad'
+        user = MockObjects.get_blank_user()
+        user.new_submissions = list(posts)
+        Extractor(user).run()
+        self.assertEqual({}, user.seen_posts)
+        Extractor(user, record_seen=True).run()
+        self.assertTrue(user.check_post_seen(posts[0]))
+        self.assertFalse(user.check_post_seen(posts[1]))
+
+    def test_failed_download_releases_dedupe_claim(self):
+        with tempfile.TemporaryDirectory() as directory:
+            index = DedupeIndex(os.path.join(directory, 'dedupe_index'))
+            user = MockObjects.get_blank_user()
+            content = MockObjects.create_content(user, None, None)
+            content.url = 'https://i.imgur.com/shared.jpg'
+            content.queue = MagicMock()
+            content.dedupe_index = index
+            content.check_save_path_subreddit = MagicMock()
+            self.assertIsNone(index.claim(content.url, content.filename))
+            with patch('DownloaderForReddit.Core.Content.requests.get', return_value=MagicMock(status_code=404)):
+                content.download()
+            self.assertFalse(content.downloaded)
+            self.assertIsNone(index.get_path(content.url))
+            index.close()
+
     def test_unsupported_domain(self):
         user = MockObjects.get_blank_user()
         ex = Extractor(user)
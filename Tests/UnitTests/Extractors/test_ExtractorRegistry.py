@@ -0,0 +1,40 @@
+import unittest
+
+from DownloaderForReddit.Extractors import ExtractorRegistry
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests import ImportTime
+
+
+class TestExtractorRegistry(unittest.TestCase):
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+
+    def test_manifest_matches_extractor_url_keys(self):
+        for module_name, keys in ExtractorRegistry.MANIFEST:
+            extractor = ExtractorRegistry.load_extractor(module_name)
+            self.assertEqual(module_name, extractor.__name__)
+            self.assertEqual(list(ExtractorRegistry.get_url_keys(module_name)), list(extractor.get_url_key()))
+
+    def test_get_extractor(self):
+        self.assertEqual('ImgurExtractor', ExtractorRegistry.get_extractor('https://imgur.com/fb2yRj0').__name__)
+        self.assertEqual('RedditVideoExtractor', ExtractorRegistry.get_extractor('https://v.redd.it/abc').__name__)
+        self.assertEqual('GenericVideoExtractor',
+                         ExtractorRegistry.get_extractor('https://www.youtube.com/watch?v=abc').__name__)
+        self.assertIsNone(ExtractorRegistry.get_extractor('https://i.example.com/3jfd9nlksd.jpg'))
+
+
+class TestStartupImports(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        output = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        120 |     _io\n'
+                  'import time:      1500 |       2100 | json\n')
+        self.assertEqual({'_io': (120, 120), 'json': (1500, 2100)}, ImportTime.parse_importtime(output))
+
+    def test_extractor_modules_not_imported_at_startup(self):
+        times = ImportTime.measure('DownloaderForReddit.Extractors.Extractor')
+        for module in ('youtube_dl', 'bs4', 'imgurpython', 'DownloaderForReddit.Extractors.GenericVideoExtractor',
+                       'DownloaderForReddit.Extractors.ImgurExtractor'):
+            self.assertNotIn(module, times)
@@ -1,10 +1,11 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import logging
 
 from DownloaderForReddit.Extractors.RedditVideoExtractor import RedditVideoExtractor
 from DownloaderForReddit.Utils import Injector
 from DownloaderForReddit.Utils import VideoMerger
+from DownloaderForReddit.Utils import RedditUtils
 from Tests.MockObjects.MockSettingsManager import MockSettingsManager
 from Tests.MockObjects import MockObjects
 
@@ -16,6 +17,7 @@ class TestRedditVideoExtractor(unittest.TestCase):
     def setUp(self):
         Injector.settings_manager = MockSettingsManager()
         VideoMerger.videos_to_merge.clear()
+        RedditUtils.crosspost_parent_cache.clear()
 
     def test_extract_gif(self):
         post = MockObjects.get_mock_post_reddit_video()
@@ -127,3 +129,138 @@ class TestRedditVideoExtractor(unittest.TestCase):
 
         self.assertEqual(1, len(re.failed_extract_posts))
         self.assertEqual(0, len(re.extracted_content))
+
+    @patch.object(RedditVideoExtractor, 'get_dash_playlist')
+    def test_extract_video_dash_playlist_with_audio(self, dash_mock):
+        dash_mock.return_value = DASH_PLAYLIST
+        post = MockObjects.get_mock_post_reddit_video()
+        post.is_video = True
+        post.media = {'reddit_video': {'fallback_url': post.url + '/DASH_720.mp4?source=fallback',
+                                       'dash_url': post.url + '/DASHPlaylist.mpd?a=123'}}
+
+        re = RedditVideoExtractor(post, MockObjects.get_blank_user())
+        re.extract_content()
+
+        self.assertEqual(2, len(re.extracted_content))
+        self.assertEqual(post.url + '/DASH_720.mp4', re.extracted_content[0].url)
+        self.assertEqual('C:/Users/Gorgoth/Downloads/JohnEveryman/abcde(video).mp4',
+                         re.extracted_content[0].filename)
+        self.assertEqual(post.url + '/DASH_audio.mp4', re.extracted_content[1].url)
+        self.assertEqual('C:/Users/Gorgoth/Downloads/JohnEveryman/abcde(audio).mp4',
+                         re.extracted_content[1].filename)
+        self.assertEqual(1, len(VideoMerger.videos_to_merge))
+
+    @patch('DownloaderForReddit.Extractors.RedditVideoExtractor.requests')
+    def test_extract_video_dash_playlist_failure_uses_fallback(self, requests_mock):
+        requests_mock.get.side_effect = OSError('timed out')
+        post = MockObjects.get_mock_post_reddit_video()
+        post.media = {'reddit_video': {'fallback_url': post.url + '/DASH_720.mp4?source=fallback',
+                                       'dash_url': post.url + '/DASHPlaylist.mpd'}}
+
+        re = RedditVideoExtractor(post, MockObjects.get_blank_user())
+        requests_mock.get.assert_not_called()
+        re.extract_content()
+
+        self.assertEqual(post.url + '/DASH_720.mp4?source=fallback', re.extracted_content[0].url)
+        self.assertIn('timeout', requests_mock.get.call_args[1])
+
+    @patch.object(RedditVideoExtractor, 'get_dash_playlist')
+    def test_extract_video_dash_playlist_resolution_cap(self, dash_mock):
+        dash_mock.return_value = DASH_PLAYLIST
+        Injector.get_settings_manager().reddit_video_max_resolution = 480
+        post = MockObjects.get_mock_post_reddit_video()
+        post.media = {'reddit_video': {'fallback_url': post.url + '/DASH_720.mp4?source=fallback',
+                                       'dash_url': post.url + '/DASHPlaylist.mpd'}}
+
+        re = RedditVideoExtractor(post, MockObjects.get_blank_user())
+        re.get_vid_url()
+
+        self.assertEqual(post.url + '/DASH_480.mp4', re.url)
+
+    @patch.object(RedditVideoExtractor, 'get_dash_playlist')
+    def test_extract_video_dash_playlist_bitrate_cap_below_lowest(self, dash_mock):
+        dash_mock.return_value = DASH_PLAYLIST
+        Injector.get_settings_manager().reddit_video_max_bitrate = 100
+        post = MockObjects.get_mock_post_reddit_video()
+        post.media = {'reddit_video': {'fallback_url': post.url + '/DASH_720.mp4?source=fallback',
+                                       'dash_url': post.url + '/DASHPlaylist.mpd'}}
+
+        re = RedditVideoExtractor(post, MockObjects.get_blank_user())
+        re.get_vid_url()
+
+        self.assertEqual(post.url + '/DASH_240.mp4', re.url)
+
+    @patch.object(RedditVideoExtractor, 'get_dash_playlist')
+    def test_extract_video_dash_playlist_without_audio(self, dash_mock):
+        dash_mock.return_value = DASH_PLAYLIST_NO_AUDIO
+        post = MockObjects.get_mock_post_reddit_video()
+        post.is_video = True
+        post.media = {'reddit_video': {'fallback_url': post.url + '/DASH_720.mp4?source=fallback',
+                                       'dash_url': post.url + '/DASHPlaylist.mpd'}}
+
+        re = RedditVideoExtractor(post, MockObjects.get_blank_user())
+        re.extract_content()
+
+        self.assertFalse(re.contains_audio)
+        self.assertEqual(1, len(re.extracted_content))
+        self.assertEqual('C:/Users/Gorgoth/Downloads/JohnEveryman/abcde.mp4', re.extracted_content[0].filename)
+        self.assertEqual(0, len(VideoMerger.videos_to_merge))
+
+    def test_resolve_crosspost_parents_in_batches(self):
+        parents = []
+        posts = []
+        for x in range(150):
+            parent = MockObjects.get_mock_post_reddit_video()
+            parent.fullname = 't3_parent%s' % x
+            parent.media = {'reddit_video': {'fallback_url': parent.url + '/DASH_%s.mp4' % x}}
+            parents.append(parent)
+            posts.append(MockObjects.MockPrawPost(url='https://v.redd.it/child%s' % x, crosspost_parent=parent.fullname))
+        posts.append(MockObjects.MockPrawPost(url='https://imgur.com/notavideo', crosspost_parent='t3_image'))
+        parent_dict = {x.fullname: x for x in parents}
+        reddit = MagicMock()
+        reddit.info.side_effect = lambda names: [parent_dict[name] for name in names]
+
+        RedditUtils.resolve_crosspost_parents(posts, reddit)
+
+        self.assertEqual(2, reddit.info.call_count)
+        self.assertEqual(100, len(reddit.info.call_args_list[0][0][0]))
+        self.assertEqual(50, len(reddit.info.call_args_list[1][0][0]))
+        self.assertEqual(150, len(RedditUtils.crosspost_parent_cache))
+
+        re = RedditVideoExtractor(posts[3], MockObjects.get_blank_user())
+        re.get_vid_url()
+        self.assertEqual(parents[3].url + '/DASH_3.mp4', re.url)
+
+
+DASH_PLAYLIST = '''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" mediaPresentationDuration="PT10S" type="static">
+  <Period duration="PT10S">
+    <AdaptationSet contentType="video" segmentAlignment="true">
+      <Representation bandwidth="4800000" height="720" id="VIDEO-1" mimeType="video/mp4" width="1280">
+        <BaseURL>DASH_720.mp4</BaseURL>
+      </Representation>
+      <Representation bandwidth="1200000" height="480" id="VIDEO-2" mimeType="video/mp4" width="854">
+        <BaseURL>DASH_480.mp4</BaseURL>
+      </Representation>
+      <Representation bandwidth="300000" height="240" id="VIDEO-3" mimeType="video/mp4" width="426">
+        <BaseURL>DASH_240.mp4</BaseURL>
+      </Representation>
+    </AdaptationSet>
+    <AdaptationSet contentType="audio" segmentAlignment="true">
+      <Representation audioSamplingRate="48000" bandwidth="128000" id="AUDIO-1" mimeType="audio/mp4">
+        <BaseURL>DASH_audio.mp4</BaseURL>
+      </Representation>
+    </AdaptationSet>
+  </Period>
+</MPD>'''
+
+DASH_PLAYLIST_NO_AUDIO = '''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" mediaPresentationDuration="PT10S" type="static">
+  <Period duration="PT10S">
+    <AdaptationSet contentType="video" segmentAlignment="true">
+      <Representation bandwidth="4800000" height="720" id="VIDEO-1" mimeType="video/mp4" width="1280">
+        <BaseURL>DASH_720.mp4</BaseURL>
+      </Representation>
+    </AdaptationSet>
+  </Period>
+</MPD>'''
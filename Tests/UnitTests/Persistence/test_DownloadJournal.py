@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+
+from DownloaderForReddit.Persistence.DownloadJournal import DownloadJournal
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+
+
+class TestDownloadJournal(unittest.TestCase):
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+        self.directory = tempfile.TemporaryDirectory()
+        self.journal = DownloadJournal(os.path.join(self.directory.name, 'download_journal.db'))
+        self.user = MockObjects.get_blank_user()
+        self.content = MockObjects.create_content(self.user, 2, None)
+
+    def tearDown(self):
+        self.journal.close()
+        self.directory.cleanup()
+
+    def test_enqueue_and_rebuild(self):
+        self.journal.enqueue([self.content])
+        self.assertIs(self.journal, self.content.journal)
+        self.assertEqual(1, self.journal.pending_count())
+        pending = DownloadJournal(self.journal.path).get_pending_content()
+        self.assertEqual(1, len(pending))
+        self.assertEqual(self.content.url, pending[0].url)
+        self.assertEqual(self.content.filename, pending[0].filename)
+        self.assertEqual(self.content.date_created, pending[0].date_created)
+        self.assertEqual(self.content.journal_id, pending[0].journal_id)
+
+    def test_started_jobs_remain_pending(self):
+        self.journal.enqueue([self.content])
+        self.journal.mark_started(self.content.journal_id)
+        self.assertEqual(1, len(self.journal.get_pending_content()))
+        self.journal.mark_finished(self.content.journal_id)
+        self.assertEqual(0, self.journal.pending_count())
+
+    @patch('DownloaderForReddit.Core.Content.Content.download')
+    def test_content_run_finishes_job_on_success(self, download):
+        self.journal.enqueue([self.content])
+
+        def succeed():
+            self.content.downloaded = True
+        download.side_effect = succeed
+        self.content.run()
+        self.assertEqual(0, self.journal.pending_count())
+
+    @patch('DownloaderForReddit.Core.Content.Content.download')
+    def test_content_run_keeps_job_on_failure(self, download):
+        self.journal.enqueue([self.content])
+        self.content.run()
+        self.assertEqual(1, self.journal.pending_count())
+
+    def test_release_journal_jobs(self):
+        self.journal.enqueue([self.content])
+        self.user.content.append(self.content)
+        self.user.release_journal_jobs()
+        self.assertEqual(0, self.journal.pending_count())
@@ -0,0 +1,149 @@
+import unittest
+import os
+import tempfile
+import sqlite3
+import threading
+from unittest.mock import patch
+
+from DownloaderForReddit.Persistence.ObjectStore import ObjectStore
+from DownloaderForReddit.Persistence.ObjectStateHandler import ObjectStateHandler
+from DownloaderForReddit.Core.RedditObjects import Subreddit
+from DownloaderForReddit.Utils import Injector
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+
+
+class TestObjectStore(unittest.TestCase):
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ObjectStore(os.path.join(self.directory.name, 'reddit_objects.db'))
+        self.user = MockObjects.get_blank_user()
+        self.user.previous_downloads.extend(['https://i.imgur.com/%s.jpg' % x for x in range(5)])
+        self.user.saved_content['https://i.imgur.com/saved.jpg'] = ['JohnEveryman', 'Title', 'pics', 1, 1521473630]
+        self.subreddit = Subreddit('v0.0.0', 'SomeSub', 'C:/Users/Gorgoth/Downloads', 10, True, True, True,
+                                   'INCLUDE', 'Image/Album Id', 86400, 86400)
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def save(self):
+        self.store.save({'Default': [self.user]}, {'Subs': [self.subreddit]}, 'Default', 'Subs')
+
+    def count_history_rows(self):
+        return self.store.connect().execute('SELECT COUNT(*) FROM history').fetchone()[0]
+
+    def test_save_and_load(self):
+        self.save()
+        state = ObjectStore(self.store.path).load()
+        user = state['user_lists']['Default'][0]
+        subreddit = state['subreddit_lists']['Subs'][0]
+        self.assertEqual('JohnEveryman', user.name)
+        self.assertEqual(self.user.store_id, user.store_id)
+        self.assertEqual(list(self.user.previous_downloads), list(user.previous_downloads))
+        self.assertTrue('https://i.imgur.com/3.jpg' in user.previous_downloads)
+        self.assertEqual(self.user.saved_content, user.saved_content)
+        self.assertEqual('SomeSub', subreddit.name)
+        self.assertEqual('Default', state['last_user_view'])
+        self.assertEqual('Subs', state['last_sub_view'])
+
+    def test_iter_lists_yields_priority_lists_first(self):
+        self.store.save({'First': [], 'Default': [self.user], 'Last': []}, {'Subs': [self.subreddit]}, 'Default',
+                        'Subs')
+        lists = [(x[0], x[1]) for x in self.store.iter_lists({'user': 'Default', 'subreddit': 'Subs'})]
+        self.assertEqual([('user', 'Default'), ('subreddit', 'Subs'), ('user', 'First'), ('user', 'Last')], lists)
+        positions = {x[1]: x[2] for x in self.store.iter_lists()}
+        self.assertTrue(positions['First'] < positions['Default'] < positions['Last'])
+        user = next(x[3] for x in self.store.iter_lists() if x[1] == 'Default')[0]
+        self.assertEqual('JohnEveryman', user.name)
+
+    def test_stored_fields_loaded_lazily(self):
+        self.save()
+        user = ObjectStore(self.store.path).load()['user_lists']['Default'][0]
+        self.assertIsNone(user.__dict__['_previous_downloads'])
+        self.assertEqual(5, user.number_of_downloads)
+        self.assertEqual(1, user.json['saved_content_count'])
+        self.assertIsNone(user.__dict__['_previous_downloads'])
+        self.assertTrue('https://i.imgur.com/4.jpg' in user.previous_downloads)
+        self.assertEqual(5, user.previous_downloads.saved_length)
+        self.assertIsNone(user.__dict__['_saved_content'])
+
+    def test_released_fields_are_reloaded(self):
+        self.save()
+        self.user.release_stored_fields()
+        self.assertIsNone(self.user.__dict__['_previous_downloads'])
+        self.save()
+        self.assertEqual(5, self.count_history_rows())
+        self.assertEqual(5, len(self.user.previous_downloads))
+        self.assertEqual(1, len(self.user.saved_content))
+
+    def test_history_saved_incrementally(self):
+        self.save()
+        self.assertEqual(5, self.count_history_rows())
+        self.user.previous_downloads.append('https://i.imgur.com/new.jpg')
+        self.save()
+        self.assertEqual(6, self.count_history_rows())
+        self.assertEqual(6, self.user.previous_downloads.saved_length)
+        self.assertTrue(self.store.history_contains(self.user.store_id, 'https://i.imgur.com/new.jpg'))
+
+    def test_history_rewritten_after_removal(self):
+        self.save()
+        del self.user.previous_downloads[0]
+        self.save()
+        self.assertEqual(4, self.count_history_rows())
+        self.assertFalse(self.store.history_contains(self.user.store_id, 'https://i.imgur.com/0.jpg'))
+
+    def test_removed_objects_are_deleted(self):
+        self.save()
+        self.store.save({'Default': []}, {}, 'Default', None)
+        state = self.store.load()
+        self.assertEqual({'Default': []}, state['user_lists'])
+        self.assertEqual({}, state['subreddit_lists'])
+        self.assertEqual(0, self.count_history_rows())
+
+    def test_save_objects_checkpoints_changes(self):
+        self.save()
+        self.user.previous_downloads.append('https://i.imgur.com/new.jpg')
+        self.user.set_date_limit(1600000000)
+        self.assertTrue(self.user.dirty)
+        count = self.store.save_objects([('Default', 'user', 0, self.user)], threading.RLock())
+        self.assertEqual(1, count)
+        self.assertFalse(self.user.dirty)
+        self.assertEqual(6, self.count_history_rows())
+        user = ObjectStore(self.store.path).load()['user_lists']['Default'][0]
+        self.assertEqual(1600000000, user.date_limit)
+        self.assertTrue('https://i.imgur.com/new.jpg' in user.previous_downloads)
+
+    def test_failed_checkpoint_leaves_objects_dirty(self):
+        self.save()
+        self.user.set_date_limit(1600000000)
+        with patch.object(ObjectStore, 'write_snapshot', side_effect=sqlite3.OperationalError):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.store.save_objects([('Default', 'user', 0, self.user)], threading.RLock())
+        self.assertTrue(self.user.dirty)
+        self.store.save_objects([('Default', 'user', 0, self.user)], threading.RLock())
+        self.assertFalse(self.user.dirty)
+        self.assertEqual(1600000000, ObjectStore(self.store.path).load()['user_lists']['Default'][0].date_limit)
+
+    def test_final_checkpoint_releases_stored_fields(self):
+        self.save()
+        self.user.previous_downloads.append('https://i.imgur.com/new.jpg')
+        self.user.dirty = True
+        self.subreddit.previous_downloads.append('https://i.imgur.com/other.jpg')
+        with patch.object(ObjectStateHandler, 'store', self.store):
+            ObjectStateHandler.checkpoint({'Default': [self.user]}, {'Subs': [self.subreddit]})
+            self.assertIsNotNone(self.user.__dict__['_previous_downloads'])
+            self.user.previous_downloads.append('https://i.imgur.com/final.jpg')
+            self.user.dirty = True
+            ObjectStateHandler.checkpoint({'Default': [self.user]}, {'Subs': [self.subreddit]}, True)
+        self.assertIsNone(self.user.__dict__['_previous_downloads'])
+        self.assertIsNotNone(self.subreddit.__dict__['_previous_downloads'])
+        self.assertTrue('https://i.imgur.com/final.jpg' in self.user.previous_downloads)
+
+    def test_save_objects_adds_unstored_objects(self):
+        self.store.save_objects([('New', 'user', 0, self.user)], threading.RLock())
+        state = self.store.load()
+        self.assertEqual(['JohnEveryman'], [x.name for x in state['user_lists']['New']])
+        self.assertEqual(5, self.count_history_rows())
@@ -0,0 +1,47 @@
+import unittest
+import os
+import tempfile
+
+from DownloaderForReddit.Persistence.ObjectStore import ObjectStore
+from DownloaderForReddit.Persistence.StoreMigrator import StoreMigrator, SCHEMA_VERSION
+from DownloaderForReddit.Utils import Injector
+from DownloaderForReddit.version import __version__
+from Tests.MockObjects.MockSettingsManager import MockSettingsManager
+from Tests.MockObjects import MockObjects
+
+
+class TestStoreMigrator(unittest.TestCase):
+
+    def setUp(self):
+        Injector.settings_manager = MockSettingsManager()
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = ObjectStore(os.path.join(self.directory.name, 'reddit_objects.db'))
+        self.user = MockObjects.get_blank_user()
+        self.user.previous_downloads.extend(['https://i.imgur.com/1.jpg', 'https://i.imgur.com/2.jpg'])
+        self.store.save({'Default': [self.user]}, {}, 'Default', None)
+        self.progress = []
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def report(self, description, completed, total):
+        self.progress.append((description, completed, total))
+
+    def test_outdated_objects_upgraded_once(self):
+        self.assertTrue(StoreMigrator(self.store, self.report).run())
+        user = self.store.load()['user_lists']['Default'][0]
+        self.assertEqual(__version__, user.version)
+        self.assertEqual('JohnEveryman', user.name)
+        self.assertEqual(['https://i.imgur.com/1.jpg', 'https://i.imgur.com/2.jpg'], list(user.previous_downloads))
+        self.assertEqual(__version__, self.store.get_meta('object_version'))
+        self.assertEqual(str(SCHEMA_VERSION), self.store.get_meta('schema_version'))
+        self.assertIn(('Upgrading reddit objects', 1, 1), self.progress)
+
+        self.assertFalse(StoreMigrator(self.store).needs_migration())
+        self.assertFalse(StoreMigrator(self.store).run())
+
+    def test_history_not_duplicated_by_upgrade(self):
+        StoreMigrator(self.store).run()
+        count = self.store.connect().execute('SELECT COUNT(*) FROM history').fetchone()[0]
+        self.assertEqual(2, count)
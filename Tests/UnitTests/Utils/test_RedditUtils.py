@@ -0,0 +1,161 @@
+import unittest
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+from DownloaderForReddit.Utils import RedditUtils
+
+
+class TestBatchValidate(unittest.TestCase):
+
+    def make_subreddit(self, name, fullname):
+        sub = MagicMock()
+        sub.display_name = name
+        sub.fullname = fullname
+        return sub
+
+    def test_subreddits_validated_in_batches(self):
+        names = ['sub_%s' % x for x in range(150)]
+        reddit = MagicMock()
+        reddit.get.side_effect = lambda path, params: [self.make_subreddit(x, 't5_%s' % x) for x in
+                                                       params['sr_name'].split(',')]
+        results = list(RedditUtils.batch_validate('SUBREDDIT', names, reddit=reddit))
+        self.assertEqual(2, reddit.get.call_count)
+        self.assertEqual([(x, 't5_%s' % x) for x in names], results)
+        reddit.subreddit.assert_not_called()
+
+    def test_missing_subreddit_checked_individually(self):
+        reddit = MagicMock()
+        reddit.get.return_value = [self.make_subreddit('Found', 't5_found')]
+        reddit.subreddit.return_value = MagicMock(spec=[])
+        results = list(RedditUtils.batch_validate('SUBREDDIT', ['found', 'missing'], reddit=reddit))
+        self.assertEqual([('found', 't5_found'), ('missing', None)], results)
+        reddit.subreddit.assert_called_once_with('missing')
+
+    def test_users_with_known_fullnames_validated_in_bulk(self):
+        reddit = MagicMock()
+        reddit.request.return_value = {'t2_one': {'name': 'One'}}
+        reddit.redditor.return_value = MagicMock(fullname='t2_two')
+        results = list(RedditUtils.batch_validate('USER', ['one', 'two'], {'one': 't2_one', 'two': None}, reddit))
+        self.assertEqual([('one', 't2_one'), ('two', 't2_two')], results)
+        reddit.request.assert_called_once_with(method='GET', path='/api/user_data_by_account_ids',
+                                               params={'ids': 't2_one'})
+        reddit.redditor.assert_called_once_with('two')
+
+
+class TestNameChecker(unittest.TestCase):
+
+    @patch('DownloaderForReddit.Utils.RedditUtils.get_reddit_instance')
+    def test_failed_batch_checked_one_name_at_a_time(self, reddit_mock):
+        reddit = reddit_mock.return_value
+        reddit.get.side_effect = ConnectionError
+        broken = MagicMock()
+        type(broken).fullname = PropertyMock(side_effect=ConnectionError)
+        subs = {'good': MagicMock(fullname='t5_good'), 'broken': broken, 'missing': MagicMock(spec=[])}
+        reddit.subreddit.side_effect = lambda name: subs[name]
+        checker = RedditUtils.NameChecker('SUBREDDIT', None)
+        results = []
+        checker.name_validation.connect(results.append)
+        checker.check_names(['good', 'broken', 'missing'])
+        self.assertEqual([('good', True), ('missing', False)], results)
+
+
+class TestRedditClientPool(unittest.TestCase):
+
+    def make_instance(self, remaining, reset_time=None):
+        reddit = MagicMock()
+        reset_time = reset_time if reset_time is not None else time.time() + 600
+        reddit.auth.limits = {'remaining': remaining, 'used': 0, 'reset_timestamp': reset_time}
+        return reddit
+
+    def test_checkout_routes_to_client_with_most_headroom(self):
+        instances = {'first': self.make_instance(5), 'second': self.make_instance(400)}
+        with patch('DownloaderForReddit.Utils.RedditUtils.make_reddit_instance', side_effect=lambda x: instances[x]):
+            pool = RedditUtils.RedditClientPool(['first', 'second'])
+            first = pool.checkout()
+            second = pool.checkout()
+            self.assertIsNot(first, second)
+            pool.checkin(first)
+            pool.checkin(second)
+            for _ in range(3):
+                reddit = pool.checkout()
+                self.assertIs(instances['second'], reddit)
+                pool.checkin(reddit)
+
+    def test_remaining_ignored_after_reported_reset(self):
+        reddit = self.make_instance(5, time.time() + 30)
+        pool = RedditUtils.RedditClientPool(['first'], reddit)
+        pool.checkin(pool.checkout())
+        self.assertEqual(5, pool.get_headroom('first'))
+        pool.reset_times['first'] = time.time() - 1
+        self.assertEqual(RedditUtils.DEFAULT_RATE_LIMIT, pool.get_headroom('first'))
+
+    def test_existing_instance_used_for_first_client(self):
+        reddit = self.make_instance(None)
+        pool = RedditUtils.RedditClientPool(['first', 'first'], reddit)
+        self.assertEqual(1, len(pool))
+        self.assertIs(reddit, pool.checkout())
+        pool.checkin(reddit)
+
+
+class TestRateLimitBudget(unittest.TestCase):
+
+    def test_requests_spread_over_remaining_window(self):
+        budget = RedditUtils.RateLimitBudget()
+        self.assertEqual(0, budget.reserve())
+        budget.update({'x-ratelimit-remaining': '4', 'x-ratelimit-reset': '8'})
+        delays = [budget.reserve() for _ in range(4)]
+        for expected, delay in zip((0, 2, 4, 6), delays):
+            self.assertAlmostEqual(expected, delay, delta=0.1)
+        self.assertAlmostEqual(8, budget.reserve(), delta=0.1)
+
+    def test_instances_for_client_id_share_budget(self):
+        with patch('praw.Reddit') as reddit_mock:
+            RedditUtils.make_reddit_instance('shared_client')
+            RedditUtils.make_reddit_instance('shared_client')
+            RedditUtils.make_reddit_instance('other_client')
+        budgets = [x[1]['requestor_kwargs']['budget'] for x in reddit_mock.call_args_list]
+        self.assertIs(budgets[0], budgets[1])
+        self.assertIsNot(budgets[0], budgets[2])
+        self.assertIs(RedditUtils.BudgetedRequestor, reddit_mock.call_args[1]['requestor_class'])
+
+    def test_requestor_draws_from_budget(self):
+        budget = MagicMock()
+        response = MagicMock(headers={'x-ratelimit-remaining': '10', 'x-ratelimit-reset': '60'})
+        with patch('prawcore.Requestor.request', return_value=response):
+            requestor = RedditUtils.BudgetedRequestor(user_agent='test agent', budget=budget)
+            self.assertIs(response, requestor.request('GET', 'https://oauth.reddit.com/api/info'))
+        budget.acquire.assert_called_once_with()
+        budget.update.assert_called_once_with(response.headers)
+
+
+class TestListingRecords(unittest.TestCase):
+
+    def make_page(self, ids, after):
+        return {'data': {'after': after, 'children': [
+            {'kind': 't3', 'data': {'id': x, 'url': 'https://v.redd.it/%s' % x, 'author': 'someone',
+                                    'subreddit': 'SomeSub', 'created': 1500000000, 'score': 1, 'over_18': False,
+                                    'domain': 'v.redd.it', 'title': 'title', 'crosspost_parent': 't3_parent',
+                                    'stickied': True, 'selftext': 'not kept'}} for x in ids]}}
+
+    def test_records_parsed_and_paged(self):
+        reddit = MagicMock()
+        reddit.request.side_effect = [self.make_page(['a', 'b'], 't3_b'), self.make_page(['c', 'd'], None)]
+        records = list(RedditUtils.get_listing_records(reddit, '/r/SomeSub/new', 3))
+        self.assertEqual(['a', 'b', 'c'], [x.id for x in records])
+        self.assertEqual(2, reddit.request.call_count)
+        params = reddit.request.call_args[1]['params']
+        self.assertEqual('t3_b', params['after'])
+        self.assertEqual(1, params['raw_json'])
+        record = records[0]
+        self.assertFalse(hasattr(record, '__dict__'))
+        self.assertEqual('SomeSub', RedditUtils.get_subreddit_name(record))
+        self.assertEqual('t3_parent', RedditUtils.get_crosspost_parent_name(record))
+        self.assertTrue(RedditUtils.get_post_value(record, 'stickied'))
+
+    def test_record_converted_to_post(self):
+        reddit = MagicMock()
+        reddit.request.return_value = self.make_page(['a'], None)
+        post = RedditUtils.convert_praw_post(next(RedditUtils.get_listing_records(reddit, '/r/SomeSub/new', 1)))
+        self.assertEqual('someone', post.author)
+        self.assertEqual('SomeSub', post.subreddit)
+        self.assertEqual('v.redd.it', post.domain)
@@ -0,0 +1,146 @@
+
+"""
+Downloader for Reddit takes a list of reddit users and subreddits and downloads content posted to reddit either by the
+users or on the subreddits.
+
+
+Copyright (C) 2017, Kyle Hickey
+
+
+This file is part of the Downloader for Reddit.
+
+Downloader for Reddit is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Downloader for Reddit is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Downloader for Reddit.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+import argparse
+import json
+import sys
+import logging
+
+from DownloaderForReddit.Core.HeadlessRunner import HeadlessDownloadRunner, ProgressReporter
+from DownloaderForReddit.Persistence.ObjectStateHandler import ObjectStateHandler
+from DownloaderForReddit.Persistence.Checkpointer import Checkpointer
+from DownloaderForReddit.Utils import Injector
+from DownloaderForReddit.Logging import Logger
+
+
+EXIT_SUCCESS = 0
+EXIT_FAILED_DOWNLOADS = 1  # The run finished but some content failed to be extracted or downloaded
+EXIT_USAGE = 2
+EXIT_LOAD_FAILED = 3
+EXIT_CONNECTION_FAILED = 4
+EXIT_INTERRUPTED = 130
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Downloads a user list, a subreddit list, or both from the saved lists without opening the GUI.  '
+                    'Progress is written to stdout as one JSON object per line.')
+    parser.add_argument('-u', '--user-list', help='The name of the user list to download.')
+    parser.add_argument('-s', '--subreddit-list',
+                        help='The name of the subreddit list to download.  If a user list is also supplied, only the '
+                             'content posted by the users to these subreddits is downloaded.')
+    parser.add_argument('--resume', action='store_true',
+                        help='Download the content left in the download journal by a run that did not finish.')
+    parser.add_argument('--show-lists', action='store_true', help='Print the names of the saved lists and exit.')
+    parsed = parser.parse_args(args)
+    if not (parsed.user_list or parsed.subreddit_list or parsed.resume or parsed.show_lists):
+        parser.error('one of --user-list, --subreddit-list, --resume, or --show-lists is required')
+    return parsed
+
+
+def get_download_type(user_list, subreddit_list):
+    if user_list is not None and subreddit_list is not None:
+        return 'USERS_AND_SUBREDDITS'
+    return 'USER' if user_list is not None else 'SUBREDDIT'
+
+
+def get_exit_status(runner, reporter):
+    if runner.interrupted:
+        return EXIT_INTERRUPTED
+    if runner.connection_failed:
+        return EXIT_CONNECTION_FAILED
+    if len(runner.failed_posts) > 0 or reporter.totals['failed'] > 0:
+        return EXIT_FAILED_DOWNLOADS
+    return EXIT_SUCCESS
+
+
+def run(runner, download_type, reporter, get_lists=None):
+    """
+    Runs the supplied runner to completion while the reporter writes its progress.  If lists are supplied, the reddit
+    objects changed by the run are checkpointed to the object store during the run and once it is finished.
+    :return: The exit status of the run.
+    :rtype: int
+    """
+    settings_manager = Injector.get_settings_manager()
+    checkpointer = None
+    if get_lists is not None and settings_manager.checkpoint_interval > 0:
+        checkpointer = Checkpointer(get_lists, settings_manager.checkpoint_interval)
+        checkpointer.start()
+    reporter.write('started', {'download_type': download_type})
+    runner.run_download(download_type)
+    if checkpointer is not None:
+        checkpointer.stop()
+        checkpointer.join()
+    elif get_lists is not None:
+        ObjectStateHandler.checkpoint(*get_lists())
+    status = get_exit_status(runner, reporter)
+    reporter.write('finished', dict(reporter.totals, status=status, invalid_objects=[x.name for x in
+                                                                                       runner.invalid_objects]))
+    return status
+
+
+def main(args=None):
+    args = parse_args(sys.argv[1:] if args is None else args)
+    Logger.make_logger()
+    logger = logging.getLogger('DownloaderForReddit.%s' % __name__)
+    queue = Injector.get_queue()
+    reporter = ProgressReporter(queue, sys.stdout)
+    reporter.start()
+    try:
+        if args.resume:
+            content = Injector.get_download_journal().get_pending_content(Injector.get_dedupe_index())
+            runner = HeadlessDownloadRunner(None, None, queue, content)
+            status = run(runner, 'UNFINISHED', reporter)
+            if status != EXIT_SUCCESS or not (args.user_list or args.subreddit_list):
+                return status
+        if not (args.user_list or args.subreddit_list or args.show_lists):
+            return EXIT_SUCCESS
+        try:
+            state = ObjectStateHandler.prepare_store().load()
+        except Exception:
+            logger.error('Failed to load from object store',
+                         extra={'store_location': ObjectStateHandler.get_store_path()}, exc_info=True)
+            reporter.write('error', {'message': 'Failed to load the saved lists'})
+            return EXIT_LOAD_FAILED
+        user_lists, subreddit_lists = state['user_lists'], state['subreddit_lists']
+        if args.show_lists:
+            print(json.dumps({'user_lists': list(user_lists), 'subreddit_lists': list(subreddit_lists)}))
+            return EXIT_SUCCESS
+        for name, lists in ((args.user_list, user_lists), (args.subreddit_list, subreddit_lists)):
+            if name is not None and name not in lists:
+                reporter.write('error', {'message': 'No saved list named %s' % name})
+                return EXIT_USAGE
+        user_list = user_lists[args.user_list] if args.user_list else None
+        subreddit_list = subreddit_lists[args.subreddit_list] if args.subreddit_list else None
+        runner = HeadlessDownloadRunner(user_list, subreddit_list, queue, None)
+        return run(runner, get_download_type(user_list, subreddit_list), reporter,
+                   lambda: (user_lists, subreddit_lists))
+    finally:
+        reporter.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())